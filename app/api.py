@@ -1,17 +1,70 @@
+from app.interface_clinique import ClinicalPredictor
+from utils import instrumentation
+
+
 class ClinicalAPI:
     """API REST pour l'application clinique"""
     
-    def __init__(self, predictor: ClinicalPredictor):
+    def __init__(self, predictor: ClinicalPredictor, drift_monitor=None):
+        """
+        Args:
+            predictor: Prédicteur servi
+            drift_monitor: DriftMonitor (utils.drift) alimenté par les entrées
+                brutes reçues, optionnel
+        """
         self.predictor = predictor
+        self.drift_monitor = drift_monitor
     
+    def snapshot(self):
+        """
+        Prédicteur servi, résolu une fois pour toute une requête.
+        
+        Avec un ModelRegistry, la version active peut changer entre deux accès :
+        le schéma, la matrice et le diagnostic d'une requête doivent provenir
+        de la même version.
+        """
+        return self.predictor.snapshot()
+    
+    @instrumentation.instrumented('api.predict_endpoint')
     def predict_endpoint(self, patient_data: dict):
         """Endpoint de prédiction"""
         import numpy as np
         
-        # Convertir les données du patient en array
-        features = np.array(list(patient_data.values()))
-        diagnosis = self.predictor.diagnose(features)
+        predictor = self.snapshot()
+        # Convertir les données du patient en array (par nom si le schéma est connu)
+        with instrumentation.span('api.to_matrix'):
+            if predictor.feature_names is not None:
+                features = predictor.to_matrix([patient_data])
+            else:
+                features = np.array(list(patient_data.values()))
+        if self.drift_monitor is not None:
+            self.drift_monitor.update(features)
+        diagnosis = predictor.diagnose(features)
+        instrumentation.increment('predictions', diagnosis=diagnosis)
         
+        return self.format_response(diagnosis)
+    
+    def predict_endpoint_batch(self, patients_data):
+        """
+        Endpoint de prédiction par lot
+        
+        Args:
+            patients_data: Liste de dictionnaires patient ou données en colonnes
+                (dictionnaire feature -> liste de valeurs)
+        """
+        predictor = self.snapshot()
+        if self.drift_monitor is not None:
+            features = predictor.to_matrix(patients_data)
+            self.drift_monitor.update(features)
+            if predictor.feature_names is not None:
+                # Matrice construite par nom de feature : réutilisée pour le diagnostic
+                patients_data = features
+        diagnoses = predictor.diagnose_batch(patients_data)
+        return [self.format_response(diagnosis) for diagnosis in diagnoses]
+    
+    @staticmethod
+    def format_response(diagnosis: str) -> dict:
+        """Construit la réponse de l'API pour un diagnostic"""
         return {
             "diagnosis": diagnosis,
             "confidence": "High" if diagnosis == "Infecté" else "Normal"
@@ -0,0 +1,173 @@
+"""
+Couche de service asynchrone par micro-lots.
+
+Les requêtes concurrentes de prédiction sont regroupées en lots (taille maximale
+et délai d'attente maximal configurables) : un seul appel à predict_proba est
+fait par lot, sur un pool de workers, puis chaque appelant reçoit sa réponse.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api import ClinicalAPI
+
+
+class MicroBatchingAPI:
+    """
+    Version asynchrone de ClinicalAPI qui regroupe les requêtes en micro-lots.
+
+    Exemple:
+        async with MicroBatchingAPI(api, max_batch_size=64, max_wait=0.002) as batcher:
+            response = await batcher.predict_endpoint(patient_data)
+    """
+
+    def __init__(self, api: ClinicalAPI, max_batch_size: int = 64, max_wait: float = 0.002,
+                 max_workers: int = 1, executor=None):
+        """
+        Args:
+            api: API clinique dont le prédicteur traite les lots
+            max_batch_size: Nombre maximal de requêtes par lot
+            max_wait: Délai maximal (secondes) d'attente de requêtes supplémentaires
+                après la première requête d'un lot
+            max_workers: Nombre de lots traités simultanément
+            executor: Pool de workers (un ThreadPoolExecutor est créé par défaut)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size doit être >= 1")
+        self.api = api
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue = None
+        self._collector = None
+        self._slots = None
+        self._pending = set()
+        # Tailles des derniers lots (bornées) et compteurs cumulés
+        self.batch_sizes = deque(maxlen=1024)
+        self.n_batches = 0
+        self.n_batched_requests = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Taille moyenne des lots depuis le démarrage."""
+        return self.n_batched_requests / self.n_batches if self.n_batches else 0.0
+
+    async def start(self):
+        """Démarre la collecte des requêtes."""
+        if self._collector is not None:
+            return self
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._collector = asyncio.create_task(self._collect())
+        return self
+
+    async def stop(self):
+        """Arrête la collecte après avoir traité les requêtes en attente."""
+        if self._collector is None:
+            return
+        await self._queue.put(None)
+        await self._collector
+        if self._pending:
+            await asyncio.gather(*self._pending)
+        self._collector = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def predict_endpoint(self, patient_data: dict) -> dict:
+        """Endpoint de prédiction (même réponse que ClinicalAPI.predict_endpoint)"""
+        if self._collector is None:
+            raise RuntimeError("MicroBatchingAPI.start() doit être appelé avant de prédire")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((patient_data, future))
+        return await future
+
+    async def _collect(self):
+        """Regroupe les requêtes de la file en lots et les envoie aux workers."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                try:
+                    item = self._queue.get_nowait() if remaining <= 0 else \
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _run_batch(self, batch):
+        """Exécute un lot sur le pool et transmet les résultats aux appelants."""
+        import numpy as np
+
+        # Une seule version du modèle pour tout le lot
+        predictor = self.api.snapshot()
+        try:
+            try:
+                features = predictor.to_matrix([patient_data for patient_data, _ in batch])
+            except ValueError:
+                # Une requête invalide ne doit pas faire échouer tout le lot
+                valid = []
+                for patient_data, future in batch:
+                    try:
+                        predictor.to_matrix([patient_data])
+                        valid.append((patient_data, future))
+                    except ValueError as exc:
+                        future.set_exception(exc)
+                batch = valid
+                if not batch:
+                    return
+                features = predictor.to_matrix([patient_data for patient_data, _ in batch])
+            if getattr(predictor, 'preprocessor', None) is None:
+                # Sans préprocesseur, le modèle refuse toute la matrice dès qu'une
+                # valeur manquante ou infinie s'y trouve : seules ces requêtes échouent
+                finite = np.isfinite(features).all(axis=1)
+                if not finite.all():
+                    for (_, future), valid in zip(batch, finite):
+                        if not valid:
+                            future.set_exception(
+                                ValueError("Les données contiennent des valeurs manquantes ou infinies")
+                            )
+                    batch = [request for request, valid in zip(batch, finite) if valid]
+                    if not batch:
+                        return
+                    features = predictor.to_matrix([patient_data for patient_data, _ in batch])
+            self.batch_sizes.append(len(batch))
+            self.n_batches += 1
+            self.n_batched_requests += len(batch)
+            diagnoses = await asyncio.get_running_loop().run_in_executor(
+                self._executor, predictor.diagnose_batch, features
+            )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), diagnosis in zip(batch, diagnoses):
+                if not future.done():
+                    future.set_result(self.api.format_response(diagnosis))
+        finally:
+            self._slots.release()
@@ -0,0 +1,159 @@
+"""
+Cache des résultats de prédiction.
+
+Le même patient est souvent soumis plusieurs fois par minute : le diagnostic est
+mis en cache sous une clé formée de la version du modèle et de ses poids, du
+seuil de décision et des octets du vecteur de features (éventuellement arrondi).
+Le cache est borné (éviction LRU), ses entrées expirent après `ttl` secondes et
+il est vidé dès que le modèle servi change ou est réentraîné.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from utils import instrumentation
+
+_MISSING = object()
+
+
+class PredictionCache:
+    """Cache LRU borné avec expiration des entrées."""
+    
+    def __init__(self, max_size: int = 10_000, ttl: float = 60.0, decimals: int = None,
+                 clock=time.monotonic):
+        """
+        Args:
+            max_size: Nombre maximal d'entrées
+            ttl: Durée de vie d'une entrée en secondes (None : pas d'expiration)
+            decimals: Arrondi des features avant calcul de la clé (None : valeurs exactes)
+            clock: Horloge utilisée pour l'expiration
+        """
+        if max_size < 1:
+            raise ValueError("max_size doit être >= 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.decimals = decimals
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def key(self, features, version=None):
+        """Clé d'un vecteur de features (arrondi selon `decimals`) pour une version de modèle."""
+        import numpy as np
+        
+        features = np.asarray(features, dtype=np.float64).ravel()
+        if self.decimals is not None:
+            # Quantification sur la grille 10^-decimals (np.rint est bien plus
+            # rapide que np.round sur un petit vecteur)
+            features = np.multiply(features, 10.0 ** self.decimals)
+            np.rint(features, out=features)
+            features += 0.0  # -0.0 et 0.0 donnent la même clé
+        return version, features.tobytes()
+    
+    def get(self, key, default=None):
+        """Retourne la valeur en cache (et la marque comme récente), ou `default`."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        """Ajoute une entrée, en évinçant la moins récemment utilisée si le cache est plein."""
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def check_version(self, version):
+        """Vide le cache si `version` diffère de la version des entrées en cache ; la retourne."""
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+        return version
+    
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def stats(self) -> dict:
+        """Compteurs de succès, d'échecs et d'évictions."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+
+class CachedPredictor:
+    """
+    Prédicteur avec cache de diagnostics devant `diagnose`.
+    
+    S'utilise à la place du prédicteur (ClinicalPredictor ou ModelRegistry) :
+        api = ClinicalAPI(CachedPredictor(predictor, PredictionCache(ttl=30, decimals=2)))
+    Les autres méthodes sont déléguées sans cache.
+    """
+    
+    def __init__(self, predictor, cache: PredictionCache = None):
+        self.predictor = predictor
+        self.cache = cache if cache is not None else PredictionCache()
+    
+    def __getattr__(self, name):
+        return getattr(self.predictor, name)
+    
+    def snapshot(self):
+        """Vue du prédicteur servi figée pour une requête, qui partage ce cache."""
+        predictor = self.predictor.snapshot()
+        if predictor is self.predictor:
+            return self
+        return CachedPredictor(predictor, self.cache)
+    
+    def _current_version(self):
+        """
+        Identifie le modèle servi ; le cache est vidé lorsqu'il change.
+        
+        La version des poids (Model.version) change à chaque entraînement :
+        un modèle réentraîné en place n'est pas servi depuis l'ancien cache.
+        """
+        predictor = self.predictor
+        version = (getattr(predictor, 'model_version', None), predictor.model.version, predictor.threshold)
+        return self.cache.check_version(version)
+    
+    def diagnose(self, patient_data):
+        """Diagnostic d'un patient, depuis le cache si le même vecteur a déjà été vu."""
+        view = self.snapshot()
+        if view is not self:
+            return view.diagnose(patient_data)
+        key = self.cache.key(patient_data, self._current_version())
+        diagnosis = self.cache.get(key, _MISSING)
+        if diagnosis is not _MISSING:
+            instrumentation.increment('prediction_cache', result='hit')
+            return diagnosis
+        instrumentation.increment('prediction_cache', result='miss')
+        diagnosis = self.predictor.diagnose(patient_data)
+        self.cache.put(key, diagnosis)
+        return diagnosis
@@ -1,18 +1,68 @@
+from core.model import Model
+from utils import instrumentation
+from utils.preprocessing import Preprocessor
+
+
 class ClinicalPredictor:
     """
     Interface clinique pour la prédiction.
     Classe principale répondant à l'exercice.
     """
     
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, feature_names=None, preprocessor: Preprocessor = None,
+                 threshold: float = 0.5):
         """
         Initialise le prédicteur avec un modèle déjà entraîné.
         
         Args:
             model: Modèle IA pré-entraîné (instance de Model)
+            feature_names: Ordre des features attendu par le modèle
+                (par défaut, le schéma capturé à l'entraînement du modèle)
+            preprocessor: Préprocesseur ajusté à l'entraînement, appliqué
+                aux données brutes avant chaque prédiction
+            threshold: Probabilité à partir de laquelle un patient est déclaré
+                infecté (voir pipeline.threshold pour la calibrer)
         """
         self.model = model
+        self.preprocessor = preprocessor
+        self.threshold = threshold
+        if feature_names is None:
+            feature_names = getattr(model, 'feature_names', None)
+        self.feature_names = list(feature_names) if feature_names is not None else None
     
+    @classmethod
+    def from_artifact(cls, path: str, mmap: bool = True):
+        """
+        Crée un prédicteur prêt à servir depuis un artefact de modèle.
+        
+        Args:
+            path: Répertoire de l'artefact (voir core.artifact)
+            mmap: Projette les poids en mémoire partagée plutôt que de les copier
+        """
+        from core.artifact import ModelArtifact
+        
+        artifact = ModelArtifact.load(path, mmap=mmap)
+        return cls(artifact.model, feature_names=artifact.feature_names,
+                   preprocessor=artifact.preprocessor,
+                   threshold=artifact.metadata.get('threshold', 0.5))
+    
+    def save_artifact(self, path: str, metadata: dict = None):
+        """Enregistre le modèle, le préprocesseur, le schéma et le seuil comme artefact"""
+        from core.artifact import ModelArtifact
+        
+        metadata = {**(metadata or {}), 'threshold': self.threshold}
+        return ModelArtifact(self.model, self.preprocessor, self.feature_names, metadata).save(path)
+    
+    def snapshot(self):
+        """
+        Prédicteur à utiliser pour toute une requête (voir ModelRegistry.snapshot).
+        
+        Un ClinicalPredictor ne change pas de modèle en cours de requête : il
+        est sa propre vue.
+        """
+        return self
+    
+    @instrumentation.instrumented('predictor.diagnose')
     def diagnose(self, patient_data):
         """
         Prédit le diagnostic pour un patient.
@@ -21,7 +71,7 @@ class ClinicalPredictor:
             patient_data: Données du patient (array-like)
             
         Returns:
-            "Infecté" si prédiction >= 0.5, "Sain" sinon
+            "Infecté" si la probabilité atteint le seuil, "Sain" sinon
         """
         import numpy as np
         
@@ -32,12 +82,117 @@ class ClinicalPredictor:
         if len(patient_data.shape) == 1:
             patient_data = patient_data.reshape(1, -1)
         
-        # Obtenir la probabilité de prédiction
-        try:
-            prediction_proba = self.model.predict_proba(patient_data)
-            prediction_value = prediction_proba[0][1]  # Probabilité classe positive
-        except:
-            prediction = self.model.predict(patient_data)
-            prediction_value = prediction[0]
+        with instrumentation.span('predictor.preprocess'):
+            patient_data = self._preprocess(patient_data)
+        with instrumentation.span('predictor.model'):
+            probability = self._positive_proba(patient_data)[0]
+        return "Infecté" if probability >= self.threshold else "Sain"
+    
+    def diagnose_batch(self, patients_data):
+        """
+        Prédit le diagnostic pour plusieurs patients en un seul appel au modèle.
+        
+        Args:
+            patients_data: Liste de dictionnaires patient, données en colonnes
+                (dictionnaire feature -> valeurs ou DataFrame) ou matrice
+                (n_patients, n_features) dans l'ordre du schéma
+            
+        Returns:
+            Liste de diagnostics ("Infecté" / "Sain"), un par patient
+        """
+        threshold = self.threshold
+        return ["Infecté" if value >= threshold else "Sain" for value in self.positive_proba(patients_data)]
+    
+    def positive_proba(self, patients_data):
+        """
+        Probabilité de la classe positive pour plusieurs patients.
+        
+        Args:
+            patients_data: Mêmes formats que diagnose_batch
+            
+        Returns:
+            Vecteur de probabilités, un par patient
+        """
+        import numpy as np
+        
+        X = self.to_matrix(patients_data)
+        # La matrice construite par to_matrix peut être transformée en place
+        X = self._preprocess(X, in_place=not isinstance(patients_data, np.ndarray))
+        return self._positive_proba(X)
+    
+    def to_matrix(self, patients_data):
+        """
+        Construit la matrice float64 des features, colonne par colonne selon le schéma.
+        
+        Les dictionnaires sont lus par nom de feature : l'ordre des clés de
+        l'appelant n'a pas d'importance. Sans schéma, l'ordre d'insertion des
+        valeurs est utilisé.
+        
+        Args:
+            patients_data: Liste de dictionnaires, données en colonnes ou matrice
+            
+        Returns:
+            Matrice (n_patients, n_features)
+        """
+        import numpy as np
+        
+        if isinstance(patients_data, dict) or hasattr(patients_data, 'columns'):
+            names = self.feature_names or list(patients_data.keys())
+            for name in names:
+                if name not in patients_data:
+                    raise ValueError(f"Feature manquante: {name}")
+            n_patients = len(patients_data[names[0]]) if names else 0
+            X = np.empty((n_patients, len(names)), dtype=np.float64)
+            for j, name in enumerate(names):
+                X[:, j] = patients_data[name]
+            return X
+        
+        if isinstance(patients_data, (list, tuple)) and patients_data and isinstance(patients_data[0], dict):
+            if self.feature_names is None:
+                return np.array([list(patient.values()) for patient in patients_data], dtype=np.float64)
+            X = np.empty((len(patients_data), len(self.feature_names)), dtype=np.float64)
+            for j, name in enumerate(self.feature_names):
+                try:
+                    X[:, j] = [patient[name] for patient in patients_data]
+                except KeyError:
+                    raise ValueError(f"Feature manquante: {name}") from None
+            return X
+        
+        X = np.asarray(patients_data, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.feature_names is not None and X.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"{len(self.feature_names)} features attendues, reçu {X.shape[1]}"
+            )
+        return X
+    
+    def _validate(self, X):
+        """
+        Valide une seule fois les entrées du chemin rapide : matrice float64
+        2D contiguë, nombre de features attendu et valeurs finies.
+        """
+        import numpy as np
         
-        return "Infecté" if prediction_value >= 0.5 else "Sain"
\ No newline at end of file
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        n_features = self.model.n_features
+        if X.ndim != 2 or (n_features is not None and X.shape[1] != n_features):
+            raise ValueError(f"Matrice (n_patients, {n_features}) attendue, reçu {X.shape}")
+        if not np.isfinite(X).all():
+            raise ValueError("Les données contiennent des valeurs manquantes ou infinies")
+        return X
+    
+    def _preprocess(self, X, in_place: bool = False):
+        """Applique le prétraitement appris à l'entraînement, s'il y en a un."""
+        if self.preprocessor is None:
+            return X
+        return self.preprocessor.transform(X, copy=not in_place)
+    
+    def _positive_proba(self, patients_data):
+        """Retourne la probabilité de la classe positive pour chaque ligne."""
+        if getattr(self.model, 'supports_fast_path', False):
+            return self.model.fast_predict_proba(self._validate(patients_data))[:, 1]
+        try:
+            return self.model.predict_proba(patients_data)[:, 1]  # Probabilité classe positive
+        except AttributeError:  # Modèle sans probabilités : la prédiction (0/1) en tient lieu
+            return self.model.predict(patients_data)
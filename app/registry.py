@@ -0,0 +1,328 @@
+"""
+Registre de modèles pour le service : plusieurs versions chargées, une version
+active remplaçable à chaud et une version candidate évaluée en shadow.
+
+La version active est un couple (version, prédicteur) remplacé par une seule
+affectation : une requête lit ce couple une fois et termine sur le modèle avec
+lequel elle a commencé, sans verrou sur le chemin de prédiction (voir
+ModelRegistry.snapshot, utilisé par ClinicalAPI pour toute la requête). Le modèle
+shadow est évalué sur une fraction échantillonnée du trafic, dans un thread
+d'arrière-plan alimenté par une file bornée : la latence du modèle principal
+n'en dépend pas, et les échantillons sont abandonnés si la file est pleine.
+Il reçoit les données brutes de la requête et construit sa propre matrice : son
+schéma peut différer de celui de la version active.
+"""
+import queue
+import random
+import threading
+
+from app.interface_clinique import ClinicalPredictor
+from utils import instrumentation
+
+_STOP = object()
+
+
+class ModelRegistry:
+    """
+    Registre de prédicteurs, utilisable à la place d'un ClinicalPredictor.
+    
+    Exemple:
+        registry = ModelRegistry()
+        registry.load('v1', 'artifacts/v1')
+        registry.activate('v1')
+        api = ClinicalAPI(registry)
+        registry.load('v2', 'artifacts/v2')
+        registry.set_shadow('v2', fraction=0.05)
+        ...
+        registry.agreement('v2')  # Puis registry.activate('v2')
+    """
+    
+    def __init__(self, shadow_fraction: float = 0.1, shadow_queue_size: int = 1024):
+        """
+        Args:
+            shadow_fraction: Fraction par défaut du trafic évaluée par le modèle shadow
+            shadow_queue_size: Nombre maximal de requêtes en attente d'évaluation shadow
+        """
+        self.predictors = {}
+        self.shadow_fraction = shadow_fraction
+        self._active = (None, None)
+        self._shadow = (None, None)
+        self._queue = queue.Queue(maxsize=shadow_queue_size)
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stats = {}
+    
+    def register(self, version: str, predictor: ClinicalPredictor):
+        """Ajoute un prédicteur sous `version`."""
+        self.predictors[version] = predictor
+        return predictor
+    
+    def load(self, version: str, path: str, mmap: bool = True):
+        """Charge un artefact de modèle sous `version` (sans l'activer)."""
+        return self.register(version, ClinicalPredictor.from_artifact(path, mmap=mmap))
+    
+    def unregister(self, version: str):
+        """Retire une version qui n'est ni active ni en shadow."""
+        if version in (self._active[0], self._shadow[0]):
+            raise ValueError(f"La version {version} est en service")
+        del self.predictors[version]
+    
+    def activate(self, version: str):
+        """Bascule atomiquement le trafic sur `version`."""
+        self._active = (version, self._get(version))
+        instrumentation.increment('model_activations', version=version)
+    
+    def set_shadow(self, version: str = None, fraction: float = None):
+        """
+        Évalue `version` en shadow sur une fraction du trafic (None pour arrêter).
+        
+        Args:
+            version: Version candidate
+            fraction: Fraction du trafic évaluée (par défaut shadow_fraction)
+        """
+        if fraction is not None:
+            if not 0.0 <= fraction <= 1.0:
+                raise ValueError("fraction doit être comprise entre 0 et 1")
+            self.shadow_fraction = fraction
+        if version is None:
+            self._shadow = (None, None)
+            return
+        self._shadow = (version, self._get(version))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_shadow, name='shadow-scoring', daemon=True)
+            self._worker.start()
+    
+    def close(self, timeout: float = None):
+        """Arrête le thread shadow après les évaluations en attente."""
+        self._shadow = (None, None)
+        if self._worker is not None:
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+            self._worker = None
+    
+    def _get(self, version: str) -> ClinicalPredictor:
+        if version not in self.predictors:
+            raise ValueError(f"Version inconnue: {version}")
+        return self.predictors[version]
+    
+    @property
+    def model_version(self):
+        """Version active."""
+        return self._active[0]
+    
+    @property
+    def shadow_version(self):
+        """Version évaluée en shadow (None si aucune)."""
+        return self._shadow[0]
+    
+    @property
+    def active(self) -> ClinicalPredictor:
+        """Prédicteur actif."""
+        predictor = self._active[1]
+        if predictor is None:
+            raise ValueError("Aucune version active")
+        return predictor
+    
+    def snapshot(self):
+        """
+        Vue de la version active et de la version shadow, lues une seule fois.
+        
+        À utiliser pour toute une requête : feature_names, to_matrix et
+        diagnose d'une même vue portent sur le même prédicteur, même si une
+        autre version est activée entre deux appels.
+        """
+        return _Snapshot(self, self._active, self._shadow)
+    
+    # Interface de ClinicalPredictor, déléguée à la version active
+    
+    @property
+    def feature_names(self):
+        return self.active.feature_names
+    
+    @property
+    def threshold(self):
+        return self.active.threshold
+    
+    @property
+    def model(self):
+        return self.active.model
+    
+    @property
+    def preprocessor(self):
+        return self.active.preprocessor
+    
+    def to_matrix(self, patients_data):
+        return self.active.to_matrix(patients_data)
+    
+    def diagnose(self, patient_data):
+        """Diagnostic d'un patient par la version active."""
+        return self.snapshot().diagnose(patient_data)
+    
+    def diagnose_batch(self, patients_data):
+        """Diagnostics de plusieurs patients par la version active."""
+        return self.snapshot().diagnose_batch(patients_data)
+    
+    def positive_proba(self, patients_data):
+        return self.active.positive_proba(patients_data)
+    
+    def _sample_batch(self, shadow, patients_data, diagnoses):
+        """Soumet au modèle shadow une fraction échantillonnée des lignes d'un lot."""
+        import numpy as np
+        
+        selected = np.flatnonzero(np.random.random(len(diagnoses)) < self.shadow_fraction)
+        if not len(selected):
+            return
+        if isinstance(patients_data, dict) or hasattr(patients_data, 'columns'):
+            sample = {name: np.asarray(values)[selected] for name, values in patients_data.items()}
+        elif isinstance(patients_data, np.ndarray):
+            sample = patients_data[selected]
+        else:
+            sample = [patients_data[i] for i in selected]
+        self._submit(shadow, sample, [diagnoses[i] for i in selected])
+    
+    def _submit(self, shadow, patients_data, diagnoses):
+        """Met en file une évaluation shadow, ou la compte comme abandonnée."""
+        shadow_version, shadow = shadow
+        try:
+            self._queue.put_nowait((shadow_version, shadow, patients_data, diagnoses))
+        except queue.Full:
+            with self._lock:
+                self._stats_for(shadow_version)['dropped'] += len(diagnoses)
+    
+    def _run_shadow(self):
+        """Boucle du thread shadow : évalue les requêtes échantillonnées et compare."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._score_shadow(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _score_shadow(self, shadow_version, shadow, patients_data, diagnoses):
+        """Évalue un échantillon avec le modèle shadow et met à jour les taux d'accord."""
+        try:
+            # Le modèle shadow construit sa propre matrice selon son schéma
+            shadow_diagnoses = shadow.diagnose_batch(patients_data)
+        except Exception:  # Un modèle candidat défaillant ne doit pas arrêter le thread
+            with self._lock:
+                self._stats_for(shadow_version)['errors'] += len(diagnoses)
+            return
+        
+        with self._lock:
+            stats = self._stats_for(shadow_version)
+            stats['compared'] += len(diagnoses)
+            for primary, candidate in zip(diagnoses, shadow_diagnoses):
+                if primary == candidate:
+                    stats['agreed'] += 1
+                else:
+                    key = f"{primary}->{candidate}"
+                    stats['disagreements'][key] = stats['disagreements'].get(key, 0) + 1
+        instrumentation.increment('shadow_predictions', value=len(diagnoses), version=shadow_version)
+    
+    def _stats_for(self, version: str) -> dict:
+        return self._stats.setdefault(version, {
+            'compared': 0, 'agreed': 0, 'dropped': 0, 'errors': 0, 'disagreements': {}
+        })
+    
+    def agreement(self, version: str = None) -> dict:
+        """
+        Taux d'accord entre la version shadow et la version active.
+        
+        Args:
+            version: Version shadow (par défaut la version shadow courante)
+        
+        Returns:
+            Dictionnaire compared, agreed, agreement_rate, dropped, errors et
+            disagreements (paires 'principal->candidat')
+        """
+        version = self.shadow_version if version is None else version
+        with self._lock:
+            stats = dict(self._stats_for(version))
+            stats['disagreements'] = dict(stats['disagreements'])
+        stats['agreement_rate'] = stats['agreed'] / stats['compared'] if stats['compared'] else None
+        return stats
+    
+    def wait_shadow(self):
+        """Attend que toutes les évaluations shadow en file soient traitées."""
+        self._queue.join()
+
+
+class _Snapshot:
+    """
+    Versions active et shadow d'un ModelRegistry figées pour une requête.
+    
+    La vue retient la dernière entrée passée à to_matrix : le modèle shadow
+    reçoit ces données brutes plutôt que la matrice construite selon le schéma
+    de la version active, et les lit par nom de feature.
+    """
+    
+    def __init__(self, registry: ModelRegistry, active, shadow):
+        self.model_version, self.predictor = active
+        if self.predictor is None:
+            raise ValueError("Aucune version active")
+        self._registry = registry
+        self._shadow = shadow
+        self._raw = None
+        self._matrix = None
+    
+    def snapshot(self):
+        return self
+    
+    @property
+    def feature_names(self):
+        return self.predictor.feature_names
+    
+    @property
+    def threshold(self):
+        return self.predictor.threshold
+    
+    @property
+    def model(self):
+        return self.predictor.model
+    
+    @property
+    def preprocessor(self):
+        return self.predictor.preprocessor
+    
+    def to_matrix(self, patients_data):
+        matrix = self.predictor.to_matrix(patients_data)
+        self._raw, self._matrix = patients_data, matrix
+        return matrix
+    
+    def positive_proba(self, patients_data):
+        return self.predictor.positive_proba(patients_data)
+    
+    def diagnose(self, patient_data):
+        """Diagnostic d'un patient par la version active de la vue."""
+        diagnosis = self.predictor.diagnose(patient_data)
+        if self._shadow[1] is not None and random.random() < self._registry.shadow_fraction:
+            self._registry._submit(self._shadow, self._shadow_input(patient_data), [diagnosis])
+        return diagnosis
+    
+    def diagnose_batch(self, patients_data):
+        """Diagnostics de plusieurs patients par la version active de la vue."""
+        diagnoses = self.predictor.diagnose_batch(patients_data)
+        if self._shadow[1] is not None and self._registry.shadow_fraction > 0:
+            self._registry._sample_batch(self._shadow, self._shadow_input(patients_data), diagnoses)
+        return diagnoses
+    
+    def _shadow_input(self, patients_data):
+        """
+        Données à transmettre au modèle shadow : l'entrée brute si `patients_data`
+        est la matrice issue de to_matrix, sinon une matrice étiquetée par le
+        schéma de la version active (colonnes feature -> valeurs).
+        """
+        import numpy as np
+        
+        if self._matrix is not None and patients_data is self._matrix:
+            return self._raw
+        if isinstance(patients_data, dict) or hasattr(patients_data, 'columns'):
+            return patients_data
+        if isinstance(patients_data, (list, tuple)) and patients_data and isinstance(patients_data[0], dict):
+            return patients_data
+        X = np.atleast_2d(np.asarray(patients_data, dtype=np.float64))
+        if self.feature_names is None:
+            return X
+        return dict(zip(self.feature_names, X.T))
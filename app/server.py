@@ -0,0 +1,316 @@
+"""
+Serveur HTTP/1.1 asyncio (bibliothèque standard uniquement) pour ClinicalAPI.
+
+Routes :
+    POST /predict        un patient (objet JSON) -> diagnostic
+    POST /predict/batch  liste de patients ou colonnes -> liste de diagnostics
+    POST /alerts         signes vitaux d'un patient (ou liste) -> alertes
+    GET  /health         état du serveur et version du modèle
+    GET  /metrics        métriques d'instrumentation (format texte Prometheus)
+    GET  /drift          dérive des entrées par rapport à l'entraînement (si api.drift_monitor)
+
+Les appels au modèle et au système d'alerte sont exécutés sur un pool de
+threads, jamais sur la boucle d'événements. Le nombre de requêtes en cours de
+traitement est borné : au-delà, le serveur répond immédiatement 503 avec
+Retry-After plutôt que de laisser la latence croître. Les connexions sont
+persistantes (keep-alive) par défaut en HTTP/1.1.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from app.api import ClinicalAPI
+from utils import instrumentation
+
+# Taille maximale des en-têtes d'une requête (octets)
+_MAX_HEADER_SIZE = 16 * 1024
+
+
+class HTTPError(Exception):
+    """Erreur renvoyée au client avec un statut HTTP."""
+    
+    def __init__(self, status: int, message: str = None, headers: dict = None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ClinicalHTTPServer:
+    """
+    Serveur HTTP asynchrone exposant ClinicalAPI et AlertSystem.
+    
+    Exemple:
+        async with ClinicalHTTPServer(ClinicalAPI(predictor), port=8000) as server:
+            await server.serve_forever()
+    """
+    
+    def __init__(self, api: ClinicalAPI, alert_system=None, host: str = '127.0.0.1', port: int = 8000,
+                 max_workers: int = 4, max_pending: int = 64, keep_alive_timeout: float = 5.0,
+                 max_body_size: int = 1024 * 1024, batcher=None):
+        """
+        Args:
+            api: API clinique servie
+            alert_system: Système d'alerte de /alerts (par défaut AlertSystem())
+            host, port: Adresse d'écoute (port 0 : port libre choisi par le système)
+            max_workers: Nombre de threads exécutant les appels au modèle
+            max_pending: Nombre maximal de requêtes en cours de traitement ;
+                au-delà, réponse 503
+            keep_alive_timeout: Durée (secondes) de conservation d'une connexion inactive
+            max_body_size: Taille maximale du corps d'une requête (octets)
+            batcher: MicroBatchingAPI démarré utilisé pour /predict (optionnel)
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending doit être >= 1")
+        if alert_system is None:
+            from core.alert_system import AlertSystem
+            alert_system = AlertSystem()
+        self.api = api
+        self.alert_system = alert_system
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_size = max_body_size
+        self.batcher = batcher
+        self.pending = 0
+        self.rejected = 0
+        self._server = None
+        self._executor = None
+        self._connections = set()
+        self._routes = {
+            ('POST', '/predict'): self._predict,
+            ('POST', '/predict/batch'): self._predict_batch,
+            ('POST', '/alerts'): self._alerts,
+            ('GET', '/health'): self._health,
+            ('GET', '/metrics'): self._metrics,
+            ('GET', '/drift'): self._drift,
+        }
+    
+    async def start(self):
+        """Ouvre le socket d'écoute et le pool de threads."""
+        if self._server is not None:
+            return self
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='clinical-http')
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=_MAX_HEADER_SIZE)
+        # Port réellement attribué (utile avec port=0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def stop(self):
+        """Ferme le socket d'écoute et les connexions, puis le pool de threads."""
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+    
+    async def serve_forever(self):
+        await self.start()
+        await self._server.serve_forever()
+    
+    async def __aenter__(self):
+        return await self.start()
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Traite les requêtes successives d'une connexion (keep-alive)."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, {'error': "En-têtes trop volumineux"}, keep_alive=False)
+                    break
+                
+                body_read = False
+                try:
+                    method, path, version, headers = _parse_head(head)
+                    keep_alive = _wants_keep_alive(version, headers)
+                    body = await self._read_body(reader, headers)
+                    body_read = True
+                    status, payload, extra = await self._dispatch(method, path, body)
+                except HTTPError as error:
+                    status, payload, extra = error.status, {'error': str(error)}, error.headers
+                    # Corps non lu : la suite du flux n'est pas une requête, la connexion est fermée
+                    keep_alive = keep_alive and body_read
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as error:
+                    # Erreur inattendue d'un handler : le client reçoit une réponse, pas une coupure
+                    instrumentation.increment('http_internal_errors', error=type(error).__name__)
+                    status, payload, extra = 500, {'error': "Erreur interne du serveur"}, {}
+                    keep_alive = keep_alive and body_read
+                instrumentation.increment('http_requests', status=str(status))
+                await self._send(writer, status, payload, keep_alive, extra)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+    
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict) -> bytes:
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Transfer-Encoding chunked non supporté : Content-Length requis")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Content-Length invalide") from None
+        if length < 0:
+            raise HTTPError(400, "Content-Length invalide")
+        if length > self.max_body_size:
+            raise HTTPError(413, f"Corps de requête supérieur à {self.max_body_size} octets")
+        return await reader.readexactly(length) if length else b''
+    
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        """Route la requête ; retourne (statut, contenu, en-têtes supplémentaires)."""
+        path = path.split('?', 1)[0]
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                allowed = ', '.join(m for m, route_path in self._routes if route_path == path)
+                raise HTTPError(405, f"Méthode {method} non autorisée", {'Allow': allowed})
+            raise HTTPError(404, f"Route inconnue : {path}")
+        if method == 'GET':
+            return 200, handler(), {}
+        try:
+            data = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise HTTPError(400, f"JSON invalide : {error}") from None
+        
+        # Contrôle d'admission : les requêtes en excès sont rejetées sans attendre
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            instrumentation.increment('http_rejected')
+            raise HTTPError(503, "Serveur surchargé, réessayer plus tard", {'Retry-After': '1'})
+        self.pending += 1
+        try:
+            return 200, await handler(data), {}
+        except (ValueError, TypeError) as error:
+            raise HTTPError(400, str(error)) from None
+        except KeyError as error:
+            raise HTTPError(400, f"Champ manquant : {error.args[0]}") from None
+        finally:
+            self.pending -= 1
+    
+    async def _run(self, function, *args):
+        """Exécute un appel bloquant sur le pool de threads."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+    
+    async def _predict(self, data):
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Objet JSON patient attendu")
+        if self.batcher is not None:
+            return await self.batcher.predict_endpoint(data)
+        return await self._run(self.api.predict_endpoint, data)
+    
+    async def _predict_batch(self, data):
+        if not isinstance(data, (list, dict)):
+            raise HTTPError(400, "Liste de patients ou colonnes attendues")
+        return await self._run(self.api.predict_endpoint_batch, data)
+    
+    async def _alerts(self, data):
+        if isinstance(data, dict):
+            return await self._run(self._check_alerts, data)
+        if isinstance(data, list) and all(isinstance(patient, dict) for patient in data):
+            return await self._run(lambda: [self._check_alerts(patient) for patient in data])
+        raise HTTPError(400, "Objet JSON (ou liste d'objets) de signes vitaux attendu")
+    
+    def _check_alerts(self, patient_data: dict):
+        return [alert.to_dict() for alert in self.alert_system.check_vital_signs(patient_data)]
+    
+    def _health(self):
+        predictor = self.api.predictor
+        return {
+            'status': 'ok',
+            'model_version': getattr(predictor, 'model_version', None),
+            'threshold': getattr(predictor, 'threshold', None),
+            'pending': self.pending,
+            'rejected': self.rejected,
+            'connections': len(self._connections)
+        }
+    
+    def _metrics(self):
+        return instrumentation.export_prometheus()
+    
+    def _drift(self):
+        if self.api.drift_monitor is None:
+            raise HTTPError(404, "Surveillance de la dérive non activée")
+        return self.api.drift_monitor.report()
+    
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool,
+                    headers: dict = None):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json'
+        lines = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def _parse_head(head: bytes):
+    """Analyse la ligne de requête et les en-têtes (noms en minuscules)."""
+    try:
+        request_line, *header_lines = head[:-4].decode('latin-1').split('\r\n')
+        method, path, version = request_line.split(' ')
+    except ValueError:
+        raise HTTPError(400, "Ligne de requête invalide") from None
+    if not version.startswith('HTTP/1.'):
+        raise HTTPError(505)
+    headers = {}
+    for line in header_lines:
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise HTTPError(400, "En-tête invalide")
+        headers[name.strip().lower()] = value.strip()
+    return method, path, version, headers
+
+
+def _wants_keep_alive(version: str, headers: dict) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def run(api: ClinicalAPI, host: str = '127.0.0.1', port: int = 8000, **kwargs):
+    """Lance le serveur jusqu'à interruption (Ctrl+C)."""
+    
+    async def main():
+        async with ClinicalHTTPServer(api, host=host, port=port, **kwargs) as server:
+            print(f"✓ Serveur clinique à l'écoute sur http://{server.host}:{server.port}")
+            await server.serve_forever()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
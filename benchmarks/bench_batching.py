@@ -0,0 +1,110 @@
+"""
+Benchmark : service par micro-lots contre prédiction ligne par ligne.
+
+Envoie N requêtes concurrentes à ClinicalAPI.predict_endpoint (une requête par
+appel au modèle) puis à MicroBatchingAPI, et compare latences p50/p99 et débit.
+
+Usage:
+    python -m benchmarks.bench_batching --requests 5000 --concurrency 256
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.api import ClinicalAPI
+from app.batching import MicroBatchingAPI
+from app.interface_clinique import ClinicalPredictor
+from core.logistic_regression import LogisticRegressionModel
+
+
+def build_api(n_features: int = 20, seed: int = 0) -> ClinicalAPI:
+    """Entraîne un modèle sur des données synthétiques et retourne l'API."""
+    from sklearn.datasets import make_classification
+
+    X, y = make_classification(n_samples=5000, n_features=n_features, random_state=seed)
+    model = LogisticRegressionModel(max_iter=1000).train(X, y)
+    return ClinicalAPI(ClinicalPredictor(model))
+
+
+def summarize(name: str, latencies, wall_time: float) -> dict:
+    """Résume latences (ms) et débit (requêtes/s)."""
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'name': name,
+        'requests': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'throughput_rps': len(latencies) / wall_time,
+    }
+
+
+async def run_load(endpoint, payloads, concurrency: int):
+    """Envoie les requêtes avec au plus `concurrency` requêtes en vol."""
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(payload):
+        async with slots:
+            start = time.perf_counter()
+            await endpoint(payload)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    return latencies, time.perf_counter() - start
+
+
+async def bench(n_requests: int, concurrency: int, max_batch_size: int, max_wait: float, workers: int):
+    api = build_api()
+    rng = np.random.default_rng(1)
+    n_features = api.predictor.model.model.n_features_in_
+    payloads = [
+        {f'feature_{i}': value for i, value in enumerate(row)}
+        for row in rng.normal(size=(n_requests, n_features))
+    ]
+
+    # Chemin ligne par ligne : un appel au modèle par requête sur le même pool
+    executor = ThreadPoolExecutor(max_workers=workers)
+    loop = asyncio.get_running_loop()
+
+    async def per_row(payload):
+        return await loop.run_in_executor(executor, api.predict_endpoint, payload)
+
+    results = [summarize('per_row', *await run_load(per_row, payloads, concurrency))]
+    executor.shutdown()
+
+    async with MicroBatchingAPI(api, max_batch_size=max_batch_size, max_wait=max_wait,
+                                max_workers=workers) as batcher:
+        summary = summarize('micro_batch', *await run_load(batcher.predict_endpoint, payloads, concurrency))
+        summary['mean_batch_size'] = batcher.mean_batch_size
+    results.append(summary)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait', type=float, default=0.002)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(bench(args.requests, args.concurrency, args.max_batch_size,
+                                args.max_wait, args.workers))
+    for result in results:
+        print(f"{result['name']:12s} p50={result['p50_ms']:8.2f} ms  p99={result['p99_ms']:8.2f} ms  "
+              f"débit={result['throughput_rps']:10.0f} req/s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark : générateur de charge pour le serveur HTTP clinique.
+
+Ouvre N connexions keep-alive qui envoient des requêtes en boucle pendant une
+durée fixée, puis affiche débit, latences (p50/p90/p99) et nombre de rejets 503.
+Sans --port, un serveur est lancé dans un processus fils avec un modèle entraîné
+sur une cohorte synthétique, pour que client et serveur ne partagent pas le GIL.
+
+Usage:
+    python -m benchmarks.bench_http --connections 64 --duration 10 --endpoint predict
+    python -m benchmarks.bench_http --port 8000 --endpoint alerts     (serveur existant)
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from benchmarks.harness import Cohort, _trained_predictor
+
+ENDPOINTS = {'predict': '/predict', 'batch': '/predict/batch', 'alerts': '/alerts'}
+
+
+def _serve(ready, n_features: int, max_workers: int, max_pending: int):
+    """Processus serveur : modèle de la cohorte synthétique, port libre transmis via `ready`."""
+    from app.api import ClinicalAPI
+    from app.server import ClinicalHTTPServer
+    
+    api = ClinicalAPI(_trained_predictor(Cohort(5_000, n_features=n_features)))
+    
+    async def main():
+        async with ClinicalHTTPServer(api, port=0, max_workers=max_workers,
+                                      max_pending=max_pending) as server:
+            ready.put(server.port)
+            await server.serve_forever()
+    
+    asyncio.run(main())
+
+
+def request_body(endpoint: str, cohort: Cohort, batch_size: int) -> bytes:
+    if endpoint == 'predict':
+        payload = cohort.features_row(0)
+    elif endpoint == 'batch':
+        payload = [cohort.features_row(i % cohort.n_patients) for i in range(batch_size)]
+    else:
+        payload = cohort.vitals_row(0)
+    return json.dumps(payload).encode('utf-8')
+
+
+async def _client(host: str, port: int, request: bytes, deadline: float, latencies: list, statuses: dict):
+    """Une connexion keep-alive : requêtes successives jusqu'à l'échéance."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            status_line, *header_lines = head.decode('latin-1').split('\r\n')
+            length = next(int(line.split(':', 1)[1]) for line in header_lines
+                          if line.lower().startswith('content-length:'))
+            await reader.readexactly(length)
+            status = int(status_line.split(' ')[1])
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            if 'connection: close' in head.decode('latin-1').lower():
+                break
+    finally:
+        writer.close()
+
+
+async def load(host: str, port: int, path: str, body: bytes, connections: int, duration: float):
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[_client(host, port, request, deadline, latencies, statuses)
+                           for _ in range(connections)])
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        'connections': connections,
+        'seconds': elapsed,
+        'requests': sum(statuses.values()),
+        'ok': statuses.get(200, 0),
+        'rejected': statuses.get(503, 0),
+        'errors': sum(count for status, count in statuses.items() if status not in (200, 503)),
+        'requests_per_sec': statuses.get(200, 0) / elapsed,
+        **{f'p{q}_ms': float(np.percentile(latencies, q)) if len(latencies) else None for q in (50, 90, 99)}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="Serveur existant (sinon lancé dans un processus fils)")
+    parser.add_argument('--endpoint', choices=tuple(ENDPOINTS), default='predict')
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--batch-size', type=int, default=100, help="Patients par requête (endpoint batch)")
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=4, help="Threads du serveur lancé")
+    parser.add_argument('--max-pending', type=int, default=64, help="Requêtes en cours max du serveur lancé")
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+    
+    server = None
+    port = args.port
+    if port is None:
+        ready = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_serve, daemon=True,
+                                         args=(ready, args.features, args.workers, args.max_pending))
+        server.start()
+        port = ready.get(timeout=60)
+    
+    body = request_body(args.endpoint, Cohort(args.batch_size, n_features=args.features), args.batch_size)
+    try:
+        results = [asyncio.run(load(args.host, port, ENDPOINTS[args.endpoint], body, connections, args.duration))
+                   for connections in args.connections]
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+    
+    print(f"{ENDPOINTS[args.endpoint]} sur {args.host}:{port}, {os.cpu_count()} cœurs disponibles")
+    for result in results:
+        latency = (f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+                   if result['p50_ms'] is not None else "aucune réponse 200")
+        print(f"{result['connections']:4d} connexions {result['requests_per_sec']:10,.0f} req/s  {latency}  "
+              f"503: {result['rejected']}  erreurs: {result['errors']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
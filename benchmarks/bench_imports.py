@@ -0,0 +1,134 @@
+"""
+Benchmark : temps d'import et de démarrage de chaque sous-commande de main.py.
+
+Chaque sous-commande est lancée dans un processus neuf avec `python -X importtime`
+sur de petites entrées. Le temps d'import cumulé, la durée totale du processus et
+les bibliothèques lourdes chargées sont comparés à un budget : le code de sortie
+vaut 1 si un budget est dépassé ou si une bibliothèque interdite est importée.
+
+Usage:
+    python -m benchmarks.bench_imports [--scale-budgets 2.0] [--json imports.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets par sous-commande : temps d'import cumulé (ms) et bibliothèques interdites
+IMPORT_BUDGETS = {
+    'help': {'import_ms': 150, 'forbidden': ('numpy', 'sklearn', 'pandas', 'scipy')},
+    'alert': {'import_ms': 400, 'forbidden': ('sklearn', 'pandas', 'scipy')},
+    'alert-batch': {'import_ms': 400, 'forbidden': ('sklearn', 'pandas', 'scipy')},
+    # Le modèle désérialisé importe sklearn (qui peut lui-même importer pandas)
+    'predict': {'import_ms': 3000, 'forbidden': ()},
+    'evaluate': {'import_ms': 4000, 'forbidden': ()},
+    'train': {'import_ms': 4000, 'forbidden': ()},
+}
+
+HEAVY_LIBRARIES = ('numpy', 'scipy', 'sklearn', 'pandas')
+
+
+def prepare(workdir: str) -> dict:
+    """Crée les entrées des sous-commandes : signes vitaux, CSV étiqueté et artefact."""
+    import numpy as np
+    
+    rng = np.random.default_rng(0)
+    vitals_csv = os.path.join(workdir, 'vitals.csv')
+    with open(vitals_csv, 'w') as f:
+        f.write('temperature,heart_rate,oxygen_saturation\n')
+        for row in zip(rng.normal(37, 1, 100), rng.normal(85, 20, 100), rng.normal(95, 4, 100)):
+            f.write(','.join(f'{value:.1f}' for value in row) + '\n')
+    
+    data_csv = os.path.join(workdir, 'patients.csv')
+    X = rng.normal(size=(500, 5))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    with open(data_csv, 'w') as f:
+        f.write(','.join([f'feature_{i}' for i in range(5)] + ['diagnosis']) + '\n')
+        for features, label in zip(X, y):
+            f.write(','.join(f'{value:.6f}' for value in features) + f',{label}\n')
+    
+    patient_json = os.path.join(workdir, 'patient.json')
+    with open(patient_json, 'w') as f:
+        json.dump({f'feature_{i}': float(X[0, i]) for i in range(5)}, f)
+    
+    artifact = os.path.join(workdir, 'artifact')
+    subprocess.run([sys.executable, 'main.py', 'train', '--data', data_csv, '--output', artifact],
+                   cwd=ROOT, check=True, capture_output=True)
+    return {'vitals_csv': vitals_csv, 'data_csv': data_csv, 'patient_json': patient_json,
+            'artifact': artifact, 'train_output': os.path.join(workdir, 'trained')}
+
+
+def commands(paths: dict) -> dict:
+    return {
+        'help': ['--help'],
+        'alert': ['alert', '--vitals', 'temperature=40.5', 'heart_rate=130', '--ews'],
+        'alert-batch': ['alert', '--input', paths['vitals_csv'], '--json'],
+        'predict': ['predict', '--artifact', paths['artifact'], '--input', paths['patient_json']],
+        'evaluate': ['evaluate', '--artifact', paths['artifact'], '--data', paths['data_csv']],
+        'train': ['train', '--data', paths['data_csv'], '--output', paths['train_output']],
+    }
+
+
+def measure(arguments) -> dict:
+    """Lance main.py avec -X importtime et résume les imports du processus."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', 'main.py', *arguments],
+                               cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if completed.returncode not in (0, 1):
+        raise RuntimeError(f"main.py {' '.join(arguments)} a échoué :\n{completed.stderr[-2000:]}")
+    
+    import_us, modules = 0, set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules.add(name.split('.')[0])
+        if not line.split('|')[2].startswith('  '):  # Imports de premier niveau
+            import_us += int(cumulative)
+    return {
+        'import_ms': import_us / 1000,
+        'process_ms': wall * 1000,
+        'libraries': sorted(modules & set(HEAVY_LIBRARIES)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale-budgets', type=float, default=1.0,
+                        help="Multiplie les budgets (machines lentes)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+    
+    results, failures = {}, []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, arguments in commands(prepare(workdir)).items():
+            runs = [measure(arguments) for _ in range(args.repeat)]
+            result = min(runs, key=lambda run: run['import_ms'])
+            budget = IMPORT_BUDGETS[name]
+            result['budget_ms'] = budget['import_ms'] * args.scale_budgets
+            forbidden = sorted(set(result['libraries']) & set(budget['forbidden']))
+            if result['import_ms'] > result['budget_ms']:
+                failures.append(f"{name}: imports {result['import_ms']:.0f} ms > budget {result['budget_ms']:.0f} ms")
+            if forbidden:
+                failures.append(f"{name}: bibliothèques interdites importées {forbidden}")
+            results[name] = result
+            print(f"{name:12s} imports {result['import_ms']:8.1f} ms (budget {result['budget_ms']:6.0f})  "
+                  f"processus {result['process_ms']:8.1f} ms  {', '.join(result['libraries']) or '-'}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    for failure in failures:
+        print(f"DÉPASSEMENT {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
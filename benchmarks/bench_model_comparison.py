@@ -0,0 +1,58 @@
+"""
+Benchmark : passage à l'échelle de la validation croisée parallèle.
+
+Mesure ModelComparison (configurations par défaut, k folds) dans le processus
+courant puis avec 2 à N workers, et affiche durée et accélération par rapport
+à un cœur.
+
+Usage:
+    python -m benchmarks.bench_model_comparison --patients 50000 --folds 5 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.harness import Cohort
+from pipeline.model_comparison import ModelComparison, default_configs
+
+
+def bench(n_patients: int, n_features: int, folds: int, workers, seed: int = 0):
+    """Retourne une mesure par nombre de workers (1 = processus courant)."""
+    cohort = Cohort(n_patients, n_features=n_features, seed=seed)
+    results = []
+    for n_workers in workers:
+        comparison = ModelComparison(default_configs(), n_splits=folds, n_jobs=n_workers)
+        start = time.perf_counter()
+        leaderboard = comparison.run(cohort.X, cohort.y)
+        duration = time.perf_counter() - start
+        results.append({'workers': n_workers, 'seconds': duration,
+                        'best': leaderboard[0]['model'], 'roc_auc': leaderboard[0]['roc_auc_mean']})
+    for result in results:
+        result['speedup'] = results[0]['seconds'] / result['seconds']
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--patients', type=int, default=50_000)
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+
+    results = bench(args.patients, args.features, args.folds, args.workers)
+    print(f"{args.patients:,} patients, {args.folds} folds, {os.cpu_count()} cœurs disponibles")
+    for result in results:
+        print(f"{result['workers']:3d} worker(s) {result['seconds']:8.2f} s  x{result['speedup']:.2f}  "
+              f"(meilleur : {result['best']}, AUC {result['roc_auc']:.4f})")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark : évaluation parallèle des alertes sur un instantané d'hôpital.
+
+Mesure check_vital_signs_batch dans un seul processus puis ParallelAlertExecutor
+avec 2 à N workers, et affiche débit et accélération par rapport à un cœur.
+
+Usage:
+    python -m benchmarks.bench_parallel_alerts --patients 2000000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.harness import Cohort
+from core.alert_system import AlertSystem
+from core.parallel_alerts import ParallelAlertExecutor
+
+
+def time_best(function, repeat: int) -> float:
+    """Meilleure durée (secondes) sur `repeat` exécutions."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def bench(n_patients: int, workers, repeat: int = 3, seed: int = 0):
+    """Retourne une mesure par nombre de workers (1 = processus courant)."""
+    cohort = Cohort(n_patients, n_features=1, seed=seed)
+    alert_system = AlertSystem()
+    results = []
+    for n_workers in workers:
+        if n_workers <= 1:
+            duration = time_best(lambda: alert_system.check_vital_signs_batch(cohort.vitals), repeat)
+        else:
+            with ParallelAlertExecutor(alert_system, n_workers=n_workers, min_shard_size=1) as executor:
+                executor.check_vital_signs_batch(cohort.vitals)  # Démarrage du pool (non mesuré)
+                duration = time_best(lambda: executor.check_vital_signs_batch(cohort.vitals), repeat)
+        results.append({'workers': n_workers, 'seconds': duration, 'patients_per_sec': n_patients / duration})
+    for result in results:
+        result['speedup'] = results[0]['seconds'] / result['seconds']
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--patients', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+
+    results = bench(args.patients, args.workers, args.repeat)
+    print(f"{args.patients:,} patients, {os.cpu_count()} cœurs disponibles")
+    for result in results:
+        print(f"{result['workers']:3d} worker(s) {result['seconds'] * 1000:9.1f} ms  "
+              f"{result['patients_per_sec']:14,.0f} patients/s  x{result['speedup']:.2f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
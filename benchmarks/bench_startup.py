@@ -0,0 +1,150 @@
+"""
+Benchmark : démarrage d'un processus de service.
+
+Compare, dans un processus Python neuf, le temps nécessaire pour obtenir un
+ClinicalPredictor prêt à répondre :
+    - retrain  : chargement du CSV, prétraitement et entraînement (flux de main.py)
+    - pickle   : pickle.load du prédicteur complet
+    - artifact : ClinicalPredictor.from_artifact (poids projetés en mémoire)
+
+Usage:
+    python -m benchmarks.bench_startup --rows 20000 --hidden 256 256
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPTS = {
+    'retrain': """
+from core.dataset import Dataset
+from core.neural_network import NeuralNetworkModel
+from pipeline.trainer import Trainer
+from utils.preprocessing import Preprocessor
+from app.interface_clinique import ClinicalPredictor
+dataset = Dataset().load_from_csv({csv!r})
+preprocessor = Preprocessor()
+dataset.X_train = preprocessor.fit_transform(dataset.X_train)
+model = Trainer(NeuralNetworkModel(hidden_layer_sizes={hidden!r}, max_iter=20, random_state=0), dataset).train().get_trained_model()
+predictor = ClinicalPredictor(model, preprocessor=preprocessor)
+""",
+    'pickle': """
+import pickle
+with open({pickle_path!r}, 'rb') as f:
+    predictor = pickle.load(f)
+""",
+    'artifact': """
+from app.interface_clinique import ClinicalPredictor
+predictor = ClinicalPredictor.from_artifact({artifact_path!r})
+""",
+}
+
+# Mesure effectuée dans le processus enfant : du lancement à la première prédiction.
+# Avec PRELOAD, les bibliothèques sont importées avant la mesure, qui ne compte
+# alors que le chargement du modèle lui-même.
+PRELOAD = "import pandas, sklearn.model_selection, sklearn.neural_network"
+
+TIMED_SCRIPT = """
+import time, warnings
+warnings.filterwarnings('ignore')
+{preload}
+start = time.perf_counter()
+{body}
+predictor.diagnose_batch([[0.0] * {n_features}])
+print(time.perf_counter() - start)
+"""
+
+
+def prepare(workdir: str, n_rows: int, n_features: int, hidden):
+    """Crée le CSV, entraîne un modèle et l'enregistre en pickle et en artefact."""
+    import warnings
+    import pandas as pd
+    from sklearn.datasets import make_classification
+    
+    from core.dataset import Dataset
+    from core.neural_network import NeuralNetworkModel
+    from pipeline.trainer import Trainer
+    from utils.preprocessing import Preprocessor
+    from app.interface_clinique import ClinicalPredictor
+    
+    X, y = make_classification(n_samples=n_rows, n_features=n_features, random_state=0)
+    df = pd.DataFrame(X, columns=[f'feature_{i}' for i in range(n_features)])
+    df['diagnosis'] = y
+    paths = {
+        'csv': os.path.join(workdir, 'patient_data.csv'),
+        'pickle_path': os.path.join(workdir, 'predictor.pkl'),
+        'artifact_path': os.path.join(workdir, 'artifact'),
+    }
+    df.to_csv(paths['csv'], index=False)
+    
+    dataset = Dataset().load_from_csv(paths['csv'])
+    preprocessor = Preprocessor()
+    dataset.X_train = preprocessor.fit_transform(dataset.X_train)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = Trainer(NeuralNetworkModel(hidden_layer_sizes=hidden, max_iter=20, random_state=0),
+                        dataset).train().get_trained_model()
+    predictor = ClinicalPredictor(model, preprocessor=preprocessor)
+    with open(paths['pickle_path'], 'wb') as f:
+        pickle.dump(predictor, f, protocol=pickle.HIGHEST_PROTOCOL)
+    predictor.save_artifact(paths['artifact_path'])
+    return paths
+
+
+def time_startup(body: str, n_features: int, preload: str = '') -> dict:
+    """Lance un processus neuf et mesure le temps jusqu'à la première prédiction."""
+    script = TIMED_SCRIPT.format(body=body, n_features=n_features, preload=preload)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return {'process_s': time.perf_counter() - start, 'ready_s': float(output.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--hidden', type=int, nargs='+', default=[256, 256])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+    hidden = tuple(args.hidden)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = prepare(workdir, args.rows, args.features, hidden)
+        sizes = {
+            'pickle': os.path.getsize(paths['pickle_path']),
+            'artifact': sum(os.path.getsize(os.path.join(paths['artifact_path'], name))
+                            for name in os.listdir(paths['artifact_path'])),
+        }
+        for name, template in STARTUP_SCRIPTS.items():
+            body = template.format(hidden=hidden, **paths)
+            runs = [time_startup(body, args.features) for _ in range(args.repeat)]
+            preloaded = [time_startup(body, args.features, PRELOAD) for _ in range(args.repeat)]
+            result = {
+                'name': name,
+                'ready_s': min(run['ready_s'] for run in runs),
+                'load_s': min(run['ready_s'] for run in preloaded),
+                'process_s': min(run['process_s'] for run in runs),
+                'size_bytes': sizes.get(name),
+            }
+            results.append(result)
+            print(f"{name:9s} prêt en {result['ready_s'] * 1000:9.1f} ms  "
+                  f"(hors imports {result['load_s'] * 1000:8.1f} ms, "
+                  f"processus complet {result['process_s'] * 1000:9.1f} ms)")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
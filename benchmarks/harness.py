@@ -0,0 +1,317 @@
+"""
+Banc de performance des chemins critiques.
+
+Génère des cohortes synthétiques à l'échelle voulue (10³ à 10⁷ patients), mesure
+débit, percentiles de latence et pic mémoire de chaque chemin critique, écrit les
+résultats en JSON et les compare à une référence enregistrée pour signaler les
+régressions.
+
+Usage:
+    python -m benchmarks.harness --scale 100000 --output bench.json
+    python -m benchmarks.harness --scale 100000 --baseline bench.json --tolerance 0.2
+    python -m benchmarks.harness --only alert_check diagnose
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+VITAL_RANGES = {
+    'temperature': (36.8, 1.2),
+    'heart_rate': (85.0, 25.0),
+    'blood_pressure_systolic': (125.0, 25.0),
+    'blood_pressure_diastolic': (80.0, 15.0),
+    'oxygen_saturation': (95.0, 4.0),
+    'respiratory_rate': (17.0, 5.0),
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Enregistre une fonction de benchmark sous `name`."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+class Cohort:
+    """Cohorte synthétique : signes vitaux, features et diagnostics."""
+    
+    def __init__(self, n_patients: int, n_features: int = 20, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.n_patients = n_patients
+        self.vitals = {
+            name: rng.normal(mean, std, n_patients)
+            for name, (mean, std) in VITAL_RANGES.items()
+        }
+        self.feature_names = [f'feature_{i}' for i in range(n_features)]
+        weights = rng.normal(size=n_features)
+        self.X = rng.normal(size=(n_patients, n_features))
+        logits = self.X @ weights + rng.normal(scale=0.5, size=n_patients)
+        self.y = (logits > 0).astype(np.int64)
+    
+    def vitals_row(self, i: int) -> dict:
+        return {name: float(values[i]) for name, values in self.vitals.items()}
+    
+    def features_row(self, i: int) -> dict:
+        return dict(zip(self.feature_names, self.X[i].tolist()))
+    
+    def write_csv(self, path: str, chunk_rows: int = 500_000):
+        """Écrit la cohorte au format patient_data.csv, par blocs."""
+        header = ','.join(self.feature_names + ['diagnosis'])
+        with open(path, 'w') as f:
+            f.write(header + '\n')
+            for start in range(0, self.n_patients, chunk_rows):
+                block = np.column_stack([self.X[start:start + chunk_rows],
+                                         self.y[start:start + chunk_rows]])
+                np.savetxt(f, block, delimiter=',', fmt=['%.6f'] * len(self.feature_names) + ['%d'])
+
+
+def _trained_predictor(cohort: Cohort, max_rows: int = 50_000):
+    from app.interface_clinique import ClinicalPredictor
+    from core.logistic_regression import LogisticRegressionModel
+    
+    n = min(cohort.n_patients, max_rows)
+    model = LogisticRegressionModel(max_iter=1000).train(cohort.X[:n], cohort.y[:n])
+    model.feature_names = list(cohort.feature_names)
+    return ClinicalPredictor(model)
+
+
+def time_calls(function, arguments, max_calls: int) -> dict:
+    """Chronomètre un appel par argument et résume latences et débit."""
+    arguments = arguments[:max_calls]
+    latencies = np.empty(len(arguments))
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for i, argument in enumerate(arguments):
+        t0 = perf_counter()
+        function(argument)
+        latencies[i] = perf_counter() - t0
+    wall = perf_counter() - start
+    return {
+        'n': len(arguments),
+        'throughput': len(arguments) / wall,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+    }
+
+
+def time_once(function, n_items: int, repeat: int = 3) -> dict:
+    """Chronomètre un traitement par lot (meilleur de `repeat`) et retourne son débit."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    return {
+        'n': n_items,
+        'throughput': n_items / best,
+        'p50_ms': float(np.median(durations) * 1000),
+        'p95_ms': float(max(durations) * 1000),
+        'p99_ms': float(max(durations) * 1000),
+    }
+
+
+@benchmark('alert_check')
+def bench_alert_check(cohort: Cohort, options):
+    from core.alert_system import AlertSystem
+    
+    alert_system = AlertSystem()
+    rows = [cohort.vitals_row(i) for i in range(min(cohort.n_patients, options.max_calls))]
+    return time_calls(alert_system.check_vital_signs, rows, options.max_calls)
+
+
+@benchmark('alert_check_batch')
+def bench_alert_check_batch(cohort: Cohort, options):
+    from core.alert_system import AlertSystem
+    
+    alert_system = AlertSystem()
+    return time_once(lambda: alert_system.check_vital_signs_batch(cohort.vitals), cohort.n_patients)
+
+
+@benchmark('diagnose')
+def bench_diagnose(cohort: Cohort, options):
+    predictor = _trained_predictor(cohort)
+    return time_calls(predictor.diagnose, cohort.X, options.max_calls)
+
+
+@benchmark('diagnose_batch')
+def bench_diagnose_batch(cohort: Cohort, options):
+    predictor = _trained_predictor(cohort)
+    return time_once(lambda: predictor.diagnose_batch(cohort.X), cohort.n_patients)
+
+
+@benchmark('predict_endpoint')
+def bench_predict_endpoint(cohort: Cohort, options):
+    from app.api import ClinicalAPI
+    
+    api = ClinicalAPI(_trained_predictor(cohort))
+    payloads = [cohort.features_row(i) for i in range(min(cohort.n_patients, options.max_calls))]
+    return time_calls(api.predict_endpoint, payloads, options.max_calls)
+
+
+@benchmark('train')
+def bench_train(cohort: Cohort, options):
+    from core.dataset import Dataset
+    from core.logistic_regression import LogisticRegressionModel
+    from pipeline.trainer import Trainer
+    
+    dataset = Dataset()
+    dataset.X_train, dataset.y_train = cohort.X, cohort.y
+    return time_once(lambda: Trainer(LogisticRegressionModel(max_iter=1000), dataset).train(),
+                     cohort.n_patients, repeat=1)
+
+
+@benchmark('optimize')
+def bench_optimize(cohort: Cohort, options):
+    from core.logistic_regression import LogisticRegressionModel
+    from core.optimizer import Optimizer
+    
+    n = min(cohort.n_patients, options.optimize_rows)
+    optimizer = Optimizer(LogisticRegressionModel, {'C': [0.01, 0.1, 1.0, 10.0], 'max_iter': [1000]},
+                          n_jobs=options.jobs)
+    return time_once(lambda: optimizer.optimize(cohort.X[:n], cohort.y[:n]), n, repeat=1)
+
+
+@benchmark('load_csv')
+def bench_load_csv(cohort: Cohort, options):
+    from core.dataset import Dataset
+    
+    path = os.path.join(options.workdir, f'cohort_{cohort.n_patients}.csv')
+    if not os.path.exists(path):
+        cohort.write_csv(path)
+    return time_once(lambda: Dataset().load_from_csv(path), cohort.n_patients, repeat=1)
+
+
+@benchmark('load_csv_cached')
+def bench_load_csv_cached(cohort: Cohort, options):
+    from core.dataset import Dataset
+    
+    path = os.path.join(options.workdir, f'cohort_{cohort.n_patients}.csv')
+    if not os.path.exists(path):
+        cohort.write_csv(path)
+    cache_dir = os.path.join(options.workdir, 'cache')
+    Dataset().load_from_csv_chunked(path, cache_dir=cache_dir)  # Construction du cache (non mesurée)
+    return time_once(lambda: Dataset().load_from_csv_chunked(path, cache_dir=cache_dir), cohort.n_patients)
+
+
+def peak_memory(function, cohort: Cohort, options) -> float:
+    """Pic d'allocation (Mo) mesuré par tracemalloc lors d'une exécution séparée."""
+    tracemalloc.start()
+    try:
+        function(cohort, options)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run(options) -> dict:
+    """Exécute les benchmarks sélectionnés et retourne le rapport."""
+    names = options.only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Benchmarks inconnus: {sorted(unknown)}")
+    
+    cohort = Cohort(options.scale, n_features=options.features, seed=options.seed)
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for name in names:
+            result = BENCHMARKS[name](cohort, options)
+            if options.memory:
+                result['peak_mem_mb'] = peak_memory(BENCHMARKS[name], cohort, options)
+            results[name] = result
+            print(f"{name:18s} {result['throughput']:14,.0f} /s  p50={result['p50_ms']:9.3f} ms  "
+                  f"p99={result['p99_ms']:9.3f} ms"
+                  + (f"  mem={result['peak_mem_mb']:8.1f} Mo" if 'peak_mem_mb' in result else ''))
+    
+    return {
+        'meta': {
+            'scale': options.scale,
+            'features': options.features,
+            'max_calls': options.max_calls,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare un rapport à la référence.
+    
+    Une régression est signalée si le débit baisse, ou si la latence p99 augmente,
+    de plus de `tolerance` (fraction) par rapport à la référence.
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        if result['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append((name, 'throughput', reference['throughput'], result['throughput']))
+        if result['p99_ms'] > reference['p99_ms'] * (1 + tolerance):
+            regressions.append((name, 'p99_ms', reference['p99_ms'], result['p99_ms']))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=int, default=10_000, help="Nombre de patients (10³ à 10⁷)")
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-calls', type=int, default=10_000,
+                        help="Nombre maximal d'appels unitaires chronométrés par benchmark")
+    parser.add_argument('--optimize-rows', type=int, default=20_000)
+    parser.add_argument('--jobs', type=int, default=1, help="Processus pour Optimizer")
+    parser.add_argument('--only', nargs='+', help=f"Benchmarks à exécuter parmi {list(BENCHMARKS)}")
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="Ne pas mesurer le pic mémoire (exécution deux fois plus rapide)")
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--workdir', help="Répertoire des fichiers temporaires")
+    return parser
+
+
+def main(argv=None) -> int:
+    options = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        options.workdir = options.workdir or tmp
+        report = run(options)
+    
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('scale') != options.scale:
+            print(f"Attention : référence mesurée à l'échelle {baseline.get('meta', {}).get('scale')}")
+        regressions = compare(report, baseline, options.tolerance)
+        for name, metric, reference, current in regressions:
+            print(f"RÉGRESSION {name}.{metric}: {reference:.4g} -> {current:.4g}")
+        if regressions:
+            return 1
+        print("Aucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Flux d'alertes en continu pour les moniteurs de chevet.
+
+Les moniteurs envoient des mises à jour partielles (un paramètre à la fois).
+AlertStream conserve un état compact par patient et ne réévalue que les règles
+du paramètre modifié : le coût d'un événement ne dépend pas du nombre de patients.
+"""
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
+
+from core.alert_system import (
+    AlertSystem, SEVERITY_LEVELS, SEVERITY_NONE, SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH
+)
+
+# Événement moniteur : (patient_id, paramètre, valeur, horodatage)
+VitalSignEvent = Tuple[Any, str, float, float]
+
+
+class AlertStream:
+    """
+    Évaluation incrémentale des alertes sur un flux d'événements de signes vitaux.
+
+    Une alerte n'est émise que lorsque la sévérité globale d'un patient change,
+    avec les mêmes règles de priorité que AlertSystem.check_vital_signs.
+    """
+
+    def __init__(self, alert_system: AlertSystem = None, initial_capacity: int = 1024):
+        """
+        Initialise le flux à partir des règles compilées d'un système d'alerte.
+
+        Args:
+            alert_system: Système d'alerte dont les règles sont appliquées
+            initial_capacity: Nombre de patients prévus (l'état s'agrandit au besoin)
+        """
+        self.alert_system = alert_system or AlertSystem()
+        self.parameters = list(self.alert_system.parameters)
+
+        # Règles indexées par paramètre : (colonne, critiques, moyennes, min, max)
+        compiled = self.alert_system._compiled_conditions
+        self._rules = {}
+        for j, param in enumerate(self.parameters):
+            high = tuple((op == '>', thr) for p, op, _, thr in compiled.get('high', ()) if p == param)
+            medium = tuple((op == '>', thr) for p, op, _, thr in compiled.get('medium', ()) if p == param)
+            min_val, max_val = self.alert_system.alert_thresholds.get(param, (-np.inf, np.inf))
+            self._rules[param] = (j, high, medium, min_val, max_val)
+
+        self._patients: Dict[Any, int] = {}
+        self._free_rows = []
+        self._allocate(max(1, initial_capacity))
+
+    # Tableaux d'état : nom -> (colonnes, dtype, valeur initiale)
+    _STATE_LAYOUT = {
+        '_values': ('parameters', np.float64, np.nan),
+        '_timestamps': ('parameters', np.float64, -np.inf),
+        # Drapeaux par paramètre : règle critique / moyenne déclenchée, hors seuils normaux
+        '_high': ('parameters', bool, False),
+        '_medium': ('parameters', bool, False),
+        '_out_of_range': ('parameters', bool, False),
+        # Compteurs par patient des trois drapeaux ci-dessus
+        '_counts': (3, np.int32, 0),
+        '_severity': (None, np.int8, SEVERITY_NONE),
+    }
+
+    def _allocate(self, capacity: int):
+        """Alloue (ou agrandit) les tableaux d'état pour `capacity` patients."""
+        for name, (columns, dtype, fill) in self._STATE_LAYOUT.items():
+            if columns == 'parameters':
+                columns = len(self.parameters)
+            shape = (capacity,) if columns is None else (capacity, columns)
+            array = np.full(shape, fill, dtype=dtype)
+            previous = getattr(self, name, None)
+            if previous is not None:
+                array[:len(previous)] = previous
+            setattr(self, name, array)
+        self._capacity = capacity
+
+    def _row(self, patient_id) -> int:
+        """Retourne la ligne d'état du patient, en la créant si nécessaire."""
+        row = self._patients.get(patient_id)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._patients)
+                if row >= self._capacity:
+                    self._allocate(2 * self._capacity)
+            self._patients[patient_id] = row
+        return row
+
+    def update(self, patient_id, parameter: str, value: float, timestamp: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Applique une mise à jour d'un paramètre et réévalue uniquement ses règles.
+
+        Args:
+            patient_id: Identifiant du patient
+            parameter: Nom du paramètre vital mis à jour
+            value: Nouvelle valeur mesurée
+            timestamp: Horodatage de la mesure (les mesures plus anciennes que
+                la dernière reçue pour ce paramètre sont ignorées)
+
+        Returns:
+            Un événement d'alerte si la sévérité du patient a changé, None sinon
+        """
+        rules = self._rules.get(parameter)
+        if rules is None:
+            return None
+        j, high_rules, medium_rules, min_val, max_val = rules
+        row = self._row(patient_id)
+
+        if timestamp < self._timestamps[row, j]:
+            return None
+        self._timestamps[row, j] = timestamp
+        self._values[row, j] = value
+
+        high = any(value > thr if greater else value < thr for greater, thr in high_rules)
+        medium = any(value > thr if greater else value < thr for greater, thr in medium_rules)
+        out_of_range = value < min_val or value > max_val
+
+        counts = self._counts[row]
+        for k, (flags, flag) in enumerate(((self._high, high), (self._medium, medium),
+                                           (self._out_of_range, out_of_range))):
+            if flags[row, j] != flag:
+                flags[row, j] = flag
+                counts[k] += 1 if flag else -1
+
+        if counts[0]:
+            severity = SEVERITY_HIGH
+        elif counts[1]:
+            severity = SEVERITY_MEDIUM
+        elif counts[2]:
+            severity = SEVERITY_LOW
+        else:
+            severity = SEVERITY_NONE
+
+        previous = int(self._severity[row])
+        if severity == previous:
+            return None
+        self._severity[row] = severity
+
+        return {
+            'patient_id': patient_id,
+            'timestamp': timestamp,
+            'parameter': parameter,
+            'value': value,
+            'severity': SEVERITY_LEVELS[severity],
+            'previous_severity': SEVERITY_LEVELS[previous],
+            'alerts': self.alert_system.check_vital_signs(self.vitals(patient_id))
+        }
+
+    def process(self, events: Iterable[VitalSignEvent]) -> Iterator[Dict[str, Any]]:
+        """Consomme un itérateur d'événements et produit les changements de sévérité."""
+        update = self.update
+        for patient_id, parameter, value, timestamp in events:
+            alert = update(patient_id, parameter, value, timestamp)
+            if alert is not None:
+                yield alert
+
+    async def aprocess(self, events: Union[AsyncIterable[VitalSignEvent], Iterable[VitalSignEvent]]) -> AsyncIterator[Dict[str, Any]]:
+        """Version asynchrone de process (accepte aussi un itérable classique)."""
+        if not hasattr(events, '__aiter__'):
+            for alert in self.process(events):
+                yield alert
+            return
+        update = self.update
+        async for patient_id, parameter, value, timestamp in events:
+            alert = update(patient_id, parameter, value, timestamp)
+            if alert is not None:
+                yield alert
+
+    def vitals(self, patient_id) -> Dict[str, float]:
+        """Retourne les dernières valeurs connues d'un patient."""
+        row = self._patients.get(patient_id)
+        if row is None:
+            return {}
+        values = self._values[row]
+        return {param: float(values[j]) for j, param in enumerate(self.parameters) if not np.isnan(values[j])}
+
+    def severity(self, patient_id) -> str:
+        """Retourne la sévérité courante d'un patient."""
+        row = self._patients.get(patient_id)
+        return SEVERITY_LEVELS[SEVERITY_NONE if row is None else int(self._severity[row])]
+
+    def remove_patient(self, patient_id):
+        """Libère l'état d'un patient (sortie, transfert)."""
+        row = self._patients.pop(patient_id, None)
+        if row is None:
+            return
+        for name, (_, _, fill) in self._STATE_LAYOUT.items():
+            getattr(self, name)[row] = fill
+        self._free_rows.append(row)
+
+    def __len__(self):
+        return len(self._patients)
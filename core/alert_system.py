@@ -1,9 +1,104 @@
 """
 Système d'alerte pour identifier les cas urgents nécessitant une attention immédiate.
 """
+from collections.abc import Mapping
 from typing import Dict, List, Any
 import numpy as np
 
+from utils import instrumentation
+
+# Codes de sévérité numériques (l'ordre des codes est l'ordre de gravité)
+SEVERITY_NONE, SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH = 0, 1, 2, 3
+SEVERITY_LEVELS = ('none', 'low', 'medium', 'high')
+
+_SEVERITY_EMOJIS = ('', '🟡', '🟠', '🔴')
+_SEVERITY_ACTIONS = (
+    '',
+    'Surveillance conseillée.',
+    'Surveillance recommandée.',
+    'Nécessite une attention médicale immédiate!'
+)
+
+
+class Alert:
+    """
+    Alerte compacte : paramètre, valeur, code de sévérité et seuil franchi.
+    
+    Le message et l'action ne sont construits que lorsqu'ils sont lus. Les clés
+    des anciennes alertes dictionnaires restent accessibles (alert['message']...).
+    """
+    
+    __slots__ = ('parameter', 'value', 'code', 'operator', 'limit')
+    
+    _KEYS = ('parameter', 'value', 'threshold', 'severity', 'message', 'action')
+    
+    def __init__(self, parameter: str, value: float, code: int, operator: str, limit):
+        """
+        Args:
+            parameter: Paramètre vital concerné
+            value: Valeur mesurée
+            code: Code de sévérité (SEVERITY_LOW, SEVERITY_MEDIUM ou SEVERITY_HIGH)
+            operator: '>' ou '<', sens du dépassement
+            limit: Seuil franchi (texte de la condition critique, ou borne normale)
+        """
+        self.parameter = parameter
+        self.value = value
+        self.code = code
+        self.operator = operator
+        self.limit = limit
+    
+    @property
+    def severity(self) -> str:
+        return SEVERITY_LEVELS[self.code]
+    
+    @property
+    def threshold(self) -> str:
+        if self.code == SEVERITY_LOW:
+            return f'{self.operator} {self.limit}'
+        return self.limit
+    
+    @property
+    def message(self) -> str:
+        if self.code == SEVERITY_HIGH:
+            return f'CRITIQUE: {self.parameter} = {self.value} ({self.operator} {self.limit})'
+        if self.code == SEVERITY_MEDIUM:
+            return f'Alerte: {self.parameter} = {self.value} ({self.operator} {self.limit})'
+        if self.operator == '<':
+            return f'Valeur basse: {self.parameter} = {self.value} (min: {self.limit})'
+        return f'Valeur élevée: {self.parameter} = {self.value} (max: {self.limit})'
+    
+    @property
+    def action(self) -> str:
+        return _SEVERITY_ACTIONS[self.code]
+    
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self._KEYS else default
+    
+    def keys(self):
+        return self._KEYS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Alerte au format dictionnaire (message et action rendus)."""
+        return {key: getattr(self, key) for key in self._KEYS}
+    
+    def __eq__(self, other):
+        if isinstance(other, Alert):
+            return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"Alert({self.severity}, {self.parameter}={self.value!r}, seuil {self.threshold})"
+
+
 class AlertSystem:
     """
     Classe pour gérer les alertes médicales basées sur les données des patients.
@@ -43,71 +138,146 @@ class AlertSystem:
                 'respiratory_rate > 25'
             ]
         }
+        self.compile_rules()
     
-    def check_vital_signs(self, patient_data: Dict[str, float]) -> List[Dict[str, Any]]:
+    def compile_rules(self):
+        """
+        Compile les conditions critiques et les seuils en tableaux NumPy.
+        
+        Appelée une seule fois à la construction : les chaînes de conditions ne
+        sont plus analysées à chaque vérification. À rappeler si
+        `critical_conditions` ou `alert_thresholds` sont modifiés ensuite.
+        """
+        self._compiled_conditions = {
+            severity: [
+                (param, operator, value, float(value))
+                for param, operator, value in map(self._parse_condition, conditions)
+            ]
+            for severity, conditions in self.critical_conditions.items()
+        }
+        
+        # Ordre des colonnes attendu par check_vital_signs_batch
+        parameters = list(self.alert_thresholds)
+        for rules in self._compiled_conditions.values():
+            for param, _, _, _ in rules:
+                if param not in parameters:
+                    parameters.append(param)
+        self.parameters = parameters
+        self._parameter_index = {param: i for i, param in enumerate(parameters)}
+        
+        self._rule_arrays = {}
+        for severity, rules in self._compiled_conditions.items():
+            columns = np.array([self._parameter_index[rule[0]] for rule in rules], dtype=np.intp)
+            thresholds = np.array([rule[3] for rule in rules], dtype=np.float64)
+            greater = np.array([rule[1] == '>' for rule in rules], dtype=bool)
+            # owners[r, j] : la règle r porte sur le paramètre j
+            owners = np.zeros((len(rules), len(parameters)), dtype=bool)
+            owners[np.arange(len(rules)), columns] = True
+            self._rule_arrays[severity] = (columns, thresholds, greater, owners)
+        
+        self._min_values = np.full(len(parameters), -np.inf)
+        self._max_values = np.full(len(parameters), np.inf)
+        for param, (min_val, max_val) in self.alert_thresholds.items():
+            self._min_values[self._parameter_index[param]] = min_val
+            self._max_values[self._parameter_index[param]] = max_val
+        return self
+    
+    @instrumentation.instrumented('alerts.check_vital_signs')
+    def check_vital_signs(self, patient_data: Dict[str, float]) -> List[Alert]:
         """
         Vérifie les signes vitaux d'un patient et retourne les alertes si nécessaire.
         
         Args:
             patient_data: Dictionnaire des données du patient
-            
+        
         Returns:
-            Liste des alertes générées
+            Liste des alertes générées (message et action rendus à la demande)
         """
         alerts = []
         
         # Vérification des valeurs critiques
-        for condition in self.critical_conditions['high']:
-            param, operator, value = self._parse_condition(condition)
-            if param in patient_data and self._evaluate_condition(patient_data[param], operator, float(value)):
-                alerts.append({
-                    'parameter': param,
-                    'value': patient_data[param],
-                    'threshold': value,
-                    'severity': 'high',
-                    'message': f'CRITIQUE: {param} = {patient_data[param]} ({operator} {value})',
-                    'action': 'Nécessite une attention médicale immédiate!'
-                })
+        for param, operator, value, threshold in self._compiled_conditions['high']:
+            if param in patient_data and self._evaluate_condition(patient_data[param], operator, threshold):
+                alerts.append(Alert(param, patient_data[param], SEVERITY_HIGH, operator, value))
         
         # Vérification des valeurs d'alerte moyenne
         if not alerts:  # On ne vérifie les alertes moyennes que s'il n'y a pas d'alerte critique
-            for condition in self.critical_conditions['medium']:
-                param, operator, value = self._parse_condition(condition)
-                if param in patient_data and self._evaluate_condition(patient_data[param], operator, float(value)):
-                    alerts.append({
-                        'parameter': param,
-                        'value': patient_data[param],
-                        'threshold': value,
-                        'severity': 'medium',
-                        'message': f'Alerte: {param} = {patient_data[param]} ({operator} {value})',
-                        'action': 'Surveillance recommandée.'
-                    })
+            for param, operator, value, threshold in self._compiled_conditions['medium']:
+                if param in patient_data and self._evaluate_condition(patient_data[param], operator, threshold):
+                    alerts.append(Alert(param, patient_data[param], SEVERITY_MEDIUM, operator, value))
         
         # Vérification des seuils normaux
+        alerted = {alert.parameter for alert in alerts}
         for param, (min_val, max_val) in self.alert_thresholds.items():
-            if param in patient_data:
+            if param in patient_data and param not in alerted:
                 value = patient_data[param]
-                if value < min_val and not any(a['parameter'] == param for a in alerts):
-                    alerts.append({
-                        'parameter': param,
-                        'value': value,
-                        'threshold': f'< {min_val}',
-                        'severity': 'low',
-                        'message': f'Valeur basse: {param} = {value} (min: {min_val})',
-                        'action': 'Surveillance conseillée.'
-                    })
-                elif value > max_val and not any(a['parameter'] == param for a in alerts):
-                    alerts.append({
-                        'parameter': param,
-                        'value': value,
-                        'threshold': f'> {max_val}',
-                        'severity': 'low',
-                        'message': f'Valeur élevée: {param} = {value} (max: {max_val})',
-                        'action': 'Surveillance conseillée.'
-                    })
+                if value < min_val:
+                    alerts.append(Alert(param, value, SEVERITY_LOW, '<', min_val))
+                elif value > max_val:
+                    alerts.append(Alert(param, value, SEVERITY_LOW, '>', max_val))
         
+        if instrumentation.registry.enabled:
+            for alert in alerts:
+                instrumentation.increment('alerts', severity=alert.severity)
         return alerts
     
+    def check_vital_signs_batch(self, vitals) -> Dict[str, Any]:
+        """
+        Vérifie les signes vitaux d'une cohorte entière en une passe vectorisée.
+        
+        Applique exactement les mêmes règles de priorité que check_vital_signs :
+        les alertes moyennes ne sont retenues que pour les patients sans alerte
+        critique, et un seuil normal n'alerte que sur un paramètre sans alerte.
+        
+        Args:
+            vitals: Signes vitaux en colonnes (DataFrame ou dictionnaire
+                paramètre -> valeurs), liste de dictionnaires patient, ou
+                matrice (n_patients, n_paramètres) dans l'ordre de `self.parameters`.
+                Une valeur manquante (NaN) ne déclenche aucune alerte.
+        
+        Returns:
+            Dictionnaire contenant :
+                - 'parameters': ordre des colonnes des matrices
+                - 'severity': code de sévérité maximal par patient (n_patients,)
+                - 'levels': code de sévérité par patient et paramètre
+                - 'high', 'medium', 'low': masques booléens d'alerte par niveau
+            Les codes indexent SEVERITY_LEVELS ('none', 'low', 'medium', 'high').
+        """
+        values = self._as_vitals_matrix(vitals)
+        
+        high = self._evaluate_rules(values, 'high')
+        medium = self._evaluate_rules(values, 'medium') & ~high.any(axis=1)[:, None]
+        out_of_range = (values < self._min_values) | (values > self._max_values)
+        low = out_of_range & ~(high | medium)
+        
+        levels = np.zeros(values.shape, dtype=np.int8)
+        levels[low] = SEVERITY_LOW
+        levels[medium] = SEVERITY_MEDIUM
+        levels[high] = SEVERITY_HIGH
+        severity = levels.max(axis=1, initial=SEVERITY_NONE)
+        
+        return {
+            'parameters': list(self.parameters),
+            'severity': severity,
+            'levels': levels,
+            'high': high,
+            'medium': medium,
+            'low': low
+        }
+    
+    def _evaluate_rules(self, values: np.ndarray, severity: str) -> np.ndarray:
+        """Évalue toutes les règles d'un niveau et retourne le masque par paramètre."""
+        if severity not in self._rule_arrays:
+            return np.zeros(values.shape, dtype=bool)
+        columns, thresholds, greater, owners = self._rule_arrays[severity]
+        selected = values[:, columns]
+        hits = np.where(greater, selected > thresholds, selected < thresholds)
+        return hits @ owners
+    
+    def _as_vitals_matrix(self, vitals) -> np.ndarray:
+        """Convertit les signes vitaux en matrice float64 ordonnée selon `self.parameters`."""
+        return vitals_matrix(vitals, self.parameters)
+    
     def _parse_condition(self, condition: str) -> tuple:
         """Parse une condition en paramètre, opérateur et valeur."""
         import re
@@ -125,18 +295,78 @@ class AlertSystem:
         else:
             raise ValueError(f"Opérateur non supporté: {operator}")
     
-    def format_alerts(self, alerts: List[Dict[str, Any]]) -> str:
-        """Formate les alertes pour l'affichage."""
+    def format_alerts(self, alerts: List[Alert]) -> str:
+        """Formate les alertes pour l'affichage, de la plus grave à la moins grave."""
         if not alerts:
             return "Aucune alerte pour le moment."
         
         output = []
-        for alert in sorted(alerts, key=lambda x: x['severity'], reverse=True):
-            severity_emoji = '🔴' if alert['severity'] == 'high' else '🟠' if alert['severity'] == 'medium' else '🟡'
+        for alert in sorted(alerts, key=_severity_code, reverse=True):
             output.append(
-                f"{severity_emoji} {alert['message']}\n"
+                f"{_SEVERITY_EMOJIS[_severity_code(alert)]} {alert['message']}\n"
                 f"   → Action: {alert['action']}\n"
                 f"   → Valeur: {alert['value']} (seuil: {alert['threshold']})\n"
             )
         
         return "\n".join(output)
+
+
+def vitals_matrix(vitals, parameters: List[str], out: np.ndarray = None) -> np.ndarray:
+    """
+    Convertit des signes vitaux en matrice float64 (n_patients, len(parameters)).
+    
+    Args:
+        vitals: Données en colonnes (DataFrame ou dictionnaire paramètre -> valeurs),
+            liste de dictionnaires patient, ou matrice déjà ordonnée selon `parameters`.
+            Un paramètre absent donne une valeur manquante (NaN).
+        parameters: Ordre des colonnes
+        out: Matrice de destination (par exemple en mémoire partagée), allouée si absente
+    """
+    n_parameters = len(parameters)
+    
+    if isinstance(vitals, np.ndarray):
+        values = np.asarray(vitals, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != n_parameters:
+            raise ValueError(
+                f"Matrice de forme (n_patients, {n_parameters}) attendue, "
+                f"reçu {values.shape}"
+            )
+        if out is None:
+            return values
+        np.copyto(out, values)
+        return out
+    
+    if isinstance(vitals, Mapping) or hasattr(vitals, 'columns'):
+        # Données en colonnes : dictionnaire ou DataFrame
+        if hasattr(vitals, 'columns'):
+            n_patients = len(vitals)
+        else:
+            n_patients = len(next((vitals[p] for p in parameters if p in vitals), ()))
+        values = _nan_matrix((n_patients, n_parameters), out)
+        for i, param in enumerate(parameters):
+            if param in vitals:
+                values[:, i] = np.asarray(vitals[param], dtype=np.float64)
+        return values
+    
+    # Liste de dictionnaires patient
+    values = _nan_matrix((len(vitals), n_parameters), out)
+    for i, param in enumerate(parameters):
+        values[:, i] = [patient.get(param, np.nan) for patient in vitals]
+    return values
+
+
+def _nan_matrix(shape: tuple, out: np.ndarray = None) -> np.ndarray:
+    """Matrice remplie de NaN, écrite dans `out` si fourni."""
+    if out is None:
+        return np.full(shape, np.nan)
+    if out.shape != shape:
+        raise ValueError(f"Matrice de destination de forme {shape} attendue, reçu {out.shape}")
+    out.fill(np.nan)
+    return out
+
+
+def _severity_code(alert) -> int:
+    """Code de sévérité d'une alerte (Alert ou ancien dictionnaire)."""
+    if isinstance(alert, Alert):
+        return alert.code
+    return SEVERITY_LEVELS.index(alert['severity'])
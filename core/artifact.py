@@ -0,0 +1,152 @@
+"""
+Artefact de modèle versionné : modèle entraîné, préprocesseur ajusté et schéma des features.
+
+Un artefact est un répertoire :
+    manifest.json  version du format, classe du modèle, schéma, métadonnées
+                   et position des tableaux dans weights.bin
+    model.pkl      structure des objets (pickle protocole 5, sans les tableaux)
+    weights.bin    tableaux NumPy (poids, moyennes...) alignés sur 64 octets
+
+Au chargement, weights.bin est projeté en mémoire (mmap) et les tableaux sont
+reconstruits directement sur cette projection : pas de copie, démarrage rapide,
+et les processus forkés partagent les mêmes pages.
+
+Attention : model.pkl est un pickle, ne charger que des artefacts de confiance.
+"""
+from typing import Any, Dict, List, Optional
+
+FORMAT_VERSION = 1
+_ALIGNMENT = 64
+
+
+class ModelArtifact:
+    """Regroupe tout ce qui est nécessaire pour servir un modèle."""
+    
+    def __init__(self, model, preprocessor=None, feature_names: Optional[List[str]] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            model: Modèle entraîné (instance de Model)
+            preprocessor: Préprocesseur ajusté sur les données d'entraînement
+            feature_names: Schéma des features (par défaut celui du modèle)
+            metadata: Informations libres sérialisables en JSON
+        """
+        self.model = model
+        self.preprocessor = preprocessor
+        if feature_names is None:
+            feature_names = getattr(model, 'feature_names', None)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.metadata = dict(metadata or {})
+        self.manifest = None
+    
+    def save(self, path: str):
+        """
+        Enregistre l'artefact dans le répertoire `path` (remplacé s'il existe).
+        
+        Returns:
+            Le manifeste écrit
+        """
+        import json
+        import os
+        import pickle
+        import shutil
+        import tempfile
+        import time
+        import numpy as np
+        
+        buffers = []
+        payload = pickle.dumps(
+            {'model': self.model, 'preprocessor': self.preprocessor},
+            protocol=5, buffer_callback=buffers.append
+        )
+        
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-artifact-')
+        try:
+            layout, offset = [], 0
+            with open(os.path.join(tmp_dir, 'weights.bin'), 'wb') as f:
+                for buffer in buffers:
+                    data = buffer.raw()
+                    padding = -offset % _ALIGNMENT
+                    f.write(b'\0' * padding)
+                    offset += padding
+                    f.write(data)
+                    layout.append([offset, data.nbytes])
+                    offset += data.nbytes
+            with open(os.path.join(tmp_dir, 'model.pkl'), 'wb') as f:
+                f.write(payload)
+            
+            manifest = {
+                'format_version': FORMAT_VERSION,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'model_class': f"{type(self.model).__module__}.{type(self.model).__qualname__}",
+                'feature_names': self.feature_names,
+                'metadata': self.metadata,
+                'buffers': layout,
+                'numpy_version': np.__version__
+            }
+            with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            
+            # L'ancien artefact est renommé à côté avant l'échange : à tout instant,
+            # un artefact complet existe à `path` ou sous ce nom de sauvegarde
+            old_dir = None
+            if os.path.exists(path):
+                old_dir = os.path.join(parent, f'.old-artifact-{os.path.basename(path)}-{os.getpid()}')
+                shutil.rmtree(old_dir, ignore_errors=True)
+                os.replace(path, old_dir)
+            try:
+                os.replace(tmp_dir, path)
+            except BaseException:
+                if old_dir is not None:
+                    os.replace(old_dir, path)
+                raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+        
+        self.manifest = manifest
+        return manifest
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        Charge un artefact.
+        
+        Args:
+            path: Répertoire de l'artefact
+            mmap: Projette les poids en mémoire (lecture seule, partagée entre
+                processus) ; sinon les copie en mémoire privée
+        """
+        import json
+        import mmap as mmap_module
+        import os
+        import pickle
+        
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version', 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"Format d'artefact {manifest['format_version']} non supporté "
+                f"(version maximale: {FORMAT_VERSION})"
+            )
+        
+        weights_path = os.path.join(path, 'weights.bin')
+        if mmap and os.path.getsize(weights_path) > 0:
+            with open(weights_path, 'rb') as f:
+                weights = memoryview(mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ))
+        else:
+            with open(weights_path, 'rb') as f:
+                weights = memoryview(bytearray(f.read()))
+        buffers = [weights[offset:offset + nbytes] for offset, nbytes in manifest['buffers']]
+        
+        with open(os.path.join(path, 'model.pkl'), 'rb') as f:
+            objects = pickle.loads(f.read(), buffers=buffers)
+        
+        artifact = cls(objects['model'], objects['preprocessor'],
+                       feature_names=manifest['feature_names'], metadata=manifest['metadata'])
+        artifact.manifest = manifest
+        return artifact
@@ -1,12 +1,20 @@
 class Dataset:
     """Gestion des données d'entraînement et de test"""
     
+    CACHE_FORMAT_VERSION = 1
+    
     def __init__(self, filepath: str = None):
         self.filepath = filepath
         self.X_train = None
         self.X_test = None
         self.y_train = None
         self.y_test = None
+        self.feature_names = None
+        # Chargement hors mémoire : matrices memmap et index du découpage
+        self.X = None
+        self.y = None
+        self.train_index = None
+        self.test_index = None
     
     def load_from_csv(self, filepath: str):
         """Charge les données depuis patient_data.csv"""
@@ -14,7 +22,8 @@ class Dataset:
         from sklearn.model_selection import train_test_split
         
         df = pd.read_csv(filepath)
-        X = df.drop('diagnosis', axis=1).values
+        self.feature_names = [column for column in df.columns if column != 'diagnosis']
+        X = df[self.feature_names].values
         y = df['diagnosis'].values
         
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
@@ -22,10 +31,148 @@ class Dataset:
         )
         return self
     
+    def load_from_csv_chunked(self, filepath: str, cache_dir: str = None, chunksize: int = 100_000,
+                              test_size: float = 0.2, random_state: int = 42, full_hash: bool = False):
+        """
+        Charge patient_data.csv hors mémoire via un cache memmap sur disque.
+        
+        Au premier chargement, le CSV est lu par blocs de `chunksize` lignes et
+        converti en matrices binaires typées (float64) dans `cache_dir`. Les
+        chargements suivants du même fichier ouvrent directement le cache en
+        memmap. Le découpage train/test est conservé sous forme d'index (mêmes
+        lignes que load_from_csv) : aucune copie des données n'est faite.
+        
+        Args:
+            filepath: Chemin du CSV (colonne cible 'diagnosis')
+            cache_dir: Répertoire du cache (par défaut .dataset_cache à côté du CSV)
+            chunksize: Nombre de lignes lues par bloc
+            test_size: Proportion des données de test
+            random_state: Graine du découpage
+            full_hash: Empreinte sur tout le fichier plutôt que sur un échantillon
+        """
+        import json
+        import os
+        import numpy as np
+        from sklearn.model_selection import train_test_split
+        
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(filepath)), '.dataset_cache')
+        entry = os.path.join(cache_dir, self._file_fingerprint(filepath, full_hash))
+        if not os.path.exists(os.path.join(entry, 'meta.json')):
+            self._build_cache(filepath, entry, chunksize)
+        
+        with open(os.path.join(entry, 'meta.json')) as f:
+            meta = json.load(f)
+        n_rows, n_features = meta['n_rows'], len(meta['feature_names'])
+        self.filepath = filepath
+        self.feature_names = meta['feature_names']
+        self.X = np.memmap(os.path.join(entry, 'X.bin'), dtype=meta['X_dtype'], mode='r',
+                           shape=(n_rows, n_features))
+        self.y = np.memmap(os.path.join(entry, 'y.bin'), dtype=meta['y_dtype'], mode='r',
+                           shape=(n_rows,))
+        self.train_index, self.test_index = train_test_split(
+            np.arange(n_rows), test_size=test_size, random_state=random_state
+        )
+        self.X_train = self.X_test = self.y_train = self.y_test = None
+        return self
+    
+    def _file_fingerprint(self, filepath: str, full_hash: bool = False) -> str:
+        """
+        Empreinte du fichier source, utilisée comme clé du cache.
+        
+        Par défaut : taille, date de modification et trois échantillons de 1 Mo
+        (début, milieu, fin), pour que la clé se calcule en millisecondes
+        même sur des extraits de plusieurs dizaines de Go.
+        """
+        import hashlib
+        import os
+        
+        stat = os.stat(filepath)
+        digest = hashlib.sha1(f"v{self.CACHE_FORMAT_VERSION}:{stat.st_size}".encode())
+        block = 1 << 20
+        with open(filepath, 'rb') as f:
+            if full_hash:
+                for data in iter(lambda: f.read(block), b''):
+                    digest.update(data)
+            else:
+                digest.update(str(stat.st_mtime_ns).encode())
+                for offset in (0, max(0, stat.st_size // 2 - block // 2), max(0, stat.st_size - block)):
+                    f.seek(offset)
+                    digest.update(f.read(block))
+        return digest.hexdigest()
+    
+    def _build_cache(self, filepath: str, entry: str, chunksize: int):
+        """Convertit le CSV bloc par bloc en matrices binaires X.bin / y.bin."""
+        import json
+        import os
+        import shutil
+        import tempfile
+        import numpy as np
+        import pandas as pd
+        
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry), prefix='.tmp-')
+        try:
+            n_rows, feature_names, y_dtype = 0, None, None
+            with open(os.path.join(tmp_dir, 'X.bin'), 'wb') as fx, \
+                    open(os.path.join(tmp_dir, 'y.bin'), 'wb') as fy:
+                for chunk in pd.read_csv(filepath, chunksize=chunksize):
+                    if feature_names is None:
+                        feature_names = [column for column in chunk.columns if column != 'diagnosis']
+                        y_dtype = chunk['diagnosis'].to_numpy().dtype
+                    np.ascontiguousarray(chunk[feature_names].to_numpy(dtype=np.float64)).tofile(fx)
+                    chunk['diagnosis'].to_numpy(dtype=y_dtype).tofile(fy)
+                    n_rows += len(chunk)
+            
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({
+                    'format_version': self.CACHE_FORMAT_VERSION,
+                    'source': os.path.abspath(filepath),
+                    'n_rows': n_rows,
+                    'feature_names': feature_names,
+                    'X_dtype': 'float64',
+                    'y_dtype': np.dtype(y_dtype).str
+                }, f)
+            try:
+                os.replace(tmp_dir, entry)
+            except OSError:
+                # Un autre processus a construit le même cache entre-temps
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
     def get_train_data(self):
         """Retourne les données d'entraînement"""
+        if self.X_train is None and self.train_index is not None:
+            return self.X[self.train_index], self.y[self.train_index]
         return self.X_train, self.y_train
     
     def get_test_data(self):
         """Retourne les données de test"""
-        return self.X_test, self.y_test
\ No newline at end of file
+        if self.X_test is None and self.test_index is not None:
+            return self.X[self.test_index], self.y[self.test_index]
+        return self.X_test, self.y_test
+    
+    def iter_train_batches(self, batch_size: int = 10_000):
+        """Parcourt les données d'entraînement par blocs (X, y) sans tout charger"""
+        return self._iter_batches(self.train_index, self.X_train, self.y_train, batch_size)
+    
+    def iter_test_batches(self, batch_size: int = 10_000):
+        """Parcourt les données de test par blocs (X, y) sans tout charger"""
+        return self._iter_batches(self.test_index, self.X_test, self.y_test, batch_size)
+    
+    def _iter_batches(self, index, X, y, batch_size: int):
+        """Produit des blocs (X, y) depuis le memmap (ou les matrices en mémoire)."""
+        import numpy as np
+        
+        if X is None and index is None:
+            raise ValueError("Aucune donnée chargée")
+        if X is not None:
+            for start in range(0, len(X), batch_size):
+                yield X[start:start + batch_size], y[start:start + batch_size]
+            return
+        for start in range(0, len(index), batch_size):
+            # Lecture des lignes dans l'ordre du fichier pour limiter les accès disque
+            rows = np.sort(index[start:start + batch_size])
+            yield self.X[rows], self.y[rows]
@@ -0,0 +1,133 @@
+"""
+Score d'alerte précoce agrégé (type NEWS2) calculé sur des cohortes entières.
+
+Chaque paramètre vital est noté par bandes (0 à 3 points) et les points sont
+additionnés. Le niveau d'escalade dépend du total et de la présence d'un
+paramètre à 3 points. Les bandes sont des tables de correspondance : un
+np.digitize par paramètre suffit pour noter toute une cohorte.
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List
+import numpy as np
+
+from core.alert_system import vitals_matrix
+
+# Niveaux d'escalade (l'ordre des codes est l'ordre de gravité)
+EWS_LOW, EWS_LOW_MEDIUM, EWS_MEDIUM, EWS_HIGH = 0, 1, 2, 3
+EWS_LEVELS = ('low', 'low-medium', 'medium', 'high')
+
+# Bandes NEWS2 (échelle 1 de SpO2) : bornes supérieures incluses de chaque bande
+# et points de chaque bande (une bande de plus que de bornes)
+NEWS2_BANDS = {
+    'respiratory_rate': ((8, 11, 20, 24), (3, 1, 0, 2, 3)),
+    'oxygen_saturation': ((91, 93, 95), (3, 2, 1, 0)),
+    'blood_pressure_systolic': ((90, 100, 110, 219), (3, 2, 1, 0, 3)),
+    'heart_rate': ((40, 50, 90, 110, 130), (3, 1, 0, 1, 2, 3)),
+    'temperature': ((35.0, 36.0, 38.0, 39.0), (3, 1, 0, 1, 2)),
+    # Indicateurs binaires (0/1) : oxygène d'appoint, conscience altérée (ACVPU autre que A)
+    'supplemental_oxygen': ((0,), (0, 2)),
+    'altered_consciousness': ((0,), (0, 3)),
+}
+
+
+class EarlyWarningScore:
+    """
+    Score d'alerte précoce par bandes.
+    
+    Niveaux d'escalade (NEWS2) :
+        - 'high'       : total >= 7
+        - 'medium'     : total de 5 à 6
+        - 'low-medium' : total < 5 mais un paramètre à 3 points
+        - 'low'        : sinon
+    Une valeur manquante (NaN ou paramètre absent) vaut 0 point.
+    """
+    
+    def __init__(self, bands: Dict[str, tuple] = None, medium_total: int = 5, high_total: int = 7):
+        """
+        Args:
+            bands: Bandes par paramètre : (bornes supérieures incluses, points),
+                par défaut NEWS2_BANDS
+            medium_total: Total à partir duquel le niveau est 'medium'
+            high_total: Total à partir duquel le niveau est 'high'
+        """
+        self.bands = dict(bands or NEWS2_BANDS)
+        self.medium_total = medium_total
+        self.high_total = high_total
+        self.parameters = list(self.bands)
+        self._tables = []
+        for param, (edges, points) in self.bands.items():
+            edges = np.asarray(edges, dtype=np.float64)
+            points = np.asarray(points, dtype=np.int8)
+            if len(points) != len(edges) + 1:
+                raise ValueError(f"{param}: {len(edges) + 1} bandes attendues, reçu {len(points)} points")
+            if np.any(np.diff(edges) <= 0):
+                raise ValueError(f"{param}: les bornes doivent être strictement croissantes")
+            self._tables.append((edges, points))
+        self._max_points = max(max(points) for _, points in self.bands.values())
+    
+    def score_batch(self, vitals) -> Dict[str, Any]:
+        """
+        Calcule le score de toute une cohorte.
+        
+        Args:
+            vitals: Signes vitaux en colonnes (DataFrame ou dictionnaire paramètre
+                -> valeurs), liste de dictionnaires patient, ou matrice
+                (n_patients, n_paramètres) dans l'ordre de `self.parameters`
+        
+        Returns:
+            Dictionnaire contenant :
+                - 'parameters': ordre des colonnes de 'points'
+                - 'points': points par patient et paramètre (int8)
+                - 'total': score agrégé par patient (int16)
+                - 'red_flag': un paramètre au moins vaut le maximum de points
+                - 'level': code du niveau d'escalade, indexant EWS_LEVELS
+        """
+        values = vitals_matrix(vitals, self.parameters)
+        points = np.zeros(values.shape, dtype=np.int8)
+        for j, (edges, table) in enumerate(self._tables):
+            column = values[:, j]
+            # right=True : chaque borne appartient à la bande qu'elle termine
+            scored = table[np.digitize(column, edges, right=True)]
+            np.copyto(points[:, j], scored, where=~np.isnan(column))
+        
+        total = points.sum(axis=1, dtype=np.int16)
+        red_flag = (points == self._max_points).any(axis=1)
+        level = np.full(len(total), EWS_LOW, dtype=np.int8)
+        level[red_flag] = EWS_LOW_MEDIUM
+        level[total >= self.medium_total] = EWS_MEDIUM
+        level[total >= self.high_total] = EWS_HIGH
+        return {
+            'parameters': list(self.parameters),
+            'points': points,
+            'total': total,
+            'red_flag': red_flag,
+            'level': level
+        }
+    
+    def score(self, patient_data: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Calcule le score d'un patient.
+        
+        Returns:
+            Dictionnaire 'total', 'level' (nom du niveau) et 'points' par paramètre
+        """
+        points = {}
+        for param, (edges, table) in self.bands.items():
+            value = patient_data.get(param)
+            if value is not None and value == value:
+                points[param] = table[bisect_left(edges, value)]
+        total = sum(points.values())
+        if total >= self.high_total:
+            level = EWS_HIGH
+        elif total >= self.medium_total:
+            level = EWS_MEDIUM
+        elif any(p == self._max_points for p in points.values()):
+            level = EWS_LOW_MEDIUM
+        else:
+            level = EWS_LOW
+        return {'total': total, 'level': EWS_LEVELS[level], 'points': points}
+    
+    @staticmethod
+    def level_names(levels: np.ndarray) -> List[str]:
+        """Convertit des codes de niveau en noms."""
+        return np.asarray(EWS_LEVELS, dtype=object)[levels].tolist()
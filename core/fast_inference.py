@@ -0,0 +1,111 @@
+"""
+Noyaux d'inférence rapides en NumPy pur.
+
+Pour une ligne ou un petit lot, la validation des entrées de sklearn coûte bien
+plus que le calcul lui-même (un produit scalaire pour la régression logistique,
+quelques produits matriciels pour un petit MLP). Ces fonctions reçoivent des
+entrées déjà validées (float64, 2D, contiguës, finies) et des poids exportés en
+tableaux contigus, et écrivent les probabilités en place dans `out`.
+"""
+import numpy as np
+
+
+def sigmoid_(z: np.ndarray) -> np.ndarray:
+    """Sigmoïde logistique calculée en place."""
+    with np.errstate(over='ignore'):
+        np.negative(z, out=z)
+        np.exp(z, out=z)
+    z += 1.0
+    np.reciprocal(z, out=z)
+    return z
+
+
+def softmax_(z: np.ndarray) -> np.ndarray:
+    """Softmax par ligne calculée en place."""
+    z -= z.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=1, keepdims=True)
+    return z
+
+
+def _binary_output(positive: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Écrit [1 - p, p] dans `out` à partir de la probabilité positive."""
+    out[:, 1] = positive
+    np.subtract(1.0, positive, out=out[:, 0])
+    return out
+
+
+def linear_predict_proba(X: np.ndarray, coef: np.ndarray, intercept: np.ndarray,
+                         multiclass: str = 'softmax', out: np.ndarray = None) -> np.ndarray:
+    """
+    Probabilités d'un modèle linéaire (régression logistique).
+    
+    Args:
+        X: Entrées validées (n_samples, n_features)
+        coef: Coefficients transposés (n_features, n_outputs)
+        intercept: Biais (n_outputs,)
+        multiclass: 'softmax' (multinomial) ou 'ovr' (sigmoïdes normalisées)
+        out: Tampon de sortie (n_samples, n_classes), alloué si absent
+    """
+    n_outputs = coef.shape[1]
+    if out is None:
+        out = np.empty((X.shape[0], max(n_outputs, 2)))
+    
+    if n_outputs == 1:
+        z = X @ coef[:, 0]
+        z += intercept[0]
+        return _binary_output(sigmoid_(z), out)
+    
+    np.matmul(X, coef, out=out)
+    out += intercept
+    if multiclass == 'softmax':
+        return softmax_(out)
+    sigmoid_(out)
+    total = out.sum(axis=1, keepdims=True)
+    total[total == 0] = 1.0
+    out /= total
+    return out
+
+
+_HIDDEN_ACTIVATIONS = {
+    'identity': lambda z: z,
+    'logistic': sigmoid_,
+    'tanh': lambda z: np.tanh(z, out=z),
+    'relu': lambda z: np.maximum(z, 0, out=z),
+}
+
+
+def mlp_predict_proba(X: np.ndarray, coefs, intercepts, activation: str,
+                      out_activation: str, out: np.ndarray = None) -> np.ndarray:
+    """
+    Probabilités d'un perceptron multicouche (passe avant).
+    
+    Args:
+        X: Entrées validées (n_samples, n_features)
+        coefs: Matrices de poids par couche
+        intercepts: Biais par couche
+        activation: Activation des couches cachées ('relu', 'tanh', 'logistic', 'identity')
+        out_activation: Activation de sortie ('logistic' ou 'softmax')
+        out: Tampon de sortie (n_samples, n_classes), alloué si absent
+    """
+    hidden = _HIDDEN_ACTIVATIONS[activation]
+    n_outputs = coefs[-1].shape[1]
+    if out is None:
+        out = np.empty((X.shape[0], max(n_outputs, 2)))
+    
+    z = X
+    for W, b in zip(coefs[:-1], intercepts[:-1]):
+        z = z @ W
+        z += b
+        hidden(z)
+    
+    if n_outputs == 1:
+        logit = z @ coefs[-1][:, 0]
+        logit += intercepts[-1][0]
+        return _binary_output(sigmoid_(logit), out)
+    
+    np.matmul(z, coefs[-1], out=out)
+    out += intercepts[-1]
+    if out_activation == 'softmax':
+        return softmax_(out)
+    return sigmoid_(out)
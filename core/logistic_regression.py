@@ -1,3 +1,6 @@
+from core.model import Model
+
+
 class LogisticRegressionModel(Model):
     """Modèle de régression logistique"""
     
@@ -9,5 +12,64 @@ class LogisticRegressionModel(Model):
     def train(self, X, y):
         """Entraîne le modèle"""
         self.model.fit(X, y)
-        self.is_trained = True
-        return self
\ No newline at end of file
+        self._weights_updated()
+        return self
+    
+    def export_weights(self):
+        """Exporte coefficients (transposés) et biais en tableaux contigus"""
+        return _export_linear_weights(self.model)
+    
+    def _fast_predict_proba(self, X, weights, out):
+        from core.fast_inference import linear_predict_proba
+        return linear_predict_proba(X, weights['coef'], weights['intercept'], weights['multiclass'], out)
+
+
+def _export_linear_weights(estimator):
+    """Poids d'un classifieur linéaire sklearn pour le chemin rapide."""
+    import numpy as np
+    
+    from sklearn.linear_model import SGDClassifier
+    
+    if not hasattr(estimator, 'predict_proba'):
+        return None  # Perte sans probabilités (ex. SGDClassifier avec loss='hinge')
+    return {
+        'coef': np.ascontiguousarray(estimator.coef_.T, dtype=np.float64),
+        'intercept': np.ascontiguousarray(estimator.intercept_, dtype=np.float64),
+        # SGDClassifier normalise ses sigmoïdes un-contre-tous en multiclasse
+        'multiclass': 'ovr' if isinstance(estimator, SGDClassifier) or _is_ovr(estimator) else 'softmax'
+    }
+
+
+def _is_ovr(estimator):
+    """
+    LogisticRegression en un-contre-tous : multi_class='ovr', ou 'auto' avec le
+    solveur liblinear (sklearn < 1.8 ; ensuite, toujours multinomiale).
+    """
+    multi_class = getattr(estimator, 'multi_class', None)
+    if multi_class in ('ovr', 'warn'):
+        return True
+    return multi_class in ('auto', 'deprecated') and getattr(estimator, 'solver', None) == 'liblinear'
+
+
+class SGDLogisticRegressionModel(Model):
+    """Régression logistique entraînée par descente de gradient stochastique (partial_fit)"""
+    
+    def __init__(self, **kwargs):
+        super().__init__()
+        from sklearn.linear_model import SGDClassifier
+        kwargs.setdefault('loss', 'log_loss')
+        self.model = SGDClassifier(**kwargs)
+    
+    def train(self, X, y):
+        """Entraîne le modèle"""
+        self.model.fit(X, y)
+        self._weights_updated()
+        return self
+    
+    def export_weights(self):
+        """Exporte coefficients (transposés) et biais en tableaux contigus"""
+        return _export_linear_weights(self.model)
+    
+    def _fast_predict_proba(self, X, weights, out):
+        from core.fast_inference import linear_predict_proba
+        return linear_predict_proba(X, weights['coef'], weights['intercept'], weights['multiclass'], out)
@@ -1,9 +1,48 @@
+import itertools
+
+# Identifiants des poids des modèles, uniques dans le processus
+_versions = itertools.count(1)
+
+
 class Model:
     """Interface de base pour tous les modèles"""
     
     def __init__(self):
         self.model = None
         self.is_trained = False
+        self.feature_names = None  # Schéma des features capturé à l'entraînement
+        self._fast_weights = None  # Poids exportés pour le chemin rapide (cache)
+        self.version = next(_versions)  # Change à chaque entraînement (clé des caches de prédictions)
+    
+    def __getstate__(self):
+        # Le cache du chemin rapide est reconstruit après désérialisation
+        state = self.__dict__.copy()
+        state['_fast_weights'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Les identifiants d'un autre processus ne sont pas uniques ici
+        self.version = next(_versions)
+    
+    @property
+    def supports_partial_fit(self):
+        """Indique si le modèle peut être entraîné par mini-lots"""
+        return hasattr(self.model, 'partial_fit')
+    
+    def partial_fit(self, X, y, classes=None):
+        """Entraîne le modèle sur un mini-lot (reprend là où il s'est arrêté)"""
+        if not self.supports_partial_fit:
+            raise ValueError(f"{type(self).__name__} ne supporte pas l'entraînement incrémental")
+        self.model.partial_fit(X, y, classes=classes)
+        self._weights_updated()
+        return self
+    
+    def _weights_updated(self):
+        """Après (ré)entraînement : poids rapides à réexporter et nouvelle version."""
+        self.is_trained = True
+        self._fast_weights = None
+        self.version = next(_versions)
     
     def predict(self, X):
         """Fait une prédiction"""
@@ -15,4 +54,46 @@ class Model:
         """Retourne les probabilités de prédiction"""
         if not self.is_trained:
             raise ValueError("Le modèle doit être entraîné avant de prédire")
-        return self.model.predict_proba(X)
\ No newline at end of file
+        return self.model.predict_proba(X)
+    
+    def export_weights(self):
+        """
+        Exporte les paramètres du modèle en tableaux NumPy contigus.
+        
+        Les sous-classes qui retournent des poids fournissent aussi le noyau
+        `_fast_predict_proba(X, weights, out)`.
+        
+        Returns:
+            Dictionnaire de tableaux utilisé par le chemin rapide, ou None si
+            le modèle n'a pas de chemin rapide
+        """
+        return None
+    
+    @property
+    def supports_fast_path(self):
+        """Indique si fast_predict_proba est disponible"""
+        return self.is_trained and self._get_fast_weights() is not None
+    
+    @property
+    def n_features(self):
+        """Nombre de features attendu par le modèle entraîné"""
+        return getattr(self.model, 'n_features_in_', None)
+    
+    def fast_predict_proba(self, X, out=None):
+        """
+        Probabilités de prédiction sans la validation des entrées de sklearn.
+        
+        Args:
+            X: Entrées déjà validées (matrice float64 2D contiguë, valeurs finies)
+            out: Tampon de sortie (n_samples, n_classes) réutilisable
+        """
+        weights = self._get_fast_weights()
+        if weights is None:
+            raise ValueError(f"{type(self).__name__} n'a pas de chemin d'inférence rapide")
+        return self._fast_predict_proba(X, weights, out)
+    
+    def _get_fast_weights(self):
+        """Retourne (et met en cache) les poids exportés."""
+        if getattr(self, '_fast_weights', None) is None and self.is_trained:
+            self._fast_weights = self.export_weights()
+        return self._fast_weights
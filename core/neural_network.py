@@ -1,3 +1,6 @@
+from core.model import Model
+
+
 class NeuralNetworkModel(Model):
     """Modèle de réseau de neurones"""
     
@@ -9,5 +12,21 @@ class NeuralNetworkModel(Model):
     def train(self, X, y):
         """Entraîne le modèle"""
         self.model.fit(X, y)
-        self.is_trained = True
-        return self
\ No newline at end of file
+        self._weights_updated()
+        return self
+    
+    def export_weights(self):
+        """Exporte les matrices de poids et biais de chaque couche en tableaux contigus"""
+        import numpy as np
+        
+        return {
+            'coefs': [np.ascontiguousarray(W, dtype=np.float64) for W in self.model.coefs_],
+            'intercepts': [np.ascontiguousarray(b, dtype=np.float64) for b in self.model.intercepts_],
+            'activation': self.model.activation,
+            'out_activation': self.model.out_activation_
+        }
+    
+    def _fast_predict_proba(self, X, weights, out):
+        from core.fast_inference import mlp_predict_proba
+        return mlp_predict_proba(X, weights['coefs'], weights['intercepts'],
+                                 weights['activation'], weights['out_activation'], out)
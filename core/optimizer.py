@@ -1,27 +1,246 @@
 class Optimizer:
     """Optimisation des hyperparamètres"""
     
-    def __init__(self, model_class, param_grid: dict):
+    SEARCH_MODES = ('grid', 'random', 'halving')
+    
+    def __init__(self, model_class, param_grid: dict, search: str = 'grid', cv: int = 3,
+                 n_jobs: int = 1, n_iter: int = 10, factor: int = 3, cache_dir: str = None,
+                 refit: bool = True, random_state: int = 0):
+        """
+        Args:
+            model_class: Classe de modèle (sous-classe de Model) à optimiser
+            param_grid: Grille (ou distributions pour 'random') des hyperparamètres
+            search: 'grid' (exhaustif), 'random' (n_iter tirages) ou 'halving'
+                (successive halving : les candidats sont évalués sur un nombre
+                croissant d'échantillons et seul le meilleur 1/factor continue)
+            cv: Nombre de plis de validation croisée
+            n_jobs: Nombre de processus (-1 : tous les cœurs)
+            n_iter: Nombre de candidats tirés en mode 'random'
+            factor: Facteur de réduction du mode 'halving'
+            cache_dir: Répertoire du cache des résultats par pli (désactivé si None)
+            refit: Réentraîne le meilleur modèle sur toutes les données ; sinon
+                réutilise le modèle déjà entraîné de son meilleur pli
+            random_state: Graine des tirages et sous-échantillonnages
+        """
+        if search not in self.SEARCH_MODES:
+            raise ValueError(f"Mode de recherche inconnu: {search} (attendu: {self.SEARCH_MODES})")
         self.model_class = model_class
         self.param_grid = param_grid
+        self.search = search
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.n_iter = n_iter
+        self.factor = factor
+        self.cache_dir = cache_dir
+        self.refit = refit
+        self.random_state = random_state
         self.best_model = None
         self.best_params = None
+        self.best_score = None
+        self.cv_results = []
     
     def optimize(self, X, y):
         """Recherche les meilleurs hyperparamètres"""
-        from sklearn.model_selection import GridSearchCV
-        
-        base_model = self.model_class()
-        grid_search = GridSearchCV(
-            base_model.model, 
-            self.param_grid, 
-            cv=3, 
-            scoring='accuracy'
-        )
-        grid_search.fit(X, y)
-        
-        self.best_params = grid_search.best_params_
-        self.best_model = self.model_class(**self.best_params)
-        self.best_model.train(X, y)
-        
-        return self.best_model, self.best_params
\ No newline at end of file
+        import math
+        import os
+        import numpy as np
+        from concurrent.futures import ProcessPoolExecutor
+        from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+        
+        X, y = np.asarray(X), np.asarray(y)
+        self.cv_results = []
+        if self.search == 'random':
+            candidates = list(ParameterSampler(self.param_grid, self.n_iter, random_state=self.random_state))
+        else:
+            candidates = list(ParameterGrid(self.param_grid))
+        folds = list(StratifiedKFold(n_splits=self.cv).split(X, y))
+        fingerprint = self._data_fingerprint(X, y)
+        n_train = min(len(train) for train, _ in folds)
+        
+        # Successive halving : ressources minimales telles que le dernier tour
+        # utilise toutes les données d'entraînement
+        if self.search == 'halving' and len(candidates) > 1:
+            n_rounds = math.ceil(math.log(len(candidates), self.factor))
+            n_samples = max(n_train // self.factor ** n_rounds, 2 * len(np.unique(y)))
+        else:
+            n_samples = None  # Plis complets
+        
+        n_jobs = os.cpu_count() if self.n_jobs == -1 else self.n_jobs
+        pool = None
+        if n_jobs and n_jobs > 1:
+            # Les données sont transmises une seule fois par processus
+            pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(X, y))
+        else:
+            _init_worker(X, y)
+        
+        try:
+            remaining = list(range(len(candidates)))
+            while True:
+                scores, fitted = self._evaluate(pool, candidates, remaining, folds, n_samples, fingerprint, y)
+                if len(remaining) == 1 or n_samples is None or n_samples >= n_train:
+                    break
+                keep = math.ceil(len(remaining) / self.factor)
+                remaining = sorted(remaining, key=lambda i: -scores[i])[:keep]
+                n_samples = min(n_samples * self.factor, n_train)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            else:
+                _init_worker(None, None)
+        
+        best = max(remaining, key=lambda i: scores[i])
+        self.best_params = candidates[best]
+        self.best_score = scores[best]
+        
+        best_fold_models = [fitted[(best, k)] for k in range(len(folds)) if (best, k) in fitted]
+        if self.refit or not best_fold_models:
+            self.best_model = self.model_class(**self.best_params)
+            self.best_model.train(X, y)
+        else:
+            self.best_model = max(best_fold_models, key=lambda item: item[0])[1]
+        
+        return self.best_model, self.best_params
+    
+    def _evaluate(self, pool, candidates, indices, folds, n_samples, fingerprint, y):
+        """Évalue les candidats sur tous les plis, en sautant les résultats en cache."""
+        import numpy as np
+        
+        rng = np.random.RandomState(self.random_state)
+        fold_indices = []
+        for train, test in folds:
+            if n_samples is not None and n_samples < len(train):
+                train = _stratified_subsample(train, y[train], n_samples, rng)
+            fold_indices.append((train, test))
+        
+        results, jobs = {}, {}
+        for i in indices:
+            for k, (train, test) in enumerate(fold_indices):
+                key = self._cache_key(candidates[i], fingerprint, k, n_samples)
+                cached = self._cache_get(key)
+                if cached is not None:
+                    results[(i, k)] = cached
+                    continue
+                args = (self.model_class, candidates[i], train, test, not self.refit)
+                jobs[(i, k)] = (key, pool.submit(_fit_and_score, *args) if pool else _fit_and_score(*args))
+        
+        fitted = {}
+        for (i, k), (key, job) in jobs.items():
+            score, fit_time, model = job.result() if pool else job
+            results[(i, k)] = {'score': score, 'fit_time': fit_time}
+            self._cache_put(key, results[(i, k)])
+            if model is not None:
+                fitted[(i, k)] = (score, model)
+        
+        scores = {}
+        for i in indices:
+            fold_scores = [results[(i, k)]['score'] for k in range(len(folds))]
+            scores[i] = float(np.mean(fold_scores))
+            self.cv_results.append({
+                'params': candidates[i],
+                'n_samples': n_samples,
+                'mean_score': scores[i],
+                'std_score': float(np.std(fold_scores)),
+                'mean_fit_time': float(np.mean([results[(i, k)]['fit_time'] for k in range(len(folds))])),
+                'cached': all((i, k) not in jobs for k in range(len(folds)))
+            })
+        return scores, fitted
+    
+    def _data_fingerprint(self, X, y) -> str:
+        """Empreinte des données d'entraînement pour la clé du cache."""
+        import hashlib
+        import numpy as np
+        
+        digest = hashlib.sha1()
+        for array in (X, y):
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.view(np.uint8).ravel())
+        return digest.hexdigest()
+    
+    def _cache_key(self, params: dict, fingerprint: str, fold: int, n_samples: int) -> str:
+        """Clé du cache : (classe de modèle, paramètres, données, pli)."""
+        import hashlib
+        import json
+        
+        description = json.dumps({
+            'model': f"{self.model_class.__module__}.{self.model_class.__qualname__}",
+            'params': params,
+            'data': fingerprint,
+            'cv': self.cv,
+            'fold': fold,
+            'n_samples': n_samples,
+            'random_state': self.random_state
+        }, sort_keys=True, default=repr)
+        return hashlib.sha1(description.encode()).hexdigest()
+    
+    def _cache_get(self, key: str):
+        """Lit un résultat de pli en cache (None si absent)."""
+        import json
+        import os
+        
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _cache_put(self, key: str, result: dict):
+        """Enregistre un résultat de pli dans le cache."""
+        import json
+        import os
+        
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+            json.dump(result, f)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+
+# Données partagées par les processus de recherche (initialisées une fois par worker)
+_worker_data = {}
+
+
+def _stratified_subsample(rows, labels, n_samples: int, rng):
+    """
+    Tire `n_samples` lignes en conservant les proportions des classes.
+    
+    Chaque classe présente garde au moins une ligne : un tour de successive
+    halving ne reçoit jamais un pli d'entraînement à une seule classe.
+    """
+    import numpy as np
+    
+    _, codes = np.unique(labels, return_inverse=True)
+    counts = np.bincount(codes)
+    exact = counts * n_samples / len(rows)
+    quota = np.minimum(np.maximum(np.floor(exact).astype(np.int64), 1), counts)
+    # Lignes restantes attribuées aux plus grandes parts fractionnaires
+    for c in np.argsort(quota - exact):
+        if quota.sum() >= n_samples:
+            break
+        if quota[c] < counts[c]:
+            quota[c] += 1
+    selected = [rng.choice(rows[codes == c], quota[c], replace=False) for c in range(len(counts))]
+    return np.sort(np.concatenate(selected))
+
+
+def _init_worker(X, y):
+    """Initialise les données d'un processus de recherche."""
+    _worker_data['X'] = X
+    _worker_data['y'] = y
+
+
+def _fit_and_score(model_class, params, train, test, return_model):
+    """Entraîne un candidat sur un pli et retourne (accuracy, durée, modèle)."""
+    import time
+    
+    X, y = _worker_data['X'], _worker_data['y']
+    start = time.perf_counter()
+    model = model_class(**params)
+    model.train(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    score = float((model.predict(X[test]) == y[test]).mean())
+    return score, fit_time, model if return_model else None
@@ -0,0 +1,141 @@
+"""
+Évaluation des alertes sur plusieurs cœurs pour les instantanés d'un hôpital entier.
+
+La matrice des signes vitaux est écrite une fois en mémoire partagée ; chaque
+worker d'un pool de processus évalue les règles d'AlertSystem sur une tranche
+de lignes et écrit les niveaux de sévérité dans une matrice de sortie elle
+aussi partagée. Aucune donnée patient n'est sérialisée : seuls les noms des
+segments et les bornes des tranches transitent vers les workers.
+"""
+from typing import Any, Dict
+import numpy as np
+
+from core.alert_system import (
+    AlertSystem, SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH, SEVERITY_NONE, vitals_matrix
+)
+from utils.shared_arrays import SharedArray
+
+
+class ParallelAlertExecutor:
+    """
+    Équivalent multi-processus de AlertSystem.check_vital_signs_batch.
+    
+    Exemple:
+        with ParallelAlertExecutor(alert_system, n_workers=8) as executor:
+            result = executor.check_vital_signs_batch(snapshot)
+    """
+    
+    def __init__(self, alert_system: AlertSystem = None, n_workers: int = None,
+                 min_shard_size: int = 50_000):
+        """
+        Args:
+            alert_system: Système d'alerte dont les règles sont appliquées
+            n_workers: Nombre de processus (par défaut le nombre de cœurs)
+            min_shard_size: Nombre minimal de patients par tranche ; en dessous,
+                l'évaluation se fait dans le processus courant
+        """
+        import os
+        
+        self.alert_system = alert_system or AlertSystem()
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.min_shard_size = min_shard_size
+        self._pool = None
+        self._values = None
+        self._levels = None
+    
+    def start(self):
+        """Démarre le pool (le système d'alerte est transmis une fois par worker)."""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        if self._pool is None and self.n_workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                             initargs=(self.alert_system,))
+        return self
+    
+    def close(self):
+        """Arrête le pool et libère la mémoire partagée."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for buffer in (self._values, self._levels):
+            if buffer is not None:
+                buffer.close()
+        self._values = self._levels = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+    
+    def _buffers(self, n_patients: int):
+        """Matrices partagées d'entrée et de sortie, agrandies au besoin et réutilisées."""
+        n_parameters = len(self.alert_system.parameters)
+        if self._values is None or self._values.shape[0] < n_patients:
+            for buffer in (self._values, self._levels):
+                if buffer is not None:
+                    buffer.close()
+            capacity = max(n_patients, 1)
+            self._values = SharedArray((capacity, n_parameters), np.float64)
+            self._levels = SharedArray((capacity, n_parameters), np.int8)
+        return self._values.array[:n_patients], self._levels.array[:n_patients]
+    
+    def check_vital_signs_batch(self, vitals) -> Dict[str, Any]:
+        """
+        Vérifie les signes vitaux d'une cohorte en répartissant les lignes sur le pool.
+        
+        Mêmes entrées et même résultat que AlertSystem.check_vital_signs_batch,
+        dans l'ordre des patients.
+        """
+        n_patients = len(vitals) if not isinstance(vitals, dict) else len(
+            next((vitals[p] for p in self.alert_system.parameters if p in vitals), ()))
+        n_shards = min(self.n_workers, n_patients // self.min_shard_size)
+        if n_shards < 2:
+            return self.alert_system.check_vital_signs_batch(vitals)
+        
+        self.start()
+        values, levels = self._buffers(n_patients)
+        vitals_matrix(vitals, self.alert_system.parameters, out=values)
+        
+        bounds = np.linspace(0, n_patients, n_shards + 1).astype(int)
+        futures = [
+            self._pool.submit(_evaluate_shard, self._values.spec, self._levels.spec, int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+        
+        # Copie : les tampons partagés sont réutilisés par l'appel suivant
+        levels = levels.copy()
+        return {
+            'parameters': list(self.alert_system.parameters),
+            'severity': levels.max(axis=1, initial=SEVERITY_NONE),
+            'levels': levels,
+            'high': levels == SEVERITY_HIGH,
+            'medium': levels == SEVERITY_MEDIUM,
+            'low': levels == SEVERITY_LOW
+        }
+
+
+# Système d'alerte du processus worker (initialisé une fois par worker)
+_worker_data = {}
+
+
+def _init_worker(alert_system):
+    """Initialise le système d'alerte d'un processus worker."""
+    _worker_data['alert_system'] = alert_system
+
+
+def _evaluate_shard(values_spec: tuple, levels_spec: tuple, start: int, stop: int):
+    """Évalue les règles sur les lignes [start, stop) et écrit les niveaux en mémoire partagée."""
+    values = SharedArray.attach(values_spec)
+    levels = SharedArray.attach(levels_spec)
+    try:
+        result = _worker_data['alert_system'].check_vital_signs_batch(values.array[start:stop])
+        levels.array[start:stop] = result['levels']
+        del result
+    finally:
+        values.close()
+        levels.close()
+    return stop - start
@@ -0,0 +1,331 @@
+"""
+Alertes de tendance sur fenêtres glissantes de signes vitaux.
+
+Les seuils instantanés d'AlertSystem ne voient pas une fréquence cardiaque qui
+monte ou une SpO2 qui baisse depuis 30 minutes. TrendMonitor maintient, pour
+chaque patient et chaque règle, un tampon circulaire des mesures de la fenêtre
+et des sommes courantes : chaque mesure est traitée en O(1) amorti, sans
+rejouer l'historique. Le tampon s'agrandit avec la fréquence des mesures : une
+fenêtre de 30 minutes couvre bien 30 minutes, quel que soit le débit.
+
+Les horodatages sont exprimés en secondes ; les pentes en unités par minute.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.alert_system import SEVERITY_LEVELS
+
+TREND_KINDS = ('slope', 'delta', 'sustained')
+
+# Capacité initiale des tampons de fenêtre (doublée à la demande)
+_INITIAL_CAPACITY = 16
+
+
+class TrendRule:
+    """
+    Règle de tendance sur un paramètre vital.
+    
+    Types de règles :
+        - 'slope'     : pente (moindres carrés, unités/minute) sur `window` secondes
+        - 'delta'     : dernière valeur moins la plus ancienne de la fenêtre
+        - 'sustained' : valeur au-delà du seuil sans interruption depuis `window` secondes
+    """
+    
+    __slots__ = ('name', 'parameter', 'kind', 'operator', 'threshold', 'window', 'severity', 'min_samples')
+    
+    def __init__(self, name: str, parameter: str, kind: str, operator: str, threshold: float,
+                 window: float, severity: str = 'medium', min_samples: int = 3):
+        """
+        Args:
+            name: Nom de la règle (repris dans les événements)
+            parameter: Paramètre vital surveillé
+            kind: 'slope', 'delta' ou 'sustained'
+            operator: '>' ou '<'
+            threshold: Seuil de la statistique (pente, écart ou valeur)
+            window: Fenêtre (slope, delta) ou durée minimale (sustained) en secondes
+            severity: Niveau de l'alerte ('low', 'medium' ou 'high')
+            min_samples: Nombre minimal de mesures dans la fenêtre (slope, delta)
+        """
+        if kind not in TREND_KINDS:
+            raise ValueError(f"Type de règle inconnu: {kind} (attendu: {', '.join(TREND_KINDS)})")
+        if operator not in ('>', '<'):
+            raise ValueError(f"Opérateur non supporté: {operator}")
+        if severity not in SEVERITY_LEVELS[1:]:
+            raise ValueError(f"Sévérité inconnue: {severity}")
+        if window <= 0:
+            raise ValueError("window doit être > 0")
+        self.name = name
+        self.parameter = parameter
+        self.kind = kind
+        self.operator = operator
+        self.threshold = float(threshold)
+        self.window = float(window)
+        self.severity = severity
+        self.min_samples = max(2, min_samples) if kind != 'sustained' else 1
+    
+    def __repr__(self):
+        return (f"TrendRule({self.name!r}, {self.parameter} {self.kind} {self.operator} "
+                f"{self.threshold} sur {self.window:g} s)")
+
+
+# Règles par défaut (à adapter selon les besoins cliniques)
+DEFAULT_TREND_RULES = (
+    TrendRule('heart_rate_rising', 'heart_rate', 'slope', '>', 1.0, 30 * 60),
+    TrendRule('spo2_dropping', 'oxygen_saturation', 'delta', '<', -4.0, 30 * 60, severity='high'),
+    TrendRule('respiratory_rate_rising', 'respiratory_rate', 'slope', '>', 0.3, 30 * 60),
+    TrendRule('fever_sustained', 'temperature', 'sustained', '>', 38.5, 60 * 60),
+    TrendRule('tachypnea_sustained', 'respiratory_rate', 'sustained', '>', 25.0, 15 * 60, severity='high'),
+)
+
+
+class _Window:
+    """
+    Tampon circulaire des mesures d'une fenêtre, avec sommes courantes pour la pente.
+    
+    Le tampon double de taille lorsqu'il est plein : il est borné par la durée
+    de la fenêtre (mesures retirées par evict_before), et par `max_capacity`
+    seulement si un plafond est fixé.
+    """
+    
+    __slots__ = ('times', 'values', 'head', 'size', 'origin', 'sum_t', 'sum_v', 'sum_tt', 'sum_tv', 'since',
+                 'pushes', 'max_capacity')
+    
+    def __init__(self, capacity: int, max_capacity: int = None):
+        self.times = [0.0] * capacity
+        self.values = [0.0] * capacity
+        self.head = 0
+        self.size = 0
+        self.origin = None
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+        self.pushes = 0  # Mesures ajoutées depuis le dernier recalcul des sommes
+        self.since = None  # Début de la période au-delà du seuil (règles 'sustained')
+        self.max_capacity = max_capacity
+    
+    def push(self, t: float, v: float) -> bool:
+        """Ajoute une mesure ; retourne True si la plus ancienne a été oubliée faute de place."""
+        dropped = False
+        if self.size == len(self.times):
+            if self.max_capacity is None or self.size < self.max_capacity:
+                self.grow()
+            else:
+                self.pop()  # Plafond atteint : la mesure la plus ancienne est oubliée
+                dropped = True
+        capacity = len(self.times)
+        if self.size == 0:
+            # Fenêtre vide : origine des temps sur la nouvelle mesure
+            self.origin = t
+            self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+            self.pushes = 0
+        elif self.pushes >= capacity:
+            self.rebase()
+        t -= self.origin
+        index = (self.head + self.size) % capacity
+        self.times[index] = t
+        self.values[index] = v
+        self.size += 1
+        self.pushes += 1
+        self.sum_t += t
+        self.sum_v += v
+        self.sum_tt += t * t
+        self.sum_tv += t * v
+        return dropped
+    
+    def grow(self):
+        """Double la capacité (dans la limite de max_capacity), mesures remises dans l'ordre."""
+        capacity = len(self.times)
+        new_capacity = max(2 * capacity, 1)
+        if self.max_capacity is not None:
+            new_capacity = min(new_capacity, self.max_capacity)
+        order = [(self.head + i) % capacity for i in range(self.size)]
+        padding = [0.0] * (new_capacity - self.size)
+        self.times = [self.times[i] for i in order] + padding
+        self.values = [self.values[i] for i in order] + padding
+        self.head = 0
+    
+    def rebase(self):
+        """
+        Ramène l'origine des temps à la mesure la plus ancienne et recalcule les sommes.
+        
+        Sur un flux continu la fenêtre ne se vide jamais : les temps relatifs
+        croissent sans borne et les arrondis des ajouts et retraits successifs
+        s'accumulent dans les sommes. Appelé toutes les `capacity` mesures, le
+        recalcul coûte O(1) amorti par mesure.
+        """
+        capacity = len(self.times)
+        shift = self.times[self.head]
+        self.origin += shift
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+        for i in range(self.size):
+            index = (self.head + i) % capacity
+            t = self.times[index] - shift
+            v = self.values[index]
+            self.times[index] = t
+            self.sum_t += t
+            self.sum_v += v
+            self.sum_tt += t * t
+            self.sum_tv += t * v
+        self.pushes = 0
+    
+    def pop(self):
+        t, v = self.times[self.head], self.values[self.head]
+        self.head = (self.head + 1) % len(self.times)
+        self.size -= 1
+        self.sum_t -= t
+        self.sum_v -= v
+        self.sum_tt -= t * t
+        self.sum_tv -= t * v
+    
+    def evict_before(self, t: float):
+        """Retire les mesures antérieures à `t` (horodatage absolu)."""
+        limit = t - self.origin if self.origin is not None else 0.0
+        while self.size and self.times[self.head] < limit:
+            self.pop()
+    
+    def slope(self) -> Optional[float]:
+        """Pente des moindres carrés (par seconde), None si indéterminée."""
+        n = self.size
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        if n < 2 or denominator <= 1e-12 * n * self.sum_tt:
+            return None
+        return (n * self.sum_tv - self.sum_t * self.sum_v) / denominator
+    
+    def delta(self) -> float:
+        """Dernière valeur moins la plus ancienne de la fenêtre."""
+        last = (self.head + self.size - 1) % len(self.times)
+        return self.values[last] - self.values[self.head]
+
+
+class TrendMonitor:
+    """
+    Évaluation incrémentale de règles de tendance sur un flux de mesures.
+    
+    Comme AlertStream, un événement n'est émis que lorsqu'une règle change
+    d'état (déclenchée ou levée) pour un patient.
+    """
+    
+    def __init__(self, rules: Iterable[TrendRule] = DEFAULT_TREND_RULES, max_samples: int = None):
+        """
+        Args:
+            rules: Règles de tendance évaluées
+            max_samples: Plafond optionnel du nombre de mesures conservées par
+                patient et par règle. Sans plafond, la fenêtre est bornée par sa
+                seule durée ; avec, les mesures les plus anciennes de la fenêtre
+                sont oubliées au-delà et comptées dans `truncated`.
+        """
+        self.rules = list(rules)
+        self.max_samples = max_samples
+        # Mesures oubliées avant la fin de leur fenêtre, par règle (plafond max_samples)
+        self.truncated = {rule.name: 0 for rule in self.rules}
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Les noms des règles doivent être uniques")
+        self._rules_by_parameter: Dict[str, List[int]] = {}
+        for k, rule in enumerate(self.rules):
+            self._rules_by_parameter.setdefault(rule.parameter, []).append(k)
+        # Par patient : fenêtres, états déclenchés et horodatages par règle
+        self._windows: Dict[Any, List[_Window]] = {}
+        self._active: Dict[Any, List[bool]] = {}
+        self._last_time: Dict[Any, Dict[str, float]] = {}
+    
+    def _patient_state(self, patient_id):
+        windows = self._windows.get(patient_id)
+        if windows is None:
+            windows = self._windows[patient_id] = [
+                _Window(1) if rule.kind == 'sustained' else _Window(_INITIAL_CAPACITY, self.max_samples)
+                for rule in self.rules
+            ]
+            self._active[patient_id] = [False] * len(self.rules)
+            self._last_time[patient_id] = {}
+        return windows, self._active[patient_id], self._last_time[patient_id]
+    
+    def update(self, patient_id, parameter: str, value: float, timestamp: float) -> List[Dict[str, Any]]:
+        """
+        Ajoute une mesure et réévalue uniquement les règles de ce paramètre.
+        
+        Args:
+            patient_id: Identifiant du patient
+            parameter: Paramètre vital mesuré
+            value: Valeur mesurée
+            timestamp: Horodatage en secondes (les mesures plus anciennes que la
+                dernière reçue pour ce paramètre sont ignorées)
+        
+        Returns:
+            Événements des règles ayant changé d'état (liste vide le plus souvent)
+        """
+        indices = self._rules_by_parameter.get(parameter)
+        if indices is None or value != value:  # Paramètre non surveillé ou NaN
+            return []
+        windows, active, last_time = self._patient_state(patient_id)
+        if timestamp < last_time.get(parameter, float('-inf')):
+            return []
+        last_time[parameter] = timestamp
+        
+        events = []
+        for k in indices:
+            rule = self.rules[k]
+            statistic = self._evaluate(rule, windows[k], value, timestamp)
+            if statistic is None or rule.kind == 'sustained':
+                triggered = statistic is not None
+            else:
+                triggered = statistic > rule.threshold if rule.operator == '>' else statistic < rule.threshold
+            if triggered != active[k]:
+                active[k] = triggered
+                events.append({
+                    'patient_id': patient_id,
+                    'timestamp': timestamp,
+                    'rule': rule.name,
+                    'parameter': parameter,
+                    'kind': rule.kind,
+                    'statistic': statistic,
+                    'severity': rule.severity,
+                    'active': triggered
+                })
+        return events
+    
+    def _evaluate(self, rule: TrendRule, window: _Window, value: float, timestamp: float) -> Optional[float]:
+        """
+        Met à jour la fenêtre et retourne la statistique de la règle.
+        
+        Pour 'sustained', retourne la durée passée au-delà du seuil si elle
+        atteint `window`, None sinon.
+        """
+        if rule.kind == 'sustained':
+            beyond = value > rule.threshold if rule.operator == '>' else value < rule.threshold
+            if not beyond:
+                window.since = None
+                return None
+            if window.since is None:
+                window.since = timestamp
+            duration = timestamp - window.since
+            return duration if duration >= rule.window else None
+        
+        window.evict_before(timestamp - rule.window)
+        if window.push(timestamp, value):
+            self.truncated[rule.name] += 1
+        if window.size < rule.min_samples:
+            return None
+        if rule.kind == 'slope':
+            slope = window.slope()
+            return None if slope is None else slope * 60.0
+        return window.delta()
+    
+    def process(self, events) -> Iterator[Dict[str, Any]]:
+        """Consomme des événements (patient_id, paramètre, valeur, horodatage)."""
+        update = self.update
+        for patient_id, parameter, value, timestamp in events:
+            yield from update(patient_id, parameter, value, timestamp)
+    
+    def active_rules(self, patient_id) -> List[str]:
+        """Noms des règles actuellement déclenchées pour un patient."""
+        active = self._active.get(patient_id)
+        if active is None:
+            return []
+        return [rule.name for rule, flag in zip(self.rules, active) if flag]
+    
+    def remove_patient(self, patient_id):
+        """Libère l'état d'un patient (sortie, transfert)."""
+        self._windows.pop(patient_id, None)
+        self._active.pop(patient_id, None)
+        self._last_time.pop(patient_id, None)
+    
+    def __len__(self):
+        return len(self._windows)
@@ -1,7 +1,36 @@
-from core.alert_system import AlertSystem
+"""
+Point d'entrée de virus_diag en ligne de commande.
+
+Usage:
+    python main.py alert --vitals temperature=40.5 heart_rate=130 [--ews] [--json]
+    python main.py alert --input vitals.csv --fail-on high
+    python main.py predict --artifact artifacts/v1 --input patients.json
+    python main.py train --data data/patient_data.csv --output artifacts/v1
+    python main.py evaluate --artifact artifacts/v1 --data holdout.csv --bootstrap 1000
+    python main.py compare --data data/patient_data.csv --folds 5 --jobs -1
+    python main.py score --artifact artifacts/v1 --input cohorte.csv --output scores.csv --id patient_id
+    python main.py serve --artifact artifacts/v1 --port 8000 --workers 4 --max-pending 64
+    python main.py bench --scale 100000 --only alert_check_batch
+    python main.py demo                 (démonstration complète, comme sans argument)
+
+Chaque sous-commande n'importe que ce dont elle a besoin : `alert` n'importe ni
+sklearn ni pandas (voir benchmarks/bench_imports.py pour les budgets mesurés).
+"""
+import argparse
+import json
+import sys
+
 
 def demo_architecture():
     """Démontre l'utilisation de l'architecture complète"""
+    from core.alert_system import AlertSystem
+    from core.dataset import Dataset
+    from core.logistic_regression import LogisticRegressionModel
+    from pipeline.trainer import Trainer
+    from pipeline.evaluator import Evaluator
+    from utils.preprocessing import Preprocessor
+    from app.interface_clinique import ClinicalPredictor
+    from app.api import ClinicalAPI
     
     print("=" * 70)
     print("DÉMONSTRATION : Architecture Modulaire virus_diag")
@@ -100,6 +129,7 @@ def demo_architecture():
     df = pd.DataFrame(X, columns=[f'feature_{i}' for i in range(5)])
     df['diagnosis'] = y
     temp_csv = '/tmp/patient_data.csv'
+    df.to_csv(temp_csv, index=False)
     
     # ===== ÉTAPE 1 : CHARGEMENT DES DONNÉES (data/) =====
     print("\n1️⃣  CHARGEMENT DES DONNÉES (data/)")
@@ -308,7 +338,8 @@ AVANTAGES ARCHITECTURAUX :
 """)
 
 
-if __name__ == "__main__":
+def run_demo(args=None):
+    """Démonstration complète (comportement historique de main.py)"""
     demo_architecture()
     # Désactivez les appels suivants si nécessaire pour la démonstration
     # explain_architecture()
@@ -316,4 +347,405 @@ if __name__ == "__main__":
     
     print("\n" + "=" * 70)
     print("✅ EXERCICE COMPLET : Architecture respectée !")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+    return 0
+
+
+# ===== LECTURE DES ENTRÉES (bibliothèque standard uniquement) =====
+
+def read_records(path: str, numeric=None):
+    """
+    Lit des données patient depuis un fichier JSON (objet ou liste d'objets),
+    un CSV avec en-tête, ou l'entrée standard ('-', JSON).
+    
+    Args:
+        path: Chemin du fichier ('-' : JSON sur l'entrée standard)
+        numeric: Colonnes CSV converties en float (valeur vide : NaN). Par
+            défaut, toute colonne entièrement numérique ; les autres colonnes
+            (identifiants, texte) sont conservées en chaînes.
+    
+    Returns:
+        (records, columnar) : liste de dictionnaires, ou dictionnaire
+        colonne -> liste de valeurs pour un CSV
+    """
+    import csv
+    
+    if path == '-':
+        data = json.load(sys.stdin)
+    elif path.lower().endswith('.csv'):
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            columns = {name: [] for name in header}
+            for row in reader:
+                for name, value in zip(header, row):
+                    columns[name].append(value)
+        for name, values in columns.items():
+            if numeric is not None and name not in numeric:
+                continue
+            try:
+                columns[name] = [float(value) if value.strip() else float('nan') for value in values]
+            except ValueError:
+                if numeric is not None:
+                    raise ValueError(f"Colonne '{name}' : valeurs numériques attendues") from None
+        return columns, True
+    else:
+        with open(path) as f:
+            data = json.load(f)
+    return ([data] if isinstance(data, dict) else list(data)), False
+
+
+def parse_assignments(assignments):
+    """Convertit ['temperature=40.5', ...] en dictionnaire de valeurs."""
+    values = {}
+    for assignment in assignments:
+        name, sep, value = assignment.partition('=')
+        if not sep:
+            raise ValueError(f"Format attendu nom=valeur, reçu: {assignment}")
+        values[name.strip()] = float(value)
+    return values
+
+
+# ===== SOUS-COMMANDES =====
+
+def cmd_alert(args):
+    """Vérifie les signes vitaux (sans sklearn ni pandas)"""
+    from core.alert_system import AlertSystem, SEVERITY_LEVELS
+    
+    alert_system = AlertSystem()
+    if args.vitals:
+        records, columnar = [parse_assignments(args.vitals)], False
+    elif args.input:
+        numeric = set(alert_system.parameters)
+        if args.ews:
+            from core.early_warning import EarlyWarningScore
+            numeric.update(EarlyWarningScore().parameters)
+        records, columnar = read_records(args.input, numeric=numeric)
+    else:
+        raise ValueError("Indiquer --vitals ou --input")
+    
+    # Identifiants recopiés dans la sortie
+    if columnar:
+        missing = [name for name in args.id if name not in records]
+        if missing:
+            raise ValueError(f"Colonnes d'identifiant absentes : {', '.join(missing)}")
+        ids = [dict(zip(args.id, values)) for values in zip(*(records[name] for name in args.id))]
+    else:
+        ids = [{name: record.get(name) for name in args.id} for record in records]
+    
+    ews = None
+    if args.ews:
+        from core.early_warning import EarlyWarningScore, EWS_LEVELS
+        ews = EarlyWarningScore().score_batch(records)
+    
+    if columnar or len(records) > 1:
+        result = alert_system.check_vital_signs_batch(records)
+        severities = result['severity']
+        rows = [{'index': i, 'severity': SEVERITY_LEVELS[code]} for i, code in enumerate(severities.tolist())]
+        if args.id:
+            for row, row_ids in zip(rows, ids):
+                row.update(row_ids)
+        if ews is not None:
+            for row, total, level in zip(rows, ews['total'].tolist(), ews['level'].tolist()):
+                row['ews'] = total
+                row['ews_level'] = EWS_LEVELS[level]
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False))
+        else:
+            counts = {level: 0 for level in SEVERITY_LEVELS}
+            for row in rows:
+                counts[row['severity']] += 1
+            print(f"{len(rows)} patients : " + ", ".join(f"{level} {counts[level]}" for level in SEVERITY_LEVELS))
+            for row in rows:
+                if row['severity'] != 'none':
+                    label = ", ".join(f"{name}={row[name]}" for name in args.id)
+                    print(f"  #{row['index']}" + (f" ({label})" if label else '') + f": {row['severity']}"
+                          + (f" (EWS {row['ews']}, {row['ews_level']})" if ews is not None else ''))
+        worst = int(severities.max(initial=0))
+    else:
+        alerts = alert_system.check_vital_signs(records[0])
+        worst = max((alert.code for alert in alerts), default=0)
+        if args.json:
+            output = {**ids[0], 'severity': SEVERITY_LEVELS[worst], 'alerts': [alert.to_dict() for alert in alerts]}
+            if ews is not None:
+                output['ews'] = int(ews['total'][0])
+                output['ews_level'] = EWS_LEVELS[ews['level'][0]]
+            print(json.dumps(output, ensure_ascii=False))
+        else:
+            print(alert_system.format_alerts(alerts))
+            if ews is not None:
+                print(f"Score d'alerte précoce : {int(ews['total'][0])} ({EWS_LEVELS[ews['level'][0]]})")
+    
+    if args.fail_on and worst >= SEVERITY_LEVELS.index(args.fail_on):
+        return 1
+    return 0
+
+
+def cmd_predict(args):
+    """Diagnostique des patients avec un artefact de modèle"""
+    from app.interface_clinique import ClinicalPredictor
+    
+    predictor = ClinicalPredictor.from_artifact(args.artifact)
+    if args.threshold is not None:
+        predictor.threshold = args.threshold
+    records, _ = read_records(args.input)
+    probabilities = predictor.positive_proba(records).tolist()
+    rows = [{'diagnosis': "Infecté" if p >= predictor.threshold else "Sain", 'probability': p}
+            for p in probabilities]
+    print(json.dumps(rows if len(rows) != 1 else rows[0], ensure_ascii=False))
+    return 0
+
+
+def _build_model(name: str, max_iter: int):
+    if name == 'logistic':
+        from core.logistic_regression import LogisticRegressionModel
+        return LogisticRegressionModel(max_iter=max_iter)
+    if name == 'sgd':
+        from core.logistic_regression import SGDLogisticRegressionModel
+        return SGDLogisticRegressionModel(max_iter=max_iter)
+    from core.neural_network import NeuralNetworkModel
+    return NeuralNetworkModel(max_iter=max_iter)
+
+
+def cmd_train(args):
+    """Entraîne un modèle sur un CSV et l'enregistre comme artefact"""
+    import time
+    from core.dataset import Dataset
+    from pipeline.trainer import Trainer
+    from pipeline.evaluator import Evaluator
+    from utils.preprocessing import Preprocessor
+    from app.interface_clinique import ClinicalPredictor
+    from utils.drift import HistogramSketch, METADATA_KEY
+    
+    start = time.perf_counter()
+    dataset = Dataset()
+    if args.cache:
+        dataset.load_from_csv_chunked(args.data)
+    else:
+        dataset.load_from_csv(args.data)
+    X_train, y_train = dataset.get_train_data()
+    X_test, y_test = dataset.get_test_data()
+    # Histogramme de référence des entrées brutes, pour la surveillance de la dérive
+    drift_reference = HistogramSketch.from_data(X_train, dataset.feature_names)
+    
+    if args.min_sensitivity is not None:
+        # Seuil calibré sur une validation tirée de l'entraînement : le jeu de test reste inédit
+        from sklearn.model_selection import train_test_split
+        X_train, X_val, y_train, y_val = train_test_split(X_train, y_train, test_size=0.2, stratify=y_train,
+                                                          random_state=42)
+    
+    preprocessor = Preprocessor()
+    dataset.X_train, dataset.y_train = preprocessor.fit_transform(X_train), y_train
+    model = Trainer(_build_model(args.model, args.max_iter), dataset).train().get_trained_model()
+    predictor = ClinicalPredictor(model, preprocessor=preprocessor)
+    
+    if args.min_sensitivity is not None:
+        from pipeline.threshold import ThresholdCalibrator
+        ThresholdCalibrator().calibrate(predictor, X_val, y_val, min_sensitivity=args.min_sensitivity,
+                                        objective='specificity')
+    
+    # Évaluation au seuil servi par le prédicteur
+    evaluator = Evaluator(model, threshold=predictor.threshold)
+    evaluator.evaluate(preprocessor.transform(X_test), y_test)
+    predictor.save_artifact(args.output, metadata={'metrics': evaluator.metrics, 'source': args.data,
+                                                   METADATA_KEY: drift_reference.to_dict()})
+    evaluator.print_report()
+    print(f"\n✓ Artefact enregistré dans {args.output} (seuil {predictor.threshold:.4g}, "
+          f"{time.perf_counter() - start:.1f} s)")
+    return 0
+
+
+def cmd_evaluate(args):
+    """Évalue un artefact sur un CSV étiqueté, par lots"""
+    import pandas as pd
+    from app.interface_clinique import ClinicalPredictor
+    from pipeline.evaluator import Evaluator
+    
+    predictor = ClinicalPredictor.from_artifact(args.artifact)
+    
+    def batches():
+        for chunk in pd.read_csv(args.data, chunksize=args.batch_size):
+            X = predictor.to_matrix(chunk.drop(columns=[args.target]))
+            if predictor.preprocessor is not None:
+                X = predictor.preprocessor.transform(X, copy=False)
+            yield X, chunk[args.target].to_numpy()
+    
+    evaluator = Evaluator(predictor.model, threshold=predictor.threshold)
+    evaluator.evaluate_stream(batches())
+    if args.bootstrap:
+        evaluator.bootstrap(args.bootstrap, n_jobs=args.jobs)
+    if args.json:
+        print(json.dumps({'metrics': evaluator.metrics,
+                          'confidence_intervals': evaluator.confidence_intervals}))
+    else:
+        evaluator.print_report()
+    return 0
+
+
+def cmd_compare(args):
+    """Compare les modèles par validation croisée sur un CSV étiqueté"""
+    import numpy as np
+    from core.dataset import Dataset
+    from pipeline.model_comparison import ModelComparison, default_configs
+    
+    dataset = Dataset()
+    if args.cache:
+        # Cache memmap : X est lu depuis le disque puis copié une fois en mémoire partagée
+        dataset.load_from_csv_chunked(args.data)
+        X, y = dataset.X, dataset.y
+    else:
+        # Les folds couvrent toutes les lignes : train et test sont réunis
+        dataset.load_from_csv(args.data)
+        X, y = np.concatenate([dataset.X_train, dataset.X_test]), np.concatenate([dataset.y_train, dataset.y_test])
+    configs = default_configs()
+    if args.models:
+        configs = {name: configs[name] for name in args.models}
+    comparison = ModelComparison(configs, n_splits=args.folds, n_jobs=args.jobs)
+    leaderboard = comparison.run(X, y)
+    if args.json:
+        print(json.dumps({'wall_time': comparison.wall_time, 'leaderboard': leaderboard}))
+    else:
+        comparison.print_leaderboard()
+    return 0
+
+
+def cmd_score(args):
+    """Score un fichier de cohorte (CSV ou Parquet) par blocs"""
+    from app.interface_clinique import ClinicalPredictor
+    from pipeline.batch_scoring import BatchScorer
+    
+    predictor = ClinicalPredictor.from_artifact(args.artifact)
+    if args.threshold is not None:
+        predictor.threshold = args.threshold
+    scorer = BatchScorer(predictor, chunksize=args.chunksize, id_columns=args.id)
+    stats = scorer.score_file(args.input, args.output)
+    print(f"✓ {stats['rows']} patients scorés en {stats['seconds']:.2f} s "
+          f"({stats['rows_per_sec']:.0f} patients/s) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args):
+    """Sert un artefact de modèle en HTTP"""
+    from app.api import ClinicalAPI
+    from app.interface_clinique import ClinicalPredictor
+    from app.server import run
+    from utils import instrumentation
+    
+    if args.metrics:
+        instrumentation.configure(enabled=True)
+    drift_monitor = None
+    if args.drift:
+        from utils.drift import DriftMonitor
+        drift_monitor = DriftMonitor.from_artifact(args.artifact)
+    api = ClinicalAPI(ClinicalPredictor.from_artifact(args.artifact), drift_monitor=drift_monitor)
+    run(api, host=args.host, port=args.port, max_workers=args.workers, max_pending=args.max_pending)
+    return 0
+
+
+def cmd_bench(args):
+    """Lance le banc de performance (options de benchmarks.harness)"""
+    from benchmarks.harness import main as bench_main
+    return bench_main(args.options)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="virus_diag : alertes, diagnostic, entraînement")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    alert = subparsers.add_parser('alert', help="Vérifier des signes vitaux")
+    alert.add_argument('--vitals', nargs='+', metavar='NOM=VALEUR', help="Signes vitaux d'un patient")
+    alert.add_argument('--input', help="Fichier JSON ou CSV de patients ('-' : JSON sur l'entrée standard)")
+    alert.add_argument('--ews', action='store_true', help="Ajouter le score d'alerte précoce (NEWS2)")
+    alert.add_argument('--id', nargs='*', default=[], metavar='COLONNE',
+                       help="Colonnes recopiées dans la sortie (identifiants)")
+    alert.add_argument('--json', action='store_true', help="Sortie JSON")
+    alert.add_argument('--fail-on', choices=('low', 'medium', 'high'),
+                       help="Code de sortie 1 si une alerte atteint ce niveau")
+    alert.set_defaults(handler=cmd_alert)
+    
+    predict = subparsers.add_parser('predict', help="Diagnostiquer des patients")
+    predict.add_argument('--artifact', required=True, help="Répertoire de l'artefact de modèle")
+    predict.add_argument('--input', required=True, help="Fichier JSON ou CSV ('-' : JSON sur l'entrée standard)")
+    predict.add_argument('--threshold', type=float, help="Seuil de décision (par défaut celui de l'artefact)")
+    predict.set_defaults(handler=cmd_predict)
+    
+    train = subparsers.add_parser('train', help="Entraîner un modèle et l'enregistrer")
+    train.add_argument('--data', required=True, help="CSV d'entraînement (colonne 'diagnosis')")
+    train.add_argument('--output', required=True, help="Répertoire de l'artefact à créer")
+    train.add_argument('--model', choices=('logistic', 'sgd', 'mlp'), default='logistic')
+    train.add_argument('--max-iter', type=int, default=1000)
+    train.add_argument('--cache', action='store_true', help="Utiliser le cache binaire du CSV")
+    train.add_argument('--min-sensitivity', type=float,
+                       help="Calibrer le seuil pour atteindre cette sensibilité sur une validation "
+                            "tirée des données d'entraînement")
+    train.set_defaults(handler=cmd_train)
+    
+    evaluate = subparsers.add_parser('evaluate', help="Évaluer un artefact sur un CSV étiqueté")
+    evaluate.add_argument('--artifact', required=True)
+    evaluate.add_argument('--data', required=True)
+    evaluate.add_argument('--target', default='diagnosis')
+    evaluate.add_argument('--batch-size', type=int, default=100_000)
+    evaluate.add_argument('--bootstrap', type=int, default=0, help="Nombre de répliques bootstrap")
+    evaluate.add_argument('--jobs', type=int, default=1)
+    evaluate.add_argument('--json', action='store_true')
+    evaluate.set_defaults(handler=cmd_evaluate)
+    
+    compare = subparsers.add_parser('compare', help="Comparer les modèles par validation croisée")
+    compare.add_argument('--data', required=True, help="CSV étiqueté (colonne 'diagnosis')")
+    compare.add_argument('--models', nargs='+', choices=('logistic', 'mlp'), help="Configurations comparées")
+    compare.add_argument('--folds', type=int, default=5)
+    compare.add_argument('--jobs', type=int, default=-1, help="Nombre de processus (-1 : tous les cœurs)")
+    compare.add_argument('--cache', action='store_true', help="Utiliser le cache binaire du CSV")
+    compare.add_argument('--json', action='store_true')
+    compare.set_defaults(handler=cmd_compare)
+    
+    score = subparsers.add_parser('score', help="Scorer une cohorte CSV ou Parquet par blocs")
+    score.add_argument('--artifact', required=True, help="Répertoire de l'artefact de modèle")
+    score.add_argument('--input', required=True, help="Fichier CSV ou Parquet de patients")
+    score.add_argument('--output', required=True, help="Fichier de sortie (.csv ou .parquet)")
+    score.add_argument('--id', nargs='*', default=[], metavar='COLONNE',
+                       help="Colonnes recopiées dans la sortie (identifiants)")
+    score.add_argument('--chunksize', type=int, default=100_000)
+    score.add_argument('--threshold', type=float, help="Seuil de décision (par défaut celui de l'artefact)")
+    score.set_defaults(handler=cmd_score)
+    
+    serve = subparsers.add_parser('serve', help="Servir un artefact de modèle en HTTP")
+    serve.add_argument('--artifact', required=True, help="Répertoire de l'artefact de modèle")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--workers', type=int, default=4, help="Threads exécutant les appels au modèle")
+    serve.add_argument('--max-pending', type=int, default=64,
+                       help="Requêtes en cours au-delà desquelles le serveur répond 503")
+    serve.add_argument('--metrics', action='store_true', help="Activer l'instrumentation (/metrics)")
+    serve.add_argument('--drift', action='store_true',
+                       help="Surveiller la dérive des entrées (/drift, référence enregistrée à l'entraînement)")
+    serve.set_defaults(handler=cmd_serve)
+    
+    bench = subparsers.add_parser('bench', help="Banc de performance", add_help=False)
+    bench.add_argument('options', nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=cmd_bench)
+    
+    demo = subparsers.add_parser('demo', help="Démonstration complète de l'architecture")
+    demo.set_defaults(handler=run_demo)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    # Les options de `bench` sont transmises telles quelles à benchmarks.harness
+    args, unknown = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        args.options = unknown + args.options
+    elif unknown:
+        parser.error(f"arguments non reconnus : {' '.join(unknown)}")
+    if args.command is None:
+        return run_demo()
+    try:
+        return args.handler(args)
+    except (ValueError, OSError) as error:
+        print(f"Erreur : {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Rescoring de cohortes complètes depuis un fichier CSV ou Parquet.
+
+Le fichier d'entrée est lu par blocs ; chaque bloc passe par le préprocesseur
+et predict_proba du prédicteur, puis par AlertSystem si des colonnes de signes
+vitaux sont présentes. Les résultats sont écrits au fil de l'eau. Lecture,
+calcul et écriture tournent dans trois threads reliés par des files bornées :
+l'analyse du CSV, les produits matriciels et l'écriture se recouvrent, et la
+mémoire reste limitée à quelques blocs.
+
+Parquet nécessite pyarrow (dépendance optionnelle).
+"""
+import os
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class _Failure:
+    """Exception levée dans un thread de la chaîne, relancée par score_file."""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class BatchScorer:
+    """
+    Chaîne lecture / calcul / écriture pour scorer un fichier de patients.
+    
+    Exemple:
+        scorer = BatchScorer(ClinicalPredictor.from_artifact('artifacts/v1'), id_columns=['patient_id'])
+        stats = scorer.score_file('cohorte.csv', 'cohorte_scoree.csv')
+    """
+    
+    def __init__(self, predictor, alert_system=None, chunksize: int = 100_000, id_columns=None,
+                 queue_size: int = 2):
+        """
+        Args:
+            predictor: ClinicalPredictor (ou ModelRegistry) avec un schéma de features
+            alert_system: Système d'alerte appliqué si des colonnes de signes vitaux
+                existent (par défaut AlertSystem())
+            chunksize: Nombre de lignes par bloc
+            id_columns: Colonnes d'entrée recopiées dans la sortie (identifiants...)
+            queue_size: Nombre de blocs en attente entre deux étapes
+        """
+        if predictor.feature_names is None:
+            raise ValueError("Le prédicteur doit connaître son schéma de features (feature_names)")
+        if alert_system is None:
+            from core.alert_system import AlertSystem
+            alert_system = AlertSystem()
+        self.predictor = predictor
+        self.alert_system = alert_system
+        self.chunksize = chunksize
+        self.id_columns = list(id_columns or [])
+        self.queue_size = queue_size
+    
+    def score_file(self, input_path: str, output_path: str) -> dict:
+        """
+        Score tout le fichier d'entrée et écrit le fichier de sortie (remplacé atomiquement).
+        
+        Le format (CSV ou Parquet) est déduit de l'extension de chaque fichier.
+        La sortie contient les colonnes `id_columns`, 'probability', 'diagnosis'
+        et, si des signes vitaux sont présents, 'alert_severity'.
+        
+        Returns:
+            Statistiques : lignes, blocs, durée totale et temps actif de chaque étape
+        """
+        stats = {'rows': 0, 'chunks': 0, 'read_s': 0.0, 'compute_s': 0.0, 'write_s': 0.0}
+        chunks = queue.Queue(maxsize=self.queue_size)
+        results = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._stage, name='batch-reader',
+                             args=(self._read, (input_path,), None, chunks, stop, stats, 'read_s')),
+            threading.Thread(target=self._stage, name='batch-compute',
+                             args=(self._compute, (), chunks, results, stop, stats, 'compute_s')),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            # L'écriture se fait dans le thread appelant
+            self._write(results, tmp_path, _is_parquet(output_path), stats)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            stop.set()
+            _drain(chunks)
+            _drain(results)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        
+        stats['seconds'] = time.perf_counter() - start
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else float('inf')
+        return stats
+    
+    @staticmethod
+    def _stage(function, args, source, target, stop, stats, timer):
+        """
+        Boucle d'une étape : consomme `source` (ou produit depuis `function` si
+        `source` est None), transmet à `target` et propage fin et erreurs.
+        """
+        try:
+            if source is None:
+                iterator = function(*args)
+                while not stop.is_set():
+                    begin = time.perf_counter()
+                    item = next(iterator, _DONE)
+                    stats[timer] += time.perf_counter() - begin
+                    if item is _DONE:
+                        break
+                    _put(target, item, stop)
+            else:
+                while True:
+                    item = _get(source, stop)
+                    if item is _DONE or isinstance(item, _Failure):
+                        _put(target, item, stop)
+                        return
+                    begin = time.perf_counter()
+                    result = function(item)
+                    stats[timer] += time.perf_counter() - begin
+                    _put(target, result, stop)
+        except BaseException as error:
+            _put(target, _Failure(error), stop)
+            return
+        _put(target, _DONE, stop)
+    
+    def _read(self, path: str):
+        """Produit les blocs du fichier d'entrée sous forme de DataFrame."""
+        if _is_parquet(path):
+            parquet = _require_pyarrow()
+            for batch in parquet.ParquetFile(path).iter_batches(batch_size=self.chunksize):
+                yield batch.to_pandas()
+        else:
+            import pandas as pd
+            yield from pd.read_csv(path, chunksize=self.chunksize)
+    
+    def _compute(self, chunk):
+        """Score un bloc : probabilités, diagnostics et sévérité des alertes."""
+        import numpy as np
+        import pandas as pd
+        from core.alert_system import SEVERITY_LEVELS
+        
+        # Probabilités et seuil d'une même version du modèle
+        predictor = self.predictor.snapshot()
+        output = pd.DataFrame({name: chunk[name].to_numpy() for name in self.id_columns})
+        probability = np.asarray(predictor.positive_proba(chunk), dtype=np.float64)
+        output['probability'] = probability
+        output['diagnosis'] = np.where(probability >= predictor.threshold, "Infecté", "Sain")
+        if any(name in chunk.columns for name in self.alert_system.parameters):
+            severity = self.alert_system.check_vital_signs_batch(chunk)['severity']
+            output['alert_severity'] = np.asarray(SEVERITY_LEVELS, dtype=object)[severity]
+        return output
+    
+    def _write(self, results: queue.Queue, path: str, parquet: bool, stats: dict):
+        """Écrit les blocs scorés au fur et à mesure qu'ils arrivent."""
+        writer = None
+        if parquet:
+            pyarrow = _require_pyarrow('pyarrow')
+            pq = _require_pyarrow()
+        try:
+            with open(path, 'wb') as f:
+                while True:
+                    output = results.get()
+                    if output is _DONE:
+                        break
+                    if isinstance(output, _Failure):
+                        raise output.error
+                    begin = time.perf_counter()
+                    if parquet:
+                        table = pyarrow.Table.from_pandas(output, preserve_index=False)
+                        if writer is None:
+                            writer = pq.ParquetWriter(f, table.schema)
+                        writer.write_table(table)
+                    else:
+                        output.to_csv(f, header=stats['chunks'] == 0, index=False, encoding='utf-8')
+                    stats['write_s'] += time.perf_counter() - begin
+                    stats['rows'] += len(output)
+                    stats['chunks'] += 1
+                if writer is not None:
+                    writer.close()
+                    writer = None
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def _require_pyarrow(module: str = 'pyarrow.parquet'):
+    """Importe pyarrow, dépendance optionnelle nécessaire au format Parquet."""
+    import importlib
+    
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ValueError("Le format Parquet nécessite pyarrow (pip install pyarrow)") from None
+
+
+def _put(target: queue.Queue, item, stop: threading.Event):
+    """Met en file sans rester bloqué si la chaîne est arrêtée."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(source: queue.Queue, stop: threading.Event):
+    """Lit la file ; retourne _DONE si la chaîne est arrêtée."""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _drain(items: queue.Queue):
+    """Vide une file pour débloquer les threads en attente."""
+    while True:
+        try:
+            items.get_nowait()
+        except queue.Empty:
+            return
@@ -1,27 +1,208 @@
+from core.model import Model
+from utils import instrumentation
+from utils.metrics import MetricsCalculator
+
+
 class Evaluator:
     """Évaluation des performances du modèle"""
     
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, pos_label=1, threshold: float = None):
+        """
+        Args:
+            model: Modèle entraîné
+            pos_label: Classe positive
+            threshold: Seuil de décision sur la probabilité de la classe positive,
+                comme ClinicalPredictor (modèle binaire ; par défaut la classe la
+                plus probable)
+        """
         self.model = model
+        self.pos_label = pos_label
+        self.threshold = threshold
         self.metrics = {}
+        self.confidence_intervals = {}
+        # Effectifs (tn, fp, fn, tp) et scores accumulés sur les lots évalués
+        self.counts = None
+        self._scores = []
+        self._labels = []
     
-    def evaluate(self, X_test, y_test):
-        """Évalue le modèle sur les données de test"""
-        from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+    @instrumentation.instrumented('evaluator.evaluate')
+    def evaluate(self, X_test, y_test, batch_size: int = None):
+        """
+        Évalue le modèle sur les données de test
         
-        predictions = self.model.predict(X_test)
+        Args:
+            X_test, y_test: Données de test
+            batch_size: Évalue par tranches de cette taille (par défaut en une fois)
+        """
+        n = len(y_test)
+        batch_size = batch_size or max(n, 1)
+        return self.evaluate_stream((X_test[start:start + batch_size], y_test[start:start + batch_size])
+                                    for start in range(0, n, batch_size))
+    
+    def evaluate_stream(self, batches):
+        """
+        Évalue le modèle sur un flux de lots (X, y), sans jamais charger tout le
+        jeu de test : seuls les effectifs de confusion, les scores et les
+        étiquettes sont conservés.
         
-        self.metrics = {
-            'accuracy': accuracy_score(y_test, predictions),
-            'precision': precision_score(y_test, predictions, zero_division=0),
-            'recall': recall_score(y_test, predictions, zero_division=0),
-            'f1_score': f1_score(y_test, predictions, zero_division=0)
-        }
+        Args:
+            batches: Itérable de lots (X, y), par exemple dataset.iter_test_batches()
+        """
+        import numpy as np
+        
+        self.counts = np.zeros(4, dtype=np.int64)
+        self._scores, self._labels = [], []
+        self.confidence_intervals = {}
+        
+        for X_batch, y_batch in batches:
+            y_batch = np.asarray(y_batch)
+            predictions, scores = self._predict(X_batch)
+            self.counts += MetricsCalculator.confusion_counts(y_batch, predictions, self.pos_label)
+            if scores is not None:
+                self._scores.append(scores)
+                self._labels.append(y_batch == self.pos_label)
+        
+        if not self.counts.sum():
+            raise ValueError("Aucune donnée de test")
+        self.metrics = {name: float(value)
+                        for name, value in MetricsCalculator.metrics_from_counts(self.counts).items()}
+        auc = self._auc_point()
+        if auc is not None:
+            self.metrics['roc_auc'] = auc
         return self.metrics
     
+    def _predict(self, X):
+        """Retourne (prédictions, score de la classe positive ou None)."""
+        import numpy as np
+        
+        try:
+            proba = self.model.predict_proba(X)
+        except AttributeError:  # Modèle sans probabilités : pas d'AUC
+            return self.model.predict(X), None
+        classes = getattr(self.model.model, 'classes_', np.arange(proba.shape[1]))
+        positive = np.flatnonzero(classes == self.pos_label)
+        scores = proba[:, positive[0]] if len(positive) else np.zeros(len(proba))
+        if self.threshold is None:
+            return classes[proba.argmax(axis=1)], scores
+        if len(classes) != 2 or not len(positive):
+            raise ValueError("Un seuil de décision ne s'applique qu'à un modèle binaire contenant la classe positive")
+        negative = classes[1 - positive[0]]
+        return np.where(scores >= self.threshold, self.pos_label, negative), scores
+    
+    def _ranked(self):
+        """Étiquettes triées par score et débuts des groupes d'ex æquo."""
+        import numpy as np
+        
+        scores, labels = np.concatenate(self._scores), np.concatenate(self._labels)
+        order, starts = MetricsCalculator.score_groups(scores)
+        return labels[order], starts
+    
+    def _auc_point(self):
+        """ROC AUC sur les scores accumulés (None si non calculable)."""
+        import numpy as np
+        
+        if not self._scores:
+            return None
+        labels, starts = self._ranked()
+        auc = MetricsCalculator.auc_from_groups(np.add.reduceat(labels.astype(np.float64), starts),
+                                                np.add.reduceat((~labels).astype(np.float64), starts))
+        return None if np.isnan(auc) else float(auc)
+    
+    @instrumentation.instrumented('evaluator.bootstrap')
+    def bootstrap(self, n_bootstrap: int = 1000, confidence: float = 0.95, n_jobs: int = 1,
+                  random_state: int = 0):
+        """
+        Intervalles de confiance bootstrap (percentiles) des métriques évaluées.
+        
+        Les métriques de seuil ne dépendent que des effectifs de confusion :
+        rééchantillonner les lignes revient à tirer ces effectifs selon une loi
+        multinomiale, ce qui se fait pour toutes les répliques d'un coup.
+        Les répliques de l'AUC sont calculées par blocs vectorisés répartis sur
+        `n_jobs` processus.
+        
+        Returns:
+            Dictionnaire métrique -> (borne basse, borne haute)
+        """
+        import os
+        import numpy as np
+        from concurrent.futures import ProcessPoolExecutor
+        
+        if self.counts is None:
+            raise ValueError("Appeler evaluate avant bootstrap")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence doit être compris entre 0 et 1")
+        
+        rng = np.random.default_rng(random_state)
+        n = int(self.counts.sum())
+        counts = rng.multinomial(n, self.counts / n, size=n_bootstrap)
+        replicates = MetricsCalculator.metrics_from_counts(counts)
+        
+        if 'roc_auc' in self.metrics:
+            labels, starts = self._ranked()
+            n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+            n_tasks = max(n_jobs or 1, 1)
+            sizes = [len(part) for part in np.array_split(np.arange(n_bootstrap), n_tasks) if len(part)]
+            seeds = rng.integers(2 ** 32, size=len(sizes))
+            if n_tasks > 1:
+                # Les étiquettes triées sont transmises une seule fois par processus
+                with ProcessPoolExecutor(max_workers=n_tasks, initializer=_init_worker,
+                                         initargs=(labels, starts)) as pool:
+                    parts = list(pool.map(_bootstrap_auc, seeds, sizes))
+            else:
+                _init_worker(labels, starts)
+                try:
+                    parts = [_bootstrap_auc(seed, size) for seed, size in zip(seeds, sizes)]
+                finally:
+                    _init_worker(None, None)
+            replicates['roc_auc'] = np.concatenate(parts)
+        
+        alpha = (1 - confidence) / 2
+        self.confidence_intervals = {
+            name: tuple(float(bound) for bound in np.nanquantile(values, [alpha, 1 - alpha]))
+            for name, values in replicates.items()
+        }
+        return self.confidence_intervals
+    
     def print_report(self):
         """Affiche un rapport des métriques"""
         print("\n📊 RAPPORT D'ÉVALUATION")
         print("-" * 40)
         for metric, value in self.metrics.items():
-            print(f"  {metric.capitalize():12s}: {value:.2%}")
\ No newline at end of file
+            line = f"  {metric.capitalize():12s}: {value:.2%}"
+            if metric in self.confidence_intervals:
+                low, high = self.confidence_intervals[metric]
+                line += f"  [{low:.2%} - {high:.2%}]"
+            print(line)
+
+
+# Données partagées par les processus bootstrap (initialisées une fois par worker)
+_worker_data = {}
+
+# Nombre maximal de poids (répliques x lignes) matérialisés par bloc
+_BLOCK_SIZE = 2 ** 22
+
+
+def _init_worker(labels, starts):
+    """Initialise les étiquettes triées par score d'un processus bootstrap."""
+    _worker_data['labels'] = labels
+    _worker_data['starts'] = starts
+
+
+def _bootstrap_auc(seed, n_replicates: int):
+    """Calcule `n_replicates` répliques bootstrap de l'AUC, par blocs vectorisés."""
+    import numpy as np
+    
+    labels, starts = _worker_data['labels'], _worker_data['starts']
+    n = len(labels)
+    rng = np.random.default_rng(seed)
+    block = max(1, _BLOCK_SIZE // max(n, 1))
+    results = []
+    for done in range(0, n_replicates, block):
+        size = min(block, n_replicates - done)
+        # Poids de rééchantillonnage : nombre de tirages de chaque ligne
+        draws = rng.integers(n, size=(size, n)) + (np.arange(size) * n)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+        positives = np.add.reduceat(weights * labels, starts, axis=1)
+        negatives = np.add.reduceat(weights * ~labels, starts, axis=1)
+        results.append(MetricsCalculator.auc_from_groups(positives, negatives))
+    return np.concatenate(results)
@@ -0,0 +1,232 @@
+"""
+Comparaison de modèles par validation croisée k-fold, en parallèle.
+
+Chaque couple (configuration, fold) est une tâche indépendante exécutée sur un
+pool de processus. La matrice d'entraînement, les étiquettes et l'affectation
+des folds sont écrites une fois en mémoire partagée : seuls le nom de la
+configuration et le numéro du fold transitent vers les workers. Le BLAS de
+chaque worker est limité à un thread pour que les processus ne se disputent
+pas les cœurs.
+"""
+from typing import Any, Dict, List
+import numpy as np
+
+from core.model import Model
+from utils.shared_arrays import SharedArray
+
+# Métriques reportées dans le classement (roc_auc si le modèle a predict_proba)
+METRICS = ('accuracy', 'precision', 'recall', 'f1_score', 'roc_auc')
+
+
+def default_configs() -> Dict[str, Model]:
+    """Configurations comparées par défaut : régression logistique et réseau de neurones."""
+    from core.logistic_regression import LogisticRegressionModel
+    from core.neural_network import NeuralNetworkModel
+    
+    return {
+        'logistic': LogisticRegressionModel(max_iter=1000),
+        'mlp': NeuralNetworkModel(hidden_layer_sizes=(64,), max_iter=300, early_stopping=True,
+                                  random_state=0),
+    }
+
+
+class ModelComparison:
+    """
+    Validation croisée de plusieurs configurations de Model sur les mêmes folds.
+    
+    Exemple:
+        comparison = ModelComparison(default_configs(), n_splits=5, n_jobs=8)
+        leaderboard = comparison.run(X, y)
+        comparison.print_leaderboard()
+    """
+    
+    def __init__(self, configs: Dict[str, Model] = None, n_splits: int = 5, n_jobs: int = 1,
+                 preprocess: bool = True, random_state: int = 0, pos_label=1):
+        """
+        Args:
+            configs: Nom -> modèle non entraîné (copié pour chaque fold),
+                par défaut default_configs()
+            n_splits: Nombre de folds
+            n_jobs: Nombre de processus (-1 : tous les cœurs, 1 : processus courant)
+            preprocess: Ajuste un Preprocessor sur la partie entraînement de chaque fold
+            random_state: Graine de l'affectation des folds
+            pos_label: Classe positive pour les métriques
+        """
+        if n_splits < 2:
+            raise ValueError("n_splits doit être >= 2")
+        self.configs = dict(configs if configs is not None else default_configs())
+        if not self.configs:
+            raise ValueError("Aucune configuration à comparer")
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.preprocess = preprocess
+        self.random_state = random_state
+        self.pos_label = pos_label
+        # Résultats par (configuration, fold) et classement agrégé du dernier run
+        self.results: List[Dict[str, Any]] = []
+        self.leaderboard: List[Dict[str, Any]] = []
+        self.wall_time = None
+    
+    def assign_folds(self, y) -> np.ndarray:
+        """
+        Fold de test de chaque ligne, stratifié par classe.
+        
+        Les lignes de chaque classe sont mélangées puis distribuées à tour de
+        rôle entre les folds : chaque fold garde les proportions des classes.
+        """
+        rng = np.random.default_rng(self.random_state)
+        _, codes = np.unique(y, return_inverse=True)
+        folds = np.empty(len(codes), dtype=np.int64)
+        for code in range(codes.max() + 1 if len(codes) else 0):
+            rows = rng.permutation(np.flatnonzero(codes == code))
+            folds[rows] = (np.arange(len(rows)) + code) % self.n_splits
+        return folds
+    
+    def run(self, X, y, sort_by: str = 'roc_auc') -> List[Dict[str, Any]]:
+        """
+        Entraîne et évalue chaque configuration sur chaque fold.
+        
+        Args:
+            X: Matrice des features (n_samples, n_features)
+            y: Étiquettes
+            sort_by: Métrique de tri du classement (moyenne décroissante)
+        
+        Returns:
+            Classement : une ligne par configuration avec moyenne et écart-type
+            de chaque métrique, des durées d'entraînement et de prédiction
+        """
+        import os
+        import time
+        
+        X = np.asarray(X, dtype=np.float64)
+        classes, codes = np.unique(np.asarray(y), return_inverse=True)
+        if len(X) != len(codes):
+            raise ValueError(f"X et y n'ont pas le même nombre de lignes ({len(X)} != {len(codes)})")
+        if self.pos_label not in classes:
+            raise ValueError(f"Classe positive {self.pos_label!r} absente des étiquettes {classes.tolist()}")
+        folds = self.assign_folds(codes)
+        if np.bincount(folds, minlength=self.n_splits).min() == 0:
+            raise ValueError(f"Pas assez de lignes pour {self.n_splits} folds")
+        
+        tasks = [(name, fold) for name in self.configs for fold in range(self.n_splits)]
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs == -1 else max(self.n_jobs or 1, 1)
+        n_jobs = min(n_jobs, len(tasks))
+        
+        start = time.perf_counter()
+        if n_jobs > 1:
+            results = self._run_pool(X, codes, folds, classes, tasks, n_jobs)
+        else:
+            _init_worker((X, codes, folds), classes, self.configs, self.preprocess, self.pos_label)
+            try:
+                results = [_fit_fold(name, fold) for name, fold in tasks]
+            finally:
+                _worker_data.clear()
+        self.wall_time = time.perf_counter() - start
+        
+        self.results = results
+        self.leaderboard = self._aggregate(results, sort_by)
+        return self.leaderboard
+    
+    def _run_pool(self, X, codes, folds, classes, tasks, n_jobs):
+        """Exécute les tâches sur un pool, données partagées en mémoire partagée."""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        buffers = [SharedArray(X.shape, X.dtype), SharedArray(codes.shape, np.int64),
+                   SharedArray(folds.shape, np.int64)]
+        try:
+            for buffer, values in zip(buffers, (X, codes, folds)):
+                buffer.array[...] = values
+            specs = tuple(buffer.spec for buffer in buffers)
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                     initargs=(specs, classes, self.configs, self.preprocess,
+                                               self.pos_label)) as pool:
+                futures = [pool.submit(_fit_fold, name, fold) for name, fold in tasks]
+                return [future.result() for future in futures]
+        finally:
+            for buffer in buffers:
+                buffer.close()
+    
+    @staticmethod
+    def _aggregate(results, sort_by: str) -> List[Dict[str, Any]]:
+        """Moyenne et écart-type par configuration, triés par `sort_by` décroissant."""
+        rows = []
+        for name in dict.fromkeys(result['model'] for result in results):
+            runs = [result for result in results if result['model'] == name]
+            row = {'model': name, 'folds': len(runs)}
+            for metric in METRICS + ('fit_time', 'predict_time'):
+                values = np.array([run[metric] for run in runs if run.get(metric) is not None])
+                if len(values):
+                    row[f'{metric}_mean'] = float(values.mean())
+                    row[f'{metric}_std'] = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+            rows.append(row)
+        key = f'{sort_by}_mean'
+        rows.sort(key=lambda row: -row.get(key, float('-inf')))
+        return rows
+    
+    def print_leaderboard(self):
+        """Affiche le classement du dernier run."""
+        print("\n🏁 COMPARAISON DES MODÈLES"
+              + (f" ({self.n_splits} folds, {self.wall_time:.1f} s)" if self.wall_time else ""))
+        print("-" * 72)
+        for rank, row in enumerate(self.leaderboard, 1):
+            scores = "  ".join(
+                f"{metric}={row[f'{metric}_mean']:.3f}±{row[f'{metric}_std']:.3f}"
+                for metric in ('roc_auc', 'f1_score', 'accuracy') if f'{metric}_mean' in row
+            )
+            print(f"  {rank}. {row['model']:12s} {scores}  fit={row['fit_time_mean']:.2f}s")
+
+
+# Données partagées par les processus du pool (initialisées une fois par worker)
+_worker_data = {}
+
+
+def _init_worker(arrays, classes, configs, preprocess, pos_label):
+    """
+    Initialise un worker : attache X, les codes d'étiquettes et les folds.
+    
+    `arrays` contient les specs des SharedArray, ou directement les tableaux
+    lorsque les tâches s'exécutent dans le processus courant.
+    """
+    if isinstance(arrays[0], np.ndarray):
+        _worker_data['arrays'] = arrays
+    else:
+        # Les workers se partagent les cœurs : un thread BLAS chacun
+        from threadpoolctl import threadpool_limits
+        
+        _worker_data['limits'] = threadpool_limits(1)
+        _worker_data['shared'] = [SharedArray.attach(spec) for spec in arrays]
+        _worker_data['arrays'] = tuple(shared.array for shared in _worker_data['shared'])
+    _worker_data['classes'] = classes
+    _worker_data['configs'] = configs
+    _worker_data['preprocess'] = preprocess
+    _worker_data['pos_label'] = pos_label
+
+
+def _fit_fold(name: str, fold: int) -> Dict[str, Any]:
+    """Entraîne une copie de la configuration `name` hors du fold `fold` et l'évalue dessus."""
+    import copy
+    import time
+    from pipeline.evaluator import Evaluator
+    from utils.preprocessing import Preprocessor
+    
+    X, codes, folds = _worker_data['arrays']
+    classes = _worker_data['classes']
+    test = folds == fold
+    X_train, X_test = X[~test], X[test]
+    y_train, y_test = classes[codes[~test]], classes[codes[test]]
+    if _worker_data['preprocess']:
+        preprocessor = Preprocessor().fit(X_train)
+        X_train = preprocessor.transform(X_train, copy=False)
+        X_test = preprocessor.transform(X_test, copy=False)
+    
+    model = copy.deepcopy(_worker_data['configs'][name])
+    start = time.perf_counter()
+    model.train(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    
+    evaluator = Evaluator(model, pos_label=_worker_data['pos_label'])
+    start = time.perf_counter()
+    metrics = evaluator.evaluate(X_test, y_test)
+    predict_time = time.perf_counter() - start
+    return {'model': name, 'fold': fold, **metrics, 'fit_time': fit_time, 'predict_time': predict_time,
+            'n_train': len(y_train), 'n_test': len(y_test)}
@@ -0,0 +1,124 @@
+"""
+Choix du seuil de décision d'un classifieur binaire.
+
+Les probabilités du jeu de validation sont calculées une seule fois ; un tri
+puis des sommes cumulées donnent sensibilité, spécificité et valeur prédictive
+positive pour chaque seuil candidat en O(n log n). Le seuil retenu est stocké
+dans le ClinicalPredictor : il ne coûte rien par requête.
+"""
+
+# Critères d'optimisation acceptés par ThresholdCalibrator.select
+OBJECTIVES = ('youden', 'sensitivity', 'specificity', 'ppv', 'f1')
+
+
+class ThresholdCalibrator:
+    """Courbes sensibilité/spécificité/VPP pour tous les seuils d'un jeu de validation"""
+    
+    def __init__(self, pos_label=1):
+        self.pos_label = pos_label
+        self.curves = None
+        self.threshold = None
+    
+    def fit(self, y_true, scores):
+        """
+        Calcule les courbes pour chaque seuil candidat.
+        
+        Un patient est prédit positif si son score est >= au seuil ; les seuils
+        candidats sont les scores distincts observés, par ordre décroissant.
+        
+        Args:
+            y_true: Étiquettes réelles
+            scores: Probabilités de la classe positive
+        """
+        import numpy as np
+        
+        positive = np.asarray(y_true) == self.pos_label
+        scores = np.asarray(scores, dtype=np.float64)
+        if positive.shape != scores.shape or positive.ndim != 1:
+            raise ValueError("y_true et scores doivent être des vecteurs de même taille")
+        n_positive = int(positive.sum())
+        n_negative = len(positive) - n_positive
+        if not n_positive or not n_negative:
+            raise ValueError("Les deux classes doivent être présentes pour calibrer le seuil")
+        
+        order = np.argsort(-scores, kind='stable')
+        sorted_scores, sorted_positive = scores[order], positive[order]
+        # Dernière position de chaque groupe de scores égaux
+        ends = np.flatnonzero(np.r_[sorted_scores[1:] != sorted_scores[:-1], True])
+        tp = np.cumsum(sorted_positive)[ends]
+        fp = (ends + 1) - tp
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.curves = {
+                'threshold': sorted_scores[ends],
+                'tp': tp,
+                'fp': fp,
+                'sensitivity': tp / n_positive,
+                'specificity': 1.0 - fp / n_negative,
+                'ppv': tp / (tp + fp),
+                'f1': 2 * tp / (tp + n_positive + fp)
+            }
+        return self
+    
+    def select(self, min_sensitivity: float = None, min_specificity: float = None,
+               min_ppv: float = None, objective: str = 'youden') -> float:
+        """
+        Choisit le seuil qui optimise `objective` parmi ceux respectant les cibles.
+        
+        Exemple : select(min_sensitivity=0.95, objective='specificity') retient
+        le seuil le plus spécifique qui détecte au moins 95 % des infectés.
+        
+        Args:
+            min_sensitivity: Rappel minimal
+            min_specificity: Spécificité minimale
+            min_ppv: Valeur prédictive positive minimale
+            objective: Critère maximisé parmi OBJECTIVES
+                ('youden' = sensibilité + spécificité - 1)
+        """
+        import numpy as np
+        
+        if self.curves is None:
+            raise ValueError("Appeler fit avant select")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objectif inconnu: {objective} (attendu: {', '.join(OBJECTIVES)})")
+        
+        curves = self.curves
+        feasible = np.ones(len(curves['threshold']), dtype=bool)
+        for name, minimum in (('sensitivity', min_sensitivity), ('specificity', min_specificity),
+                              ('ppv', min_ppv)):
+            if minimum is not None:
+                feasible &= curves[name] >= minimum
+        if not feasible.any():
+            raise ValueError("Aucun seuil ne respecte les cibles demandées")
+        
+        if objective == 'youden':
+            score = curves['sensitivity'] + curves['specificity'] - 1.0
+        else:
+            score = curves[objective]
+        score = np.where(feasible, score, -np.inf)
+        # À score égal, le seuil le plus élevé (premier dans l'ordre décroissant)
+        self.threshold = float(curves['threshold'][np.argmax(score)])
+        return self.threshold
+    
+    def operating_point(self, threshold: float = None) -> dict:
+        """Sensibilité, spécificité et VPP au seuil donné (par défaut le seuil retenu)."""
+        import numpy as np
+        
+        if self.curves is None:
+            raise ValueError("Appeler fit avant operating_point")
+        threshold = self.threshold if threshold is None else threshold
+        # Seuil candidat le plus bas encore >= threshold : mêmes prédictions positives
+        index = np.searchsorted(-self.curves['threshold'], -threshold, side='right') - 1
+        if index < 0:
+            return {'threshold': threshold, 'sensitivity': 0.0, 'specificity': 1.0, 'ppv': float('nan')}
+        return {'threshold': threshold,
+                **{name: float(self.curves[name][index]) for name in ('sensitivity', 'specificity', 'ppv')}}
+    
+    def calibrate(self, predictor, X_val, y_val, **targets) -> float:
+        """
+        Calcule les probabilités du prédicteur sur le jeu de validation, choisit
+        le seuil selon `targets` (arguments de select) et l'enregistre dans le prédicteur.
+        """
+        self.fit(y_val, predictor.positive_proba(X_val))
+        predictor.threshold = self.select(**targets)
+        return predictor.threshold
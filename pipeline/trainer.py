@@ -1,17 +1,96 @@
+from core.dataset import Dataset
+from core.model import Model
+from utils import instrumentation
+
+
 class Trainer:
     """Gestion de l'entraînement du modèle"""
     
     def __init__(self, model: Model, dataset: Dataset):
         self.model = model
         self.dataset = dataset
+        # Historique par époque : perte, débit (lignes/s) et durée (s)
         self.training_history = {}
     
+    @instrumentation.instrumented('trainer.train')
     def train(self):
         """Entraîne le modèle sur le dataset"""
+        import time
+        
+        start = time.perf_counter()
         X_train, y_train = self.dataset.get_train_data()
         self.model.train(X_train, y_train)
+        self._record_epoch(getattr(self.model.model, 'loss_', None), len(X_train),
+                           time.perf_counter() - start)
+        self._copy_schema()
         return self
     
+    def train_incremental(self, epochs: int = 1, batch_size: int = 10_000, classes=None,
+                          batches=None, track_loss: bool = True):
+        """
+        Entraîne le modèle par mini-lots avec partial_fit, sans charger tout X_train.
+        
+        Un nouvel appel reprend l'entraînement là où il s'est arrêté, par exemple
+        lorsque de nouveaux patients arrivent.
+        
+        Args:
+            epochs: Nombre de passes sur les données
+            batch_size: Taille des mini-lots lus depuis le dataset
+            classes: Classes possibles (déduites des étiquettes si absent)
+            batches: Fonction retournant un itérable de mini-lots (X, y) à chaque
+                époque (par défaut dataset.iter_train_batches)
+            track_loss: Calcule la log-loss moyenne de chaque époque
+        """
+        import time
+        from sklearn.metrics import log_loss
+        
+        if not self.model.supports_partial_fit:
+            raise ValueError(f"{type(self.model).__name__} ne supporte pas l'entraînement incrémental")
+        if batches is None:
+            batches = lambda: self.dataset.iter_train_batches(batch_size)
+        if classes is None:
+            classes = self._infer_classes(batches)
+        
+        for _ in range(epochs):
+            start = time.perf_counter()
+            n_rows, total_loss = 0, 0.0
+            for X_batch, y_batch in batches():
+                self.model.partial_fit(X_batch, y_batch, classes=classes)
+                if track_loss:
+                    proba = self.model.predict_proba(X_batch)
+                    total_loss += log_loss(y_batch, proba, labels=classes) * len(y_batch)
+                n_rows += len(y_batch)
+            loss = total_loss / n_rows if track_loss and n_rows else None
+            self._record_epoch(loss, n_rows, time.perf_counter() - start)
+        
+        self._copy_schema()
+        return self
+    
+    def _infer_classes(self, batches):
+        """Déduit les classes en ne lisant que les étiquettes si possible."""
+        import numpy as np
+        
+        if self.dataset is not None and self.dataset.y_train is not None:
+            return np.unique(self.dataset.y_train)
+        if self.dataset is not None and self.dataset.train_index is not None:
+            return np.unique(self.dataset.y[self.dataset.train_index])
+        return np.unique(np.concatenate([np.unique(y) for _, y in batches()]))
+    
+    def _record_epoch(self, loss, n_rows: int, wall_time: float):
+        """Ajoute une époque à l'historique d'entraînement."""
+        history = self.training_history
+        for key in ('epoch', 'loss', 'rows_per_sec', 'wall_time'):
+            history.setdefault(key, [])
+        history['epoch'].append(len(history['epoch']) + 1)
+        history['loss'].append(loss)
+        history['rows_per_sec'].append(n_rows / wall_time if wall_time > 0 else float('inf'))
+        history['wall_time'].append(wall_time)
+    
+    def _copy_schema(self):
+        """Transmet le schéma des features du dataset au modèle."""
+        if self.dataset is not None and self.dataset.feature_names is not None:
+            self.model.feature_names = list(self.dataset.feature_names)
+    
     def get_trained_model(self):
         """Retourne le modèle entraîné"""
-        return self.model
\ No newline at end of file
+        return self.model
@@ -0,0 +1,107 @@
+"""Les règles compilées et vectorisées reproduisent le contrôle patient par patient d'origine."""
+import numpy as np
+import pytest
+
+from core.alert_system import SEVERITY_LEVELS, AlertSystem
+
+# Plage de tirage de chaque paramètre : couvre les seuils bas, normaux, moyens et critiques
+RANGES = {
+    'temperature': (33.0, 42.0),
+    'heart_rate': (35.0, 160.0),
+    'blood_pressure_systolic': (70.0, 200.0),
+    'blood_pressure_diastolic': (40.0, 135.0),
+    'oxygen_saturation': (78.0, 101.0),
+    'respiratory_rate': (6.0, 36.0),
+}
+
+
+def reference_alerts(system: AlertSystem, patient_data: dict) -> list:
+    """Implémentation d'origine de check_vital_signs (conditions analysées à chaque appel)."""
+    alerts = []
+    for condition in system.critical_conditions['high']:
+        param, operator, value = system._parse_condition(condition)
+        if param in patient_data and system._evaluate_condition(patient_data[param], operator, float(value)):
+            alerts.append({'parameter': param, 'value': patient_data[param], 'threshold': value, 'severity': 'high',
+                           'message': f'CRITIQUE: {param} = {patient_data[param]} ({operator} {value})',
+                           'action': 'Nécessite une attention médicale immédiate!'})
+    if not alerts:
+        for condition in system.critical_conditions['medium']:
+            param, operator, value = system._parse_condition(condition)
+            if param in patient_data and system._evaluate_condition(patient_data[param], operator, float(value)):
+                alerts.append({'parameter': param, 'value': patient_data[param], 'threshold': value,
+                               'severity': 'medium',
+                               'message': f'Alerte: {param} = {patient_data[param]} ({operator} {value})',
+                               'action': 'Surveillance recommandée.'})
+    for param, (min_val, max_val) in system.alert_thresholds.items():
+        if param in patient_data:
+            value = patient_data[param]
+            if value < min_val and not any(a['parameter'] == param for a in alerts):
+                alerts.append({'parameter': param, 'value': value, 'threshold': f'< {min_val}', 'severity': 'low',
+                               'message': f'Valeur basse: {param} = {value} (min: {min_val})',
+                               'action': 'Surveillance conseillée.'})
+            elif value > max_val and not any(a['parameter'] == param for a in alerts):
+                alerts.append({'parameter': param, 'value': value, 'threshold': f'> {max_val}', 'severity': 'low',
+                               'message': f'Valeur élevée: {param} = {value} (max: {max_val})',
+                               'action': 'Surveillance conseillée.'})
+    return alerts
+
+
+def random_patients(n: int, seed: int = 0) -> list:
+    """Patients aléatoires avec valeurs manquantes (NaN) et paramètres absents."""
+    rng = np.random.default_rng(seed)
+    patients = []
+    for _ in range(n):
+        patient = {}
+        for param, (low, high) in RANGES.items():
+            draw = rng.random()
+            if draw < 0.1:
+                continue  # Paramètre absent
+            patient[param] = float('nan') if draw < 0.2 else round(float(rng.uniform(low, high)), 1)
+        patients.append(patient)
+    return patients
+
+
+@pytest.fixture(scope='module')
+def system():
+    return AlertSystem()
+
+
+def test_scalar_path_matches_original(system):
+    for patient in random_patients(2_000):
+        assert [alert.to_dict() for alert in system.check_vital_signs(patient)] == reference_alerts(system, patient)
+
+
+def test_boundary_values_match_original(system):
+    # Valeurs exactement aux seuils : les comparaisons strictes doivent être conservées
+    for condition in system.critical_conditions['high'] + system.critical_conditions['medium']:
+        param, _, value = system._parse_condition(condition)
+        for delta in (-0.1, 0.0, 0.1):
+            patient = {param: round(float(value) + delta, 1)}
+            assert [alert.to_dict() for alert in system.check_vital_signs(patient)] == \
+                reference_alerts(system, patient)
+
+
+@pytest.mark.parametrize('layout', ['records', 'columns', 'matrix'])
+def test_batch_matches_scalar(system, layout):
+    patients = random_patients(2_000, seed=1)
+    if layout == 'records':
+        vitals = patients
+    elif layout == 'columns':
+        # Colonne 'respiratory_rate' entièrement absente
+        vitals = {param: [patient.get(param, np.nan) for patient in patients]
+                  for param in system.parameters if param != 'respiratory_rate'}
+        patients = [{k: v for k, v in patient.items() if k != 'respiratory_rate'} for patient in patients]
+    else:
+        vitals = np.array([[patient.get(param, np.nan) for param in system.parameters] for patient in patients])
+    
+    result = system.check_vital_signs_batch(vitals)
+    
+    assert result['parameters'] == system.parameters
+    for i, patient in enumerate(patients):
+        expected = np.zeros(len(system.parameters), dtype=np.int8)
+        for alert in reference_alerts(system, patient):
+            expected[system.parameters.index(alert['parameter'])] = SEVERITY_LEVELS.index(alert['severity'])
+        np.testing.assert_array_equal(result['levels'][i], expected)
+        assert result['severity'][i] == expected.max()
+    for code, level in enumerate(SEVERITY_LEVELS[1:], 1):
+        np.testing.assert_array_equal(result[level], result['levels'] == code)
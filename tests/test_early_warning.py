@@ -0,0 +1,73 @@
+"""Bandes NEWS2 aux bornes et niveaux d'escalade, patient par patient et par cohorte."""
+import numpy as np
+import pytest
+
+from core.early_warning import EWS_LEVELS, EarlyWarningScore
+
+# (valeur, points NEWS2) de part et d'autre de chaque borne de bande
+BOUNDARIES = {
+    'respiratory_rate': [(5, 3), (8, 3), (9, 1), (11, 1), (12, 0), (20, 0), (21, 2), (24, 2), (25, 3), (40, 3)],
+    'oxygen_saturation': [(85, 3), (91, 3), (92, 2), (93, 2), (94, 1), (95, 1), (96, 0), (100, 0)],
+    'blood_pressure_systolic': [(70, 3), (90, 3), (91, 2), (100, 2), (101, 1), (110, 1), (111, 0), (219, 0),
+                                (220, 3)],
+    'heart_rate': [(30, 3), (40, 3), (41, 1), (50, 1), (51, 0), (90, 0), (91, 1), (110, 1), (111, 2), (130, 2),
+                   (131, 3)],
+    'temperature': [(34.0, 3), (35.0, 3), (35.1, 1), (36.0, 1), (36.1, 0), (38.0, 0), (38.1, 1), (39.0, 1),
+                    (39.1, 2), (41.0, 2)],
+    'supplemental_oxygen': [(0, 0), (1, 2)],
+    'altered_consciousness': [(0, 0), (1, 3)],
+}
+
+CASES = [(param, value, points) for param, cases in BOUNDARIES.items() for value, points in cases]
+
+
+@pytest.fixture(scope='module')
+def ews():
+    return EarlyWarningScore()
+
+
+@pytest.mark.parametrize('param, value, points', CASES)
+def test_band_boundaries(ews, param, value, points):
+    assert ews.score({param: value})['points'] == {param: points}
+    
+    result = ews.score_batch([{param: value}])
+    assert result['points'][0, ews.parameters.index(param)] == points
+    assert result['total'][0] == points
+
+
+def test_all_boundaries_in_one_batch(ews):
+    patients = [{param: value} for param, value, _ in CASES]
+    result = ews.score_batch({param: [patient.get(param, np.nan) for patient in patients]
+                              for param in ews.parameters})
+    assert result['total'].tolist() == [points for _, _, points in CASES]
+
+
+@pytest.mark.parametrize('patient, total, level', [
+    ({'respiratory_rate': 16, 'oxygen_saturation': 98, 'heart_rate': 70, 'temperature': 37.0}, 0, 'low'),
+    ({'heart_rate': 111, 'temperature': 39.1}, 4, 'low'),  # 4 points sans paramètre à 3
+    ({'respiratory_rate': 25}, 3, 'low-medium'),  # Paramètre à 3 points (red flag)
+    ({'altered_consciousness': 1, 'oxygen_saturation': 95}, 4, 'low-medium'),
+    ({'heart_rate': 111, 'temperature': 39.1, 'oxygen_saturation': 95}, 5, 'medium'),
+    ({'heart_rate': 111, 'temperature': 39.1, 'supplemental_oxygen': 1}, 6, 'medium'),
+    ({'respiratory_rate': 25, 'temperature': 39.1}, 5, 'medium'),  # Red flag et total 5 : medium
+    ({'heart_rate': 131, 'temperature': 39.1, 'supplemental_oxygen': 1}, 7, 'high'),
+    ({'respiratory_rate': 30, 'oxygen_saturation': 85, 'blood_pressure_systolic': 80, 'heart_rate': 140,
+      'temperature': 34.0, 'supplemental_oxygen': 1, 'altered_consciousness': 1}, 20, 'high'),
+])
+def test_levels(ews, patient, total, level):
+    result = ews.score(patient)
+    assert (result['total'], result['level']) == (total, level)
+    
+    batch = ews.score_batch([patient])
+    assert batch['total'][0] == total
+    assert ews.level_names(batch['level']) == [level]
+
+
+def test_missing_values_score_zero(ews):
+    patients = [{'respiratory_rate': np.nan, 'heart_rate': 131}, {}]
+    assert ews.score(patients[0]) == {'total': 3, 'level': 'low-medium', 'points': {'heart_rate': 3}}
+    assert ews.score(patients[1])['level'] == EWS_LEVELS[0]
+    
+    result = ews.score_batch(patients)
+    assert result['total'].tolist() == [3, 0]
+    assert result['red_flag'].tolist() == [True, False]
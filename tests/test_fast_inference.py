@@ -0,0 +1,87 @@
+"""Le chemin d'inférence rapide doit reproduire predict_proba de sklearn."""
+import warnings
+
+import numpy as np
+import pytest
+
+from core.logistic_regression import LogisticRegressionModel, SGDLogisticRegressionModel
+from core.neural_network import NeuralNetworkModel
+
+MODELS = {
+    'logistic': lambda: LogisticRegressionModel(max_iter=1000),
+    'mlp': lambda: NeuralNetworkModel(hidden_layer_sizes=(16, 8), max_iter=200, random_state=0),
+    'sgd': lambda: SGDLogisticRegressionModel(random_state=0),
+}
+
+
+def make_data(n_classes: int, n_samples: int = 600, n_features: int = 6, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, n_features))
+    logits = X @ rng.normal(size=(n_features, n_classes))
+    return np.ascontiguousarray(X), logits.argmax(axis=1)
+
+
+def trained(name: str, n_classes: int):
+    X, y = make_data(n_classes)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # ConvergenceWarning du MLP
+        model = MODELS[name]().train(X, y)
+    return model, make_data(n_classes, n_samples=200, seed=1)[0]
+
+
+@pytest.mark.parametrize('n_classes', [2, 3])
+@pytest.mark.parametrize('name', sorted(MODELS))
+def test_fast_path_matches_sklearn(name, n_classes):
+    model, X = trained(name, n_classes)
+    expected = model.model.predict_proba(X)
+    
+    assert model.supports_fast_path
+    np.testing.assert_allclose(model.fast_predict_proba(X), expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('n_classes', [2, 3])
+@pytest.mark.parametrize('name', sorted(MODELS))
+def test_fast_path_preallocated_out(name, n_classes):
+    model, X = trained(name, n_classes)
+    expected = model.model.predict_proba(X)
+    out = np.full((len(X), n_classes), np.nan)
+    
+    result = model.fast_predict_proba(X, out=out)
+    
+    assert result is out
+    np.testing.assert_allclose(out, expected, rtol=1e-12, atol=1e-12)
+    # Tampon réutilisé sur une seule ligne
+    np.testing.assert_allclose(model.fast_predict_proba(X[:1], out=out[:1]), expected[:1],
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_fast_weights_invalidated_by_training():
+    model, X = trained('logistic', 2)
+    model.fast_predict_proba(X)
+    X_new, y_new = make_data(2, seed=2)
+    model.train(X_new, 1 - y_new)
+    
+    np.testing.assert_allclose(model.fast_predict_proba(X), model.model.predict_proba(X),
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_one_vs_rest_logistic_regression():
+    # multi_class='ovr' (sklearn < 1.8) : sigmoïdes un-contre-tous normalisées, pas de softmax
+    model, X = trained('logistic', 3)
+    model.model.multi_class = 'ovr'
+    model._fast_weights = None
+    scores = 1.0 / (1.0 + np.exp(-model.model.decision_function(X)))
+    expected = scores / scores.sum(axis=1, keepdims=True)
+    
+    np.testing.assert_allclose(model.fast_predict_proba(X), expected, rtol=1e-12, atol=1e-12)
+    if 'multi_class' in model.model.get_params():  # Versions de sklearn qui appliquent encore l'option
+        np.testing.assert_allclose(model.model.predict_proba(X), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_model_without_probabilities_has_no_fast_path():
+    X, y = make_data(2)
+    model = SGDLogisticRegressionModel(loss='hinge', random_state=0).train(X, y)
+    
+    assert not model.supports_fast_path
+    with pytest.raises(ValueError):
+        model.fast_predict_proba(X)
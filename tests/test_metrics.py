@@ -0,0 +1,81 @@
+"""Métriques par effectifs et AUC par groupes d'ex æquo, comparées à sklearn.metrics."""
+import numpy as np
+import pytest
+from sklearn import metrics
+
+from core.logistic_regression import LogisticRegressionModel
+from pipeline.evaluator import Evaluator
+from utils.metrics import MetricsCalculator
+
+
+def auc(y_true, scores, pos_label=1):
+    order, starts = MetricsCalculator.score_groups(scores)
+    labels = (np.asarray(y_true) == pos_label)[order]
+    return float(MetricsCalculator.auc_from_groups(np.add.reduceat(labels.astype(float), starts),
+                                                   np.add.reduceat((~labels).astype(float), starts)))
+
+
+@pytest.mark.parametrize('pos_label', [1, 'infecté'])
+def test_confusion_counts_and_metrics(pos_label):
+    rng = np.random.default_rng(0)
+    classes = np.array([0, 1]) if pos_label == 1 else np.array(['sain', 'infecté'])
+    y_true = classes[rng.integers(0, 2, size=1_000)]
+    y_pred = classes[rng.integers(0, 2, size=1_000)]
+    negative = classes[classes != pos_label][0]
+    
+    counts = MetricsCalculator.confusion_counts(y_true, y_pred, pos_label)
+    expected = metrics.confusion_matrix(y_true, y_pred, labels=[negative, pos_label]).ravel()
+    np.testing.assert_array_equal(counts, expected)
+    
+    result = MetricsCalculator.metrics_from_counts(counts)
+    assert result['accuracy'] == pytest.approx(metrics.accuracy_score(y_true, y_pred))
+    assert result['precision'] == pytest.approx(metrics.precision_score(y_true, y_pred, pos_label=pos_label))
+    assert result['recall'] == pytest.approx(metrics.recall_score(y_true, y_pred, pos_label=pos_label))
+    assert result['f1_score'] == pytest.approx(metrics.f1_score(y_true, y_pred, pos_label=pos_label))
+
+
+def test_metrics_from_counts_vectorised_and_zero_division():
+    counts = np.array([[5, 0, 3, 0], [2, 1, 1, 4]])
+    result = MetricsCalculator.metrics_from_counts(counts)
+    
+    assert result['precision'].tolist() == [0.0, 0.8]
+    assert result['f1_score'][0] == 0.0
+    for k, (tn, fp, fn, tp) in enumerate(counts):
+        y_true = [0] * (tn + fp) + [1] * (fn + tp)
+        y_pred = [0] * tn + [1] * fp + [0] * fn + [1] * tp
+        assert result['recall'][k] == pytest.approx(metrics.recall_score(y_true, y_pred, zero_division=0))
+
+
+@pytest.mark.parametrize('decimals', [None, 1, 0])
+def test_auc_with_ties_matches_sklearn(decimals):
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 2, size=2_000)
+    scores = rng.random(2_000) + 0.3 * y_true
+    if decimals is not None:
+        scores = np.round(scores, decimals)  # Nombreux ex æquo, y compris entre classes
+    
+    assert auc(y_true, scores) == pytest.approx(metrics.roc_auc_score(y_true, scores), abs=1e-12)
+
+
+def test_auc_single_class_is_nan():
+    assert np.isnan(auc(np.ones(10), np.linspace(0, 1, 10)))
+
+
+@pytest.mark.parametrize('threshold', [None, 0.3])
+def test_evaluator_streamed_matches_sklearn(threshold):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(3_000, 4))
+    y = (X[:, 0] + rng.normal(size=3_000) > 0).astype(int)
+    model = LogisticRegressionModel().train(X[:2_000], y[:2_000])
+    X_test, y_test = X[2_000:], y[2_000:]
+    proba = model.predict_proba(X_test)[:, 1]
+    y_pred = model.predict(X_test) if threshold is None else (proba >= threshold).astype(int)
+    
+    evaluator = Evaluator(model, threshold=threshold)
+    result = evaluator.evaluate(X_test, y_test, batch_size=128)
+    
+    assert result['accuracy'] == pytest.approx(metrics.accuracy_score(y_test, y_pred))
+    assert result['precision'] == pytest.approx(metrics.precision_score(y_test, y_pred))
+    assert result['recall'] == pytest.approx(metrics.recall_score(y_test, y_pred))
+    assert result['f1_score'] == pytest.approx(metrics.f1_score(y_test, y_pred))
+    assert result['roc_auc'] == pytest.approx(metrics.roc_auc_score(y_test, proba), abs=1e-12)
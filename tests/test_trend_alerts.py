@@ -0,0 +1,49 @@
+"""Les fenêtres de tendance couvrent toute leur durée, quel que soit le débit des mesures."""
+import numpy as np
+import pytest
+
+from core.trend_alerts import TrendMonitor, TrendRule, _Window
+
+
+def test_slow_desaturation_detected_on_fast_feed():
+    # 1 mesure par seconde, SpO2 qui perd 5 points en 30 minutes
+    monitor = TrendMonitor()
+    events = []
+    for second in range(30 * 60 + 1):
+        events += monitor.update('p1', 'oxygen_saturation', 97.0 - 5.0 * second / 1800, 1.7e9 + second)
+    assert [event['rule'] for event in events] == ['spo2_dropping']
+    assert monitor.truncated['spo2_dropping'] == 0
+
+
+def test_slope_matches_least_squares_over_time_window():
+    rule = TrendRule('hr', 'heart_rate', 'slope', '>', 1e9, 600)
+    monitor = TrendMonitor([rule])
+    rng = np.random.default_rng(0)
+    times = 1.7e9 + np.cumsum(rng.uniform(0.1, 2.0, size=5_000))
+    values = 80 + 0.01 * (times - times[0]) + rng.normal(size=len(times))
+    for t, v in zip(times, values):
+        monitor.update('p1', 'heart_rate', v, t)
+    
+    window = monitor._windows['p1'][0]
+    inside = times >= times[-1] - 600
+    assert window.size == inside.sum()
+    expected = np.polyfit(times[inside] - times[inside][0], values[inside], 1)[0]
+    assert window.slope() == pytest.approx(expected, rel=1e-9)
+
+
+def test_max_samples_truncation_is_counted():
+    monitor = TrendMonitor(max_samples=100)
+    for second in range(500):
+        monitor.update('p1', 'heart_rate', 80.0, second)
+    assert monitor._windows['p1'][0].size == 100
+    assert monitor.truncated['heart_rate_rising'] == 400
+
+
+def test_window_grow_keeps_order():
+    window = _Window(4)
+    for t in range(10):
+        window.push(float(t), float(t))
+        if t % 3 == 0:
+            window.pop()
+    times = [window.times[(window.head + i) % len(window.times)] + window.origin for i in range(window.size)]
+    assert times == sorted(times) and times[-1] == 9.0
@@ -0,0 +1,241 @@
+"""
+Surveillance de la dérive des entrées en production par histogrammes à bornes fixes.
+
+À l'entraînement, les bornes des bins de chaque feature sont tirées des
+quantiles des données brutes et les effectifs de référence sont enregistrés
+dans les métadonnées de l'artefact. En production, chaque requête incrémente
+des compteurs de mêmes bornes : la mémoire est constante (features x bins),
+aucune requête n'est conservée, et PSI / KS sont calculés à la demande en
+comparant les deux histogrammes.
+"""
+import threading
+from typing import Any, Dict, List
+import numpy as np
+
+# Seuils usuels du PSI : < 0.1 stable, 0.1 - 0.25 dérive modérée, >= 0.25 dérive importante
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+DRIFT_LEVELS = ('stable', 'moderate', 'significant')
+
+# Clé des métadonnées d'artefact contenant l'histogramme de référence
+METADATA_KEY = 'drift_reference'
+
+# Proportion plancher des bins vides (évite log(0) dans le PSI)
+_EPSILON = 1e-4
+
+# Nombre maximal de comparaisons (lignes x features x bornes) matérialisées par bloc
+_BLOCK_SIZE = 2 ** 20
+
+
+class HistogramSketch:
+    """
+    Histogrammes à bornes fixes de chaque feature, plus un compteur de valeurs manquantes.
+    
+    Une feature à k bornes a k + 1 bins : (-inf, b0), [b0, b1), ..., [bk-1, +inf).
+    Les valeurs non finies (NaN, ±inf) sont comptées comme manquantes.
+    """
+    
+    def __init__(self, edges: List, feature_names: List[str] = None):
+        """
+        Args:
+            edges: Bornes strictement croissantes de chaque feature
+            feature_names: Noms des features (par défaut feature_0, feature_1...)
+        """
+        edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        if any(np.any(np.diff(e) <= 0) for e in edges):
+            raise ValueError("Les bornes doivent être strictement croissantes")
+        if feature_names is None:
+            feature_names = [f'feature_{j}' for j in range(len(edges))]
+        if len(feature_names) != len(edges):
+            raise ValueError(f"{len(edges)} features attendues, reçu {len(feature_names)} noms")
+        self.feature_names = list(feature_names)
+        self.n_edges = np.array([len(e) for e in edges], dtype=np.int64)
+        width = int(self.n_edges.max(initial=0))
+        # Bornes complétées par +inf : les colonnes de remplissage ne comptent jamais
+        self._edges = np.full((len(edges), width), np.inf)
+        for j, e in enumerate(edges):
+            self._edges[j, :len(e)] = e
+        # Bins 0..width puis valeurs manquantes (dernière colonne)
+        self.counts = np.zeros((len(edges), width + 2), dtype=np.int64)
+        self.n = 0
+    
+    @classmethod
+    def from_data(cls, X, feature_names: List[str] = None, n_bins: int = 20):
+        """
+        Bornes aux quantiles des données puis histogramme de ces données.
+        
+        Args:
+            X: Données brutes d'entraînement (n_samples, n_features)
+            feature_names: Noms des features
+            n_bins: Nombre de bins visé par feature (moins si des quantiles coïncident)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError("X doit être une matrice (n_samples, n_features)")
+        levels = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = []
+        for column in X.T:
+            values = column[~np.isnan(column)]
+            edges.append(np.unique(np.quantile(values, levels)) if len(values) else np.empty(0))
+        sketch = cls(edges, feature_names)
+        sketch.update(X)
+        return sketch
+    
+    def empty_copy(self):
+        """Histogramme vide de mêmes bornes (pour le trafic en production)."""
+        return HistogramSketch(self.edges, self.feature_names)
+    
+    @property
+    def edges(self) -> List[np.ndarray]:
+        return [self._edges[j, :k] for j, k in enumerate(self.n_edges)]
+    
+    def update(self, X):
+        """Ajoute des lignes (n_samples, n_features), ou une ligne, aux histogrammes."""
+        counts, n_rows = self.bin_counts(X)
+        self.counts += counts
+        self.n += n_rows
+        return self
+    
+    def bin_counts(self, X):
+        """Effectifs par bin de lignes de données, sans modifier l'histogramme."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_features, width = self._edges.shape
+        if X.shape[1] != n_features:
+            raise ValueError(f"{n_features} features attendues, reçu {X.shape[1]}")
+        slots = width + 2
+        offsets = np.arange(n_features) * slots
+        block = max(1, _BLOCK_SIZE // max(n_features * width, 1))
+        counts = np.zeros(n_features * slots, dtype=np.int64)
+        for start in range(0, len(X), block):
+            values = X[start:start + block]
+            # Indice du bin : nombre de bornes <= valeur ; NaN et infinis -> colonne des
+            # manquantes (+inf dépasserait les bornes de remplissage)
+            bins = (self._edges <= values[:, :, None]).sum(axis=2)
+            bins[~np.isfinite(values)] = width + 1
+            counts += np.bincount((bins + offsets).ravel(), minlength=n_features * slots)
+        return counts.reshape(n_features, slots), len(X)
+    
+    def histogram(self, j: int):
+        """(effectifs des bins, effectif des valeurs manquantes) de la feature j."""
+        return self.counts[j, :self.n_edges[j] + 1], self.counts[j, -1]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation JSON (métadonnées d'artefact)."""
+        return {
+            'feature_names': self.feature_names,
+            'edges': [e.tolist() for e in self.edges],
+            'counts': [self.histogram(j)[0].tolist() for j in range(len(self.feature_names))],
+            'missing': [int(self.histogram(j)[1]) for j in range(len(self.feature_names))],
+            'n': self.n
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        sketch = cls(data['edges'], data['feature_names'])
+        for j, (counts, missing) in enumerate(zip(data['counts'], data['missing'])):
+            sketch.counts[j, :len(counts)] = counts
+            sketch.counts[j, -1] = missing
+        sketch.n = data['n']
+        return sketch
+
+
+class DriftMonitor:
+    """
+    Compare le trafic reçu en production à l'histogramme de référence de l'entraînement.
+    
+    Exemple:
+        monitor = DriftMonitor.from_artifact('artifacts/v1')
+        api = ClinicalAPI(predictor, drift_monitor=monitor)
+        ...
+        monitor.report()['drifted']
+    """
+    
+    def __init__(self, reference: HistogramSketch):
+        self.reference = reference
+        self.live = reference.empty_copy()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_artifact(cls, path: str):
+        """Crée le moniteur depuis la référence enregistrée dans un artefact (sans charger le modèle)."""
+        import json
+        import os
+        
+        with open(os.path.join(path, 'manifest.json')) as f:
+            metadata = json.load(f).get('metadata', {})
+        if METADATA_KEY not in metadata:
+            raise ValueError(f"L'artefact {path} ne contient pas d'histogramme de référence")
+        return cls(HistogramSketch.from_dict(metadata[METADATA_KEY]))
+    
+    @property
+    def feature_names(self) -> List[str]:
+        return self.reference.feature_names
+    
+    def update(self, X):
+        """Ajoute des entrées brutes (avant prétraitement) reçues en production."""
+        # Bornes identiques à celles de la référence : le comptage se fait hors verrou
+        counts, n_rows = self.reference.bin_counts(X)
+        with self._lock:
+            self.live.counts += counts
+            self.live.n += n_rows
+    
+    def reset(self):
+        """Repart d'un histogramme vide (par exemple à chaque période de surveillance)."""
+        with self._lock:
+            self.live = self.reference.empty_copy()
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        PSI et KS de chaque feature entre la référence et le trafic reçu.
+        
+        Les valeurs manquantes forment un bin supplémentaire du PSI ; la
+        statistique KS est l'écart maximal entre les fonctions de répartition
+        des valeurs présentes, évaluées aux bornes des bins (approximation par
+        défaut du KS exact).
+        
+        Returns:
+            Dictionnaire 'n_live', 'features' (psi, ks, taux de valeurs
+            manquantes et niveau par feature), 'max_psi' et 'drifted' (features
+            de niveau 'significant')
+        """
+        with self._lock:
+            live = self.live.counts.copy()
+            n_live = self.live.n
+        features = {}
+        for j, name in enumerate(self.feature_names):
+            k = self.reference.n_edges[j] + 1
+            reference = self.reference.counts[j]
+            features[name] = _compare(np.append(reference[:k], reference[-1]),
+                                      np.append(live[j, :k], live[j, -1])) if n_live else None
+        scored = {name: result for name, result in features.items() if result is not None}
+        return {
+            'n_live': n_live,
+            'n_reference': self.reference.n,
+            'features': features,
+            'max_psi': max((result['psi'] for result in scored.values()), default=None),
+            'drifted': [name for name, result in scored.items() if result['level'] == 'significant']
+        }
+
+
+def _compare(reference: np.ndarray, live: np.ndarray) -> Dict[str, Any]:
+    """PSI et KS entre deux histogrammes (dernier bin : valeurs manquantes)."""
+    p = np.maximum(reference / max(reference.sum(), 1), _EPSILON)
+    q = np.maximum(live / max(live.sum(), 1), _EPSILON)
+    psi = float(np.sum((q - p) * np.log(q / p)))
+    
+    present_reference, present_live = reference[:-1], live[:-1]
+    if present_reference.sum() and present_live.sum():
+        ks = float(np.abs(np.cumsum(present_live) / present_live.sum()
+                          - np.cumsum(present_reference) / present_reference.sum()).max())
+    else:
+        ks = None
+    level = 2 if psi >= PSI_SIGNIFICANT else 1 if psi >= PSI_MODERATE else 0
+    return {
+        'psi': psi,
+        'ks': ks,
+        'missing_rate': float(live[-1] / max(live.sum(), 1)),
+        'reference_missing_rate': float(reference[-1] / max(reference.sum(), 1)),
+        'level': DRIFT_LEVELS[level]
+    }
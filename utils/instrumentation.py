@@ -0,0 +1,247 @@
+"""
+Instrumentation des chemins critiques : compteurs, histogrammes de durée et spans.
+
+Désactivée par défaut, elle ne coûte alors qu'un test de booléen par appel.
+Une fois activée, chaque span est échantillonné (`sample_rate`) pour pouvoir
+garder le traçage actif en charge. Les spans imbriqués sont nommés par leur
+chemin complet (ex. 'api.predict_endpoint/predictor.diagnose/predictor.model'),
+ce qui montre où le temps est passé.
+
+Activation :
+    from utils import instrumentation
+    instrumentation.configure(enabled=True, sample_rate=0.1)
+ou via l'environnement : CLINICAL_METRICS=1 CLINICAL_METRICS_SAMPLE_RATE=0.1
+
+Export :
+    instrumentation.export_prometheus()       # texte au format Prometheus
+    instrumentation.write_prometheus(path)    # fichier (collecteur textfile)
+"""
+import bisect
+import contextvars
+import functools
+import os
+import random
+import threading
+import time
+
+# Bornes des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_span = contextvars.ContextVar('clinical_span', default=None)
+
+
+class _Histogram:
+    """Histogramme cumulatif à bornes fixes."""
+    
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _NoopSpan:
+    """Span inactif (instrumentation désactivée ou span non échantillonné)."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_UNSAMPLED = object()
+
+
+class _UnsampledSpan:
+    """Span racine non échantillonné : ses spans enfants sont ignorés eux aussi."""
+    
+    __slots__ = ('token',)
+    
+    def __enter__(self):
+        self.token = _current_span.set(_UNSAMPLED)
+        return self
+    
+    def __exit__(self, *exc_info):
+        _current_span.reset(self.token)
+        return False
+
+
+class _Span:
+    """Span actif : mesure sa durée et l'enregistre sous son chemin complet."""
+    
+    __slots__ = ('registry', 'path', 'token', 'start')
+    
+    def __init__(self, registry, name: str, parent=None):
+        self.registry = registry
+        self.path = name if parent is None else f"{parent}/{name}"
+    
+    def __enter__(self):
+        self.token = _current_span.set(self.path)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, *exc_info):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        self.registry.observe(self.path, duration, error=exc_type is not None)
+        return False
+
+
+class MetricsRegistry:
+    """Registre des compteurs et histogrammes de durée."""
+    
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0, buckets=DEFAULT_BUCKETS,
+                 namespace: str = 'clinical'):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._errors = {}
+    
+    def configure(self, enabled: bool = None, sample_rate: float = None):
+        """Active/désactive l'instrumentation et règle le taux d'échantillonnage."""
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError("sample_rate doit être compris entre 0 et 1")
+            self.sample_rate = sample_rate
+        if enabled is not None:
+            self.enabled = enabled
+        return self
+    
+    def reset(self):
+        """Efface toutes les mesures."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._errors.clear()
+    
+    def span(self, name: str):
+        """Contexte mesurant la durée d'un bloc (no-op si désactivé ou non échantillonné)."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        # Un span enfant suit la décision d'échantillonnage de son parent
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return _NOOP_SPAN
+        if parent is None and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return _UnsampledSpan()
+        return _Span(self, name, parent)
+    
+    def increment(self, name: str, value: float = 1, **labels):
+        """Incrémente un compteur."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, span: str, seconds: float, error: bool = False):
+        """Enregistre une durée dans l'histogramme d'un span."""
+        with self._lock:
+            histogram = self._histograms.get(span)
+            if histogram is None:
+                histogram = self._histograms[span] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error:
+                self._errors[span] = self._errors.get(span, 0) + 1
+    
+    def snapshot(self) -> dict:
+        """Retourne une copie des mesures (compteurs, histogrammes, erreurs)."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {
+                    span: {'buckets': list(h.buckets), 'counts': list(h.counts), 'sum': h.sum, 'count': h.count}
+                    for span, h in self._histograms.items()
+                },
+                'errors': dict(self._errors),
+                'sample_rate': self.sample_rate,
+            }
+    
+    def export_prometheus(self) -> str:
+        """Exporte les mesures au format texte Prometheus."""
+        snapshot = self.snapshot()
+        ns = self.namespace
+        lines = []
+        
+        counter_names = sorted({name for name, _ in snapshot['counters']})
+        for name in counter_names:
+            lines.append(f"# TYPE {ns}_{name}_total counter")
+            for (counter, labels), value in sorted(snapshot['counters'].items()):
+                if counter == name:
+                    lines.append(f"{ns}_{name}_total{_format_labels(dict(labels))} {value}")
+        
+        metric = f"{ns}_span_duration_seconds"
+        lines.append(f"# HELP {metric} Durée des spans instrumentés (taux d'échantillonnage {snapshot['sample_rate']})")
+        lines.append(f"# TYPE {metric} histogram")
+        for span, histogram in sorted(snapshot['histograms'].items()):
+            cumulative = 0
+            for bound, count in zip(list(histogram['buckets']) + ['+Inf'], histogram['counts']):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels({'span': span, 'le': bound})} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels({'span': span})} {histogram['sum']}")
+            lines.append(f"{metric}_count{_format_labels({'span': span})} {histogram['count']}")
+        
+        lines.append(f"# TYPE {ns}_span_errors_total counter")
+        for span, count in sorted(snapshot['errors'].items()):
+            lines.append(f"{ns}_span_errors_total{_format_labels({'span': span})} {count}")
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: str):
+        """Écrit l'export Prometheus dans un fichier (remplacement atomique)."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.export_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _format_labels(labels: dict) -> str:
+    """Formate des labels Prometheus en échappant les valeurs."""
+    if not labels:
+        return ''
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+# Registre global utilisé par les modules instrumentés
+registry = MetricsRegistry(
+    enabled=os.environ.get('CLINICAL_METRICS', '') not in ('', '0', 'false'),
+    sample_rate=float(os.environ.get('CLINICAL_METRICS_SAMPLE_RATE', '1.0')),
+)
+
+configure = registry.configure
+span = registry.span
+increment = registry.increment
+export_prometheus = registry.export_prometheus
+write_prometheus = registry.write_prometheus
+
+
+def instrumented(name: str):
+    """Décorateur : enregistre chaque appel de la fonction comme un span `name`."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            with registry.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -12,3 +12,78 @@ class MetricsCalculator:
         """Calcule le score ROC AUC"""
         from sklearn.metrics import roc_auc_score
         return roc_auc_score(y_true, y_pred_proba)
+    
+    @staticmethod
+    def confusion_counts(y_true, y_pred, pos_label=1):
+        """
+        Effectifs binaires (tn, fp, fn, tp) en un seul passage.
+        
+        Returns:
+            Tableau de 4 entiers, dans l'ordre (tn, fp, fn, tp)
+        """
+        import numpy as np
+        
+        truth = np.asarray(y_true) == pos_label
+        predicted = np.asarray(y_pred) == pos_label
+        return np.bincount(2 * truth + predicted, minlength=4)
+    
+    @staticmethod
+    def metrics_from_counts(counts):
+        """
+        Accuracy, précision, rappel et F1 dérivés des effectifs (tn, fp, fn, tp).
+        
+        Vectorisé : `counts` peut être de forme (..., 4), par exemple un
+        effectif par réplique bootstrap. Une division par zéro donne 0.
+        """
+        import numpy as np
+        
+        counts = np.asarray(counts, dtype=np.float64)
+        tn, fp, fn, tp = np.moveaxis(counts, -1, 0)
+        total = counts.sum(axis=-1)
+        
+        def ratio(numerator, denominator):
+            return np.divide(numerator, denominator, out=np.zeros_like(numerator),
+                             where=denominator > 0)
+        
+        return {
+            'accuracy': ratio(tp + tn, total),
+            'precision': ratio(tp, tp + fp),
+            'recall': ratio(tp, tp + fn),
+            'f1_score': ratio(2 * tp, 2 * tp + fp + fn)
+        }
+    
+    @staticmethod
+    def score_groups(scores):
+        """
+        Trie les scores et repère les groupes d'ex æquo.
+        
+        Returns:
+            (order, starts) : permutation triant les scores par ordre croissant
+            et indice de début de chaque groupe de scores égaux dans cet ordre
+        """
+        import numpy as np
+        
+        scores = np.asarray(scores)
+        order = np.argsort(scores, kind='stable')
+        sorted_scores = scores[order]
+        starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+        return order, starts
+    
+    @staticmethod
+    def auc_from_groups(positives, negatives):
+        """
+        ROC AUC (statistique de Mann-Whitney) à partir des poids positifs et
+        négatifs de chaque groupe de scores égaux, groupes triés par score croissant.
+        
+        Vectorisé sur les dimensions de tête : (..., n_groups) -> (...).
+        Retourne NaN si une des deux classes est absente.
+        """
+        import numpy as np
+        
+        positives = np.asarray(positives, dtype=np.float64)
+        negatives = np.asarray(negatives, dtype=np.float64)
+        below = np.cumsum(negatives, axis=-1) - negatives  # Négatifs de score strictement inférieur
+        pairs = positives.sum(axis=-1) * negatives.sum(axis=-1)
+        wins = (positives * (below + 0.5 * negatives)).sum(axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(pairs > 0, wins / pairs, np.nan)
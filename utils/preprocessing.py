@@ -2,21 +2,110 @@ class Preprocessor:
     """Prétraitement des données"""
     
     def __init__(self):
-        self.scaler = None
+        # État appris une seule fois sur les données d'entraînement
+        self.mean_ = None   # Moyennes par feature (imputation et centrage)
+        self.scale_ = None  # Écarts-types par feature (après imputation)
+    
+    @property
+    def is_fitted(self):
+        """Indique si l'imputation et la normalisation ont été apprises"""
+        return self.mean_ is not None
+    
+    def fit(self, X):
+        """
+        Apprend l'imputation par la moyenne et la normalisation sur les données d'entraînement.
+        
+        Équivalent à SimpleImputer(strategy='mean') suivi de StandardScaler :
+        l'écart-type est celui des données après imputation.
+        """
+        import numpy as np
+        
+        X = np.asarray(X, dtype=np.float64)
+        missing = np.isnan(X)
+        count = X.shape[0] - missing.sum(axis=0)
+        # Une colonne entièrement manquante est imputée à 0
+        mean = np.divide(np.nansum(X, axis=0), count, out=np.zeros(X.shape[1]), where=count > 0)
+        variance = np.nansum((X - mean) ** 2, axis=0) / max(X.shape[0], 1)
+        scale = np.sqrt(variance)
+        scale[scale == 0] = 1.0
+        
+        self.mean_ = np.ascontiguousarray(mean)
+        self.scale_ = np.ascontiguousarray(scale)
+        return self
+    
+    def transform(self, X, copy: bool = True):
+        """
+        Applique l'imputation et la normalisation apprises.
+        
+        Les deux étapes sont faites en place sur une seule matrice float64 :
+        centrage, réduction, puis valeurs manquantes mises à 0 (la moyenne
+        imputée une fois normalisée), sans matrice intermédiaire.
+        
+        Args:
+            X: Données (n_samples, n_features)
+            copy: Si False et que X est déjà une matrice float64 modifiable,
+                X est transformé en place
+        """
+        import numpy as np
+        
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté (fit) avant transform")
+        
+        X = np.array(X, dtype=np.float64, copy=copy or None)
+        if not X.flags.writeable:
+            X = X.copy()
+        np.subtract(X, self.mean_, out=X)
+        np.divide(X, self.scale_, out=X)
+        np.copyto(X, 0.0, where=np.isnan(X))
+        return X
+    
+    def fit_transform(self, X):
+        """Apprend puis applique le prétraitement"""
+        return self.fit(X).transform(X)
     
     def normalize(self, X):
         """Normalise les données"""
-        from sklearn.preprocessing import StandardScaler
-        
-        if self.scaler is None:
-            self.scaler = StandardScaler()
-            return self.scaler.fit_transform(X)
-        return self.scaler.transform(X)
+        if not self.is_fitted:
+            self.fit(X)
+        return self.transform(X)
     
     def handle_missing_values(self, X):
         """Gère les valeurs manquantes"""
         import numpy as np
-        from sklearn.impute import SimpleImputer
         
-        imputer = SimpleImputer(strategy='mean')
-        return imputer.fit_transform(X)
+        if not self.is_fitted:
+            self.fit(X)
+        X = np.array(X, dtype=np.float64)
+        missing = np.isnan(X)
+        X[missing] = np.broadcast_to(self.mean_, X.shape)[missing]
+        return X
+    
+    def get_state(self) -> dict:
+        """Retourne l'état appris sous forme de tableaux"""
+        return {'mean': self.mean_, 'scale': self.scale_}
+    
+    @classmethod
+    def from_state(cls, state: dict):
+        """Reconstruit un préprocesseur à partir de son état"""
+        import numpy as np
+        
+        preprocessor = cls()
+        preprocessor.mean_ = np.ascontiguousarray(state['mean'], dtype=np.float64)
+        preprocessor.scale_ = np.ascontiguousarray(state['scale'], dtype=np.float64)
+        return preprocessor
+    
+    def save(self, filepath: str):
+        """Enregistre l'état appris (.npz)"""
+        import numpy as np
+        
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté (fit) avant d'être enregistré")
+        np.savez(filepath, **self.get_state())
+    
+    @classmethod
+    def load(cls, filepath: str):
+        """Charge un préprocesseur enregistré avec save"""
+        import numpy as np
+        
+        with np.load(filepath) as state:
+            return cls.from_state(state)
@@ -0,0 +1,69 @@
+"""
+Tableaux NumPy en mémoire partagée entre processus.
+
+Un SharedArray est créé dans le processus principal ; sa description
+(`spec` : nom du segment, forme, dtype) est transmise aux workers, qui
+l'attachent sans copier ni sérialiser les données.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedArray:
+    """Tableau NumPy adossé à un segment multiprocessing.shared_memory."""
+    
+    def __init__(self, shape, dtype=np.float64, spec: tuple = None):
+        """
+        Crée un segment (ou l'attache si `spec` est fourni, voir attach).
+        
+        Args:
+            shape: Forme du tableau
+            dtype: Type des éléments
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        if spec is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._owner = True
+        else:
+            # Les workers d'un pool partagent le resource_tracker du créateur :
+            # l'attachement ne change pas la responsabilité de la suppression
+            self._shm = shared_memory.SharedMemory(name=spec[0])
+            self._owner = False
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+    
+    @classmethod
+    def attach(cls, spec: tuple):
+        """Attache dans un worker le tableau décrit par `spec`."""
+        name, shape, dtype = spec
+        return cls(shape, dtype, spec=spec)
+    
+    @property
+    def spec(self) -> tuple:
+        """Description picklable : (nom du segment, forme, dtype)."""
+        return self._shm.name, self.shape, self.dtype.str
+    
+    def close(self):
+        """Détache le tableau ; le segment est supprimé par le processus qui l'a créé."""
+        if self._shm is None:
+            return
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+